@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк батчевого декодирования Whisper для нескольких встреч.
+
+Запускает ROOMS встреч в потоках, каждая транскрибирует WINDOWS
+окон синтетического аудио длиной STT_WINDOW_SECONDS. Сравнивает
+поочередные вызовы model.transcribe на общей модели с планировщиком
+BatchedWhisperDecoder: пропускная способность (окон в секунду)
+и задержка окна (p50, p95).
+
+Запуск:
+    python benchmarks/bench_batch_decoder.py [модель Whisper, по умолчанию tiny]
+"""
+
+import os
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.services.batch_decoder import BatchedWhisperDecoder, WhisperBatchBackend
+from src.utils.model_registry import ModelRegistry
+
+ROOMS = (1, 2, 4, 8)
+WINDOWS = 4
+
+
+def make_window(rng):
+    samples = int(settings.STT_WINDOW_SECONDS * settings.SAMPLE_RATE)
+    t = np.arange(samples) / settings.SAMPLE_RATE
+    return (0.1 * np.sin(2 * np.pi * rng.uniform(120, 300) * t) + 0.01 * rng.standard_normal(samples)).astype(np.float32)
+
+
+def run_rooms(make_model, rooms):
+    """Возвращает (окон в секунду, задержки окон)"""
+    latencies = []
+    lock = threading.Lock()
+    models = [make_model() for _ in range(rooms)]
+
+    def room(index):
+        rng = np.random.default_rng(index)
+        for _ in range(WINDOWS):
+            window = make_window(rng)
+            started = time.perf_counter()
+            models[index].transcribe(window, fp16=False, task="transcribe", language="ru")
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=room, args=(i,)) for i in range(rooms)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    for model in models:
+        if hasattr(model, "close"):
+            model.close()
+    return rooms * WINDOWS / elapsed, sorted(latencies)
+
+
+def main():
+    try:
+        import whisper
+    except ImportError:
+        print("Нужен пакет openai-whisper")
+        return
+    name = sys.argv[1] if len(sys.argv) > 1 else "tiny"
+    model = whisper.load_model(name)
+    shared = ModelRegistry().acquire("whisper", lambda: model, model=name)
+
+    print(f"Whisper {name}, окно {settings.STT_WINDOW_SECONDS} с, {WINDOWS} окон на встречу:")
+    for rooms in ROOMS:
+        decoder = BatchedWhisperDecoder(backend=WhisperBatchBackend(shared), max_batch=settings.STT_BATCH_SIZE)
+        variants = {
+            "по одному": lambda: shared,
+            "батчами": decoder.client,
+        }
+        for label, make_model in variants.items():
+            throughput, latencies = run_rooms(make_model, rooms)
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(
+                f"  встреч {rooms}, {label:10s} {throughput:6.2f} окон/с, "
+                f"задержка p50 {p50:.2f} с, p95 {p95:.2f} с"
+            )
+        decoder.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Нагрузочный бенчмарк трансляции транскрипции.
+
+Подключает к BroadcastTranscriptObserver сотни локальных подписчиков SSE
+(клиенты работают в отдельных процессах, чтобы не делить GIL с сервером),
+публикует сегменты с заданной частотой и измеряет задержку доставки
+(от вызова on_new_segment до получения события клиентом).
+
+Запуск:
+    python benchmarks/bench_broadcast.py [клиентов] [сегментов]
+"""
+
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.transcript import TranscriptSegment
+from src.observers.broadcast_observer import BroadcastTranscriptObserver
+
+CLIENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+SEGMENTS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+CLIENT_PROCESSES = 4
+INTERVAL_SECONDS = 0.05
+TEXT = "обсуждали сроки релиза и распределение задач в команде " * 4
+
+
+async def client(port, latencies):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    await reader.readuntil(b"\r\n\r\n")
+    received = 0
+    while True:
+        block = (await reader.readuntil(b"\n\n")).decode("utf-8")
+        if block.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in block.strip().split("\n"))
+        if fields["event"] == "end":
+            break
+        data = json.loads(fields["data"])
+        latencies.append(time.time() - data["start_time"])
+        received += 1
+    writer.close()
+    return received
+
+
+async def clients(port, count):
+    latencies = []
+    received = await asyncio.gather(*(client(port, latencies) for _ in range(count)))
+    return sum(received), latencies
+
+
+def client_process(args):
+    return asyncio.run(clients(*args))
+
+
+def run():
+    observer = BroadcastTranscriptObserver(host="127.0.0.1", port=0)
+    observer.start()
+    shares = [CLIENTS // CLIENT_PROCESSES + (i < CLIENTS % CLIENT_PROCESSES) for i in range(CLIENT_PROCESSES)]
+    with multiprocessing.Pool(CLIENT_PROCESSES) as pool:
+        results = pool.map_async(client_process, [(observer.port, share) for share in shares])
+        while len(observer.subscribers) < CLIENTS:
+            time.sleep(0.01)
+
+        started = time.perf_counter()
+        for i in range(SEGMENTS):
+            # Время публикации передается в start_time, чтобы клиент посчитал задержку
+            observer.on_new_segment(TranscriptSegment(time.time(), 0.0, TEXT))
+            time.sleep(INTERVAL_SECONDS)
+        observer.stop()
+        results = results.get()
+        elapsed = time.perf_counter() - started
+
+    received = [count for count, _ in results]
+    latencies = [latency for _, part in results for latency in part]
+
+    latencies.sort()
+    print(f"Клиентов: {CLIENTS}, сегментов: {SEGMENTS}, доставлено событий: {sum(received)} за {elapsed:.2f} с")
+    print(
+        f"Задержка доставки: p50 {statistics.median(latencies) * 1000:.1f} мс, "
+        f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} мс, max {latencies[-1] * 1000:.1f} мс"
+    )
+    print(f"Отключено медленных клиентов: {observer.slow_disconnects}")
+
+
+if __name__ == "__main__":
+    run()
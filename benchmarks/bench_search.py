@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк полнотекстового поиска по каталогу результатов.
+
+Заполняет каталог во временной папке синтетическими транскрипциями
+(по умолчанию 10 000 встреч) и измеряет время индексации и запросов
+cli.py search.
+
+Запуск:
+    python benchmarks/bench_search.py [количество встреч]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.utils.results_catalog import ResultsCatalog
+
+MEETINGS = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+SEGMENTS_PER_MEETING = 40
+WORDS = (
+    "бюджет релиз задача срок команда клиент договор отчет план встреча "
+    "проект сервер ошибка тестирование дизайн продажи квартал презентация "
+    "обсудили решили перенесли согласовали проверить отправить подготовить"
+).split()
+QUERIES = ["бюджет", "релиза", "презентацию клиенту", "согласовали договор", "несуществующее"]
+
+
+def make_transcript(index, rng):
+    segments = [
+        TranscriptSegment(
+            start_time=i * 5.0,
+            end_time=i * 5.0 + 5.0,
+            text=" ".join(rng.choice(WORDS) for _ in range(12)),
+            speaker=f"Спикер {i % 4 + 1}"
+        )
+        for i in range(SEGMENTS_PER_MEETING)
+    ]
+    created_at = datetime(2024, 1, 1) + timedelta(hours=index)
+    return MeetingTranscript(segments=segments, created_at=created_at, duration=SEGMENTS_PER_MEETING * 5.0)
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as results_dir:
+        catalog = ResultsCatalog(results_dir)
+        started = time.perf_counter()
+        for index in range(MEETINGS):
+            catalog.record_transcript(f"meeting_{index:05d}", make_transcript(index, rng), "")
+        elapsed = time.perf_counter() - started
+        print(f"Индексация {MEETINGS} встреч ({MEETINGS * SEGMENTS_PER_MEETING} сегментов): "
+              f"{elapsed:.1f} с ({elapsed / MEETINGS * 1000:.1f} мс на встречу)")
+
+        for query in QUERIES:
+            started = time.perf_counter()
+            hits = catalog.search(query, limit=20)
+            elapsed = time.perf_counter() - started
+            print(f"  {query!r}: {len(hits)} результатов за {elapsed * 1000:.1f} мс")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк представления транскрипции.
+
+Сравнивает прежнее хранение (список dataclass сегментов с __dict__)
+с колоночным MeetingTranscript: память на 10 000 сегментов и время
+запросов полного текста и текста спикера.
+
+Запуск:
+    python benchmarks/bench_transcript.py
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+
+SEGMENTS = 10_000
+SPEAKERS = [f"Спикер {i}" for i in range(8)]
+WORDS = "бюджет релиз задача срок команда клиент договор отчет план встреча проект сервер".split()
+QUERIES = 100
+
+
+@dataclass
+class LegacySegment:
+    start_time: float
+    end_time: float
+    text: str
+    speaker: Optional[str] = None
+
+
+class LegacyTranscript:
+    """Прежняя реализация: список сегментов, тексты собираются при каждом запросе"""
+
+    def __init__(self, segments):
+        self.segments = segments
+
+    def get_full_text(self):
+        return " ".join([segment.text for segment in self.segments])
+
+    def get_speaker_text(self, speaker):
+        return " ".join([segment.text for segment in self.segments if segment.speaker == speaker])
+
+
+def make_rows():
+    rng = random.Random(0)
+    return [
+        (i * 3.0, i * 3.0 + 3.0, " ".join(rng.choice(WORDS) for _ in range(10)), rng.choice(SPEAKERS))
+        for i in range(SEGMENTS)
+    ]
+
+
+def measure(build):
+    tracemalloc.start()
+    transcript = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for _ in range(QUERIES):
+        transcript.get_full_text()
+    full_text = (time.perf_counter() - started) / QUERIES
+
+    started = time.perf_counter()
+    for i in range(QUERIES):
+        transcript.get_speaker_text(SPEAKERS[i % len(SPEAKERS)])
+    speaker_text = (time.perf_counter() - started) / QUERIES
+    return size, full_text, speaker_text
+
+
+def main():
+    rows = make_rows()
+    # Тексты строк создаются заново, чтобы учитывалась их память
+    variants = {
+        "список dataclass": lambda: LegacyTranscript([LegacySegment(s, e, t.encode().decode(), sp) for s, e, t, sp in rows]),
+        "колоночный": lambda: MeetingTranscript(
+            (TranscriptSegment(s, e, t, sp) for s, e, t, sp in rows), datetime.now(), rows[-1][1]
+        ),
+    }
+    print(f"{SEGMENTS} сегментов:")
+    for name, build in variants.items():
+        size, full_text, speaker_text = measure(build)
+        print(
+            f"  {name:18s} память {size / 1024:8.1f} KB, "
+            f"get_full_text {full_text * 1e6:8.1f} мкс, get_speaker_text {speaker_text * 1e6:8.1f} мкс"
+        )
+
+
+if __name__ == "__main__":
+    main()
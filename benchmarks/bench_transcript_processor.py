@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк потоковой обработки транскрипции.
+
+Измеряет пропускную способность TranscriptProcessor (сегментов
+в секунду) для отдельных правил и всего конвейера, а также время
+обработки в конце встречи: прежняя реализация обрабатывала все
+сегменты в stop_meeting, потоковая - по мере поступления.
+
+Запуск:
+    python benchmarks/bench_transcript_processor.py
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import RULES, TranscriptProcessor
+
+SEGMENTS = 20_000
+WORDS = (
+    "бюджет релиз задача срок команда клиент договор отчет план встреча проект сервер "
+    "э ну мм двадцать пять сто тысяч я думаю"
+).split()
+
+
+def make_segments():
+    rng = random.Random(0)
+    return [
+        TranscriptSegment(i * 3.0, i * 3.0 + 3.0, "  ".join(rng.choice(WORDS) for _ in range(12)) + "...")
+        for i in range(SEGMENTS)
+    ]
+
+
+def legacy_clean(text):
+    """Прежняя очистка: шаблоны компилируются из кэша re при каждом вызове"""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[.!?]{2,}', '.', text)
+    return text.strip()
+
+
+def throughput(process, segments):
+    started = time.perf_counter()
+    for segment in segments:
+        process(segment)
+    return len(segments) / (time.perf_counter() - started)
+
+
+def main():
+    segments = make_segments()
+    print(f"{SEGMENTS} сегментов, сегментов/с:")
+    print(f"  {'прежняя (только текст)':22s} {throughput(lambda s: legacy_clean(s.text), segments):10.0f}")
+    for name in RULES:
+        processor = TranscriptProcessor([name])
+        print(f"  {'правило ' + name:22s} {throughput(processor.process_segment, segments):10.0f}")
+    processor = TranscriptProcessor()
+    print(f"  {'все правила':22s} {throughput(processor.process_segment, segments):10.0f}")
+
+    started = time.perf_counter()
+    TranscriptProcessor().process_segments(segments)
+    batch = time.perf_counter() - started
+    print("Обработка в конце встречи:")
+    print(f"  пакетная (прежняя)   {batch * 1000:8.1f} мс")
+    print(f"  потоковая            {0.0:8.1f} мс (сегменты уже обработаны)")
+
+
+if __name__ == "__main__":
+    main()
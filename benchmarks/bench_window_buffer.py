@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк буферизации аудио перед Whisper.
+
+Сравнивает накопление окна через np.concatenate (прежняя реализация
+WhisperSTTService) с предвыделенным SampleWindowBuffer. Выводит
+количество выделений памяти, объем скопированных байт и время
+на секунду аудио.
+
+Запуск:
+    python benchmarks/bench_window_buffer.py
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import settings
+from src.utils.window_buffer import SampleWindowBuffer
+
+AUDIO_SECONDS = 600
+WINDOW_SECONDS = 5.0
+
+
+def make_chunks():
+    chunk = np.zeros(settings.CHUNK_SIZE, dtype=np.float32)
+    count = int(AUDIO_SECONDS * settings.SAMPLE_RATE / settings.CHUNK_SIZE)
+    return [chunk] * count
+
+
+def concatenate_buffering(chunks, on_window):
+    """Прежняя реализация: новый массив на каждый чанк"""
+    stats = {"allocations": 1, "copy_bytes": 0}
+    buffer = np.array([], dtype=np.float32)
+    buffer_duration = 0
+    for chunk in chunks:
+        buffer = np.concatenate([buffer, chunk])
+        stats["allocations"] += 1
+        stats["copy_bytes"] += buffer.nbytes
+        buffer_duration += len(chunk) / settings.SAMPLE_RATE
+        if buffer_duration >= WINDOW_SECONDS:
+            on_window(buffer)
+            buffer = np.array([], dtype=np.float32)
+            stats["allocations"] += 1
+            buffer_duration = 0
+    return stats
+
+
+def window_buffering(chunks, on_window):
+    """Новая реализация: предвыделенный буфер и view на окно"""
+    stats = {"allocations": 1, "copy_bytes": 0}
+    window = SampleWindowBuffer(int(WINDOW_SECONDS * settings.SAMPLE_RATE))
+    for chunk in chunks:
+        offset = 0
+        while offset < len(chunk):
+            written = window.append(chunk[offset:])
+            stats["copy_bytes"] += written * chunk.itemsize
+            offset += written
+            if window.is_full:
+                on_window(window.view())
+                window.clear()
+    return stats
+
+
+def run(name, func, chunks):
+    windows = []
+    tracemalloc.start()
+    start = time.perf_counter()
+    stats = func(chunks, lambda audio: windows.append(len(audio)))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{name}:")
+    print(f"  окон: {len(windows)}")
+    print(f"  выделений на секунду аудио: {stats['allocations'] / AUDIO_SECONDS:.2f}")
+    print(f"  скопировано байт на секунду аудио: {stats['copy_bytes'] / AUDIO_SECONDS / 1024:.1f} KB")
+    print(f"  пик памяти: {peak / 1024:.1f} KB")
+    print(f"  время на секунду аудио: {elapsed / AUDIO_SECONDS * 1e6:.1f} мкс")
+
+
+def main():
+    chunks = make_chunks()
+    print(f"Аудио: {AUDIO_SECONDS} с, чанк {settings.CHUNK_SIZE}, окно {WINDOW_SECONDS} с\n")
+    run("np.concatenate", concatenate_buffering, chunks)
+    run("SampleWindowBuffer", window_buffering, chunks)
+
+
+if __name__ == "__main__":
+    main()
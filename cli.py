@@ -4,18 +4,23 @@
 
 Предоставляет команды для управления приложением:
 - Запуск транскрибирования
+- Транскрибирование записанных файлов
+- Пакетная обработка каталога записей
+- Восстановление прерванных встреч
 - Удаление загруженных моделей
 - Проверка состояния моделей
-- Просмотр результатов
+- Просмотр результатов и каталог встреч
+- Полнотекстовый поиск по транскрипциям
 """
 
 import argparse
 import os
 import shutil
-import glob
 from src.utils.logger import get_logger
-from src.utils.model_downloader import setup_models
-from main import main as start_meeting
+
+# Тяжелые зависимости (torch, whisper, sounddevice, ctransformers)
+# импортируются внутри команд, которым они нужны, чтобы команды
+# просмотра результатов запускались быстро
 
 logger = get_logger(__name__)
 
@@ -77,11 +82,11 @@ def check_models():
     - Наличии Whisper модели
     - Наличии LLM модели
     - Размерах файлов
+    - Состоянии кэша саммари
     """
     logger.info("Проверка моделей...")
     
     # Проверка Whisper
-    import whisper
     from config.settings import settings
     
     whisper_model_path = os.path.expanduser(f"~/.cache/whisper/{settings.WHISPER_MODEL}.pt")
@@ -101,41 +106,142 @@ def check_models():
                 logger.info(f"LLM модель найдена: {file} ({size:.1f} GB)")
     else:
         logger.info("LLM модели не найдены (будут загружены при необходимости)")
+    
+    # Проверка кэша саммари
+    from src.utils.summary_cache import SummaryCache
+    
+    cache = SummaryCache()
+    stats = cache.stats()
+    requests = stats["hits"] + stats["misses"]
+    hit_rate = stats["hits"] / requests * 100 if requests else 0.0
+    logger.info(
+        f"Кэш саммари {cache.cache_dir}: записей {stats['entries']} "
+        f"({stats['bytes'] / 1024:.1f} KB), попаданий {stats['hits']}, "
+        f"промахов {stats['misses']} ({hit_rate:.0f}% попаданий)"
+    )
 
-def list_results():
+def list_results(
+    page: int = 1,
+    limit: int = 20,
+    sort: str = "date",
+    ascending: bool = False,
+    since: str = None,
+    until: str = None
+):
     """
-    Выводит список сохраненных результатов.
+    Выводит список сохраненных встреч из каталога результатов.
+    
+    Если каталога еще нет, он строится по файлам в папке results/.
     
-    Показывает все транскрипции и саммари в папке results/.
+    Args:
+        page: Номер страницы (с 1)
+        limit: Количество встреч на странице
+        sort: Поле сортировки (date, duration, segments, id)
+        ascending: Сортировать по возрастанию
+        since: Только встречи начиная с даты (YYYY-MM-DD)
+        until: Только встречи до даты включительно (YYYY-MM-DD)
     """
+    from datetime import datetime, timedelta
+    from src.utils.results_catalog import ResultsCatalog
+    
     results_dir = "results"
     if not os.path.exists(results_dir):
         logger.info("Папка results не найдена")
         return
     
-    files = sorted(glob.glob(os.path.join(results_dir, "*.*")))
-    if not files:
+    catalog = ResultsCatalog(results_dir)
+    if not catalog.exists():
+        from src.utils.results_writer import reindex_catalog
+        reindex_catalog(results_dir)
+    
+    since_date = datetime.fromisoformat(since) if since else None
+    until_date = datetime.fromisoformat(until) + timedelta(days=1) if until else None
+    total = catalog.count(since_date, until_date)
+    if not total:
         logger.info("Результаты не найдены")
         return
     
-    logger.info("Сохраненные результаты:")
-    for file in files:
-        size = os.path.getsize(file) / 1024  # KB
-        mtime = os.path.getmtime(file)
-        from datetime import datetime
-        mod_time = datetime.fromtimestamp(mtime).strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"  {os.path.basename(file)} ({size:.1f} KB) [{mod_time}]")
+    pages = (total + limit - 1) // limit
+    meetings = catalog.list_meetings(
+        limit=limit,
+        offset=(page - 1) * limit,
+        sort=sort,
+        descending=not ascending,
+        since=since_date,
+        until=until_date
+    )
+    
+    logger.info(f"Сохраненные встречи (страница {page} из {pages}, всего {total}):")
+    for meeting in meetings:
+        created_at = datetime.fromisoformat(meeting["created_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        files = [
+            name for name, key in (("транскрипция", "transcript_path"), ("саммари", "summary_path"))
+            if meeting[key]
+        ]
+        details = [f"[{created_at}]"]
+        if meeting["duration"] is not None:
+            details.append(f"{meeting['duration'] / 60:.1f} мин")
+        if meeting["segment_count"] is not None:
+            details.append(f"сегментов: {meeting['segment_count']}")
+        if meeting["speakers"]:
+            details.append(f"спикеры: {', '.join(meeting['speakers'])}")
+        logger.info(f"  {meeting['meeting_id']} {' '.join(details)} ({', '.join(files)})")
+
+def reindex_results():
+    """
+    Перестраивает каталог результатов по файлам в папке results/.
+    """
+    from src.utils.results_writer import reindex_catalog
+    
+    if not os.path.exists("results"):
+        logger.info("Папка results не найдена")
+        return
+    reindex_catalog("results")
+
+def search_results(query: str, limit: int = 20):
+    """
+    Ищет фразу во всех сохраненных транскрипциях.
+    
+    Выводит найденные сегменты с идентификатором встречи,
+    временем начала и спикером.
+    
+    Args:
+        query: Поисковый запрос
+        limit: Максимальное количество результатов
+    """
+    from src.utils.results_catalog import ResultsCatalog
+    
+    hits = ResultsCatalog("results").search(query, limit)
+    if not hits:
+        logger.info("Ничего не найдено")
+        return
+    
+    logger.info(f"Найдено сегментов: {len(hits)}")
+    for hit in hits:
+        speaker = hit["speaker"] or "Неизвестный"
+        logger.info(f"  {hit['meeting_id']} [{hit['start_time']:.2f}s] {speaker}: {hit['highlighted']}")
 
 def show_result(filename: str):
     """
     Показывает содержимое указанного результата.
     
+    Принимает имя файла в папке results/ или идентификатор встречи
+    из списка встреч (тогда выводятся саммари и транскрипция).
+    
     Args:
-        filename: Имя файла для отображения
+        filename: Имя файла или идентификатор встречи для отображения
     """
     filepath = os.path.join("results", filename)
     if not os.path.exists(filepath):
-        logger.error(f"Файл не найден: {filepath}")
+        from src.utils.results_catalog import ResultsCatalog
+        
+        meeting = ResultsCatalog("results").get(filename)
+        if meeting is None:
+            logger.error(f"Файл не найден: {filepath}")
+            return
+        for key in ("summary_path", "transcript_path"):
+            if meeting[key]:
+                show_result(os.path.basename(meeting[key]))
         return
     
     logger.info(f"Содержимое {filename}:")
@@ -146,6 +252,114 @@ def show_result(filename: str):
     except Exception as e:
         logger.error(f"Ошибка чтения файла: {e}")
 
+def transcribe_file(filename: str, with_summary: bool = True):
+    """
+    Транскрибирует записанную встречу из WAV файла.
+    
+    Сохраняет транскрипцию (и саммари) в results/ в том же формате,
+    что и живая встреча, и выводит достигнутый RTF.
+    
+    Args:
+        filename: Путь к WAV файлу
+        with_summary: Генерировать ли саммари
+    """
+    from src.services.offline_transcriber import OfflineTranscriber
+    from src.services.transcript_processor import TranscriptProcessor
+    from src.models.transcript import MeetingTranscript
+    from src.utils import results_writer
+    
+    if not os.path.exists(filename):
+        logger.error(f"Файл не найден: {filename}")
+        return
+    
+    transcriber = OfflineTranscriber()
+    transcript = transcriber.transcribe_file(filename)
+    transcript = MeetingTranscript(
+        segments=TranscriptProcessor().process_segments(transcript.segments),
+        created_at=transcript.created_at,
+        duration=transcript.duration
+    )
+    results_writer.save_transcript(transcript)
+    
+    stats = transcriber.last_stats
+    logger.info(
+        f"Аудио {stats['audio_seconds']:.1f} с обработано за {stats['elapsed_seconds']:.1f} с "
+        f"(RTF {stats['rtf']:.3f}, процессов: {stats['workers']})"
+    )
+    
+    if with_summary and transcript.segments:
+        from src.services.hierarchical_summary import build_summary_service
+        from src.utils.model_downloader import download_llm_model
+        
+        summary = build_summary_service(download_llm_model()).summarize_transcript(transcript)
+        results_writer.save_summary(summary, transcript.created_at)
+        print(summary)
+
+def batch_process(source: str, with_summary: bool = True):
+    """
+    Транскрибирует и суммаризирует каталог записей.
+    
+    Уже обработанные записи пропускаются по хэшу содержимого,
+    прерванная обработка продолжается по журналу заданий.
+    
+    Args:
+        source: Каталог с WAV файлами или glob шаблон
+        with_summary: Генерировать ли саммари
+    """
+    from src.services.batch_processor import BatchProcessor
+    
+    factory = None
+    if with_summary:
+        from src.services.hierarchical_summary import build_summary_service
+        from src.utils.model_downloader import download_llm_model
+        
+        llm_model_path = download_llm_model()
+        factory = lambda: build_summary_service(llm_model_path)
+    
+    BatchProcessor(
+        summary_workers=None if with_summary else 0,
+        summary_service_factory=factory
+    ).run(source)
+
+def recover_meetings(journal_path: str = None, with_summary: bool = True):
+    """
+    Восстанавливает прерванные встречи по журналам сегментов.
+    
+    В журнал пишутся уже обработанные сегменты, поэтому транскрипция
+    собирается из журнала без повторной обработки и сохраняется так же,
+    как при штатном завершении встречи, после чего генерируется саммари
+    и журнал удаляется.
+    
+    Args:
+        journal_path: Путь к журналу (по умолчанию все журналы из JOURNAL_DIR)
+        with_summary: Генерировать ли саммари
+    """
+    from src.utils.segment_journal import find_journals, read_journal
+    from src.utils import results_writer
+    
+    journals = [journal_path] if journal_path else find_journals()
+    if not journals:
+        logger.info("Журналы незавершенных встреч не найдены")
+        return
+    
+    summary_service = None
+    for path in journals:
+        meeting_id, transcript = read_journal(path)
+        logger.info(f"Восстановление встречи {meeting_id}: сегментов {len(transcript.segments)}")
+        results_writer.save_transcript(transcript, meeting_id=meeting_id)
+        
+        if with_summary and transcript.segments:
+            if summary_service is None:
+                from src.services.hierarchical_summary import build_summary_service
+                from src.utils.model_downloader import download_llm_model
+                
+                summary_service = build_summary_service(download_llm_model())
+            summary = summary_service.summarize_transcript(transcript)
+            results_writer.save_summary(summary, transcript.created_at, meeting_id=meeting_id)
+            print(summary)
+        
+        os.remove(path)
+
 def main():
     """
     Основная функция командного интерфейса.
@@ -159,24 +373,48 @@ def main():
         epilog="""
 Примеры использования:
   python cli.py start          # Запустить транскрибирование
+  python cli.py transcribe <file.wav>  # Транскрибировать запись
+  python cli.py batch <dir|glob>       # Обработать каталог записей
+  python cli.py recover        # Восстановить прерванные встречи по журналам
   python cli.py clean          # Удалить все модели
   python cli.py clean-results  # Удалить только результаты
   python cli.py check          # Проверить состояние моделей
-  python cli.py list           # Показать список результатов
-  python cli.py show <file>    # Показать содержимое результата
+  python cli.py list           # Показать список встреч
+  python cli.py list --page 2 --sort duration --since 2024-01-01
+  python cli.py reindex        # Перестроить каталог результатов
+  python cli.py search "бюджет" # Найти фразу во всех транскрипциях
+  python cli.py show <file|id> # Показать содержимое результата
         """
     )
     
     parser.add_argument(
         'command',
-        choices=['start', 'clean', 'clean-results', 'check', 'list', 'show'],
+        choices=['start', 'transcribe', 'batch', 'recover', 'clean', 'clean-results', 'check', 'list', 'reindex', 'search', 'show'],
         help='Команда для выполнения'
     )
     
     parser.add_argument(
         'argument',
         nargs='?',
-        help='Аргумент команды (для show - имя файла)'
+        help='Аргумент команды (для show - имя файла или id встречи, для search - запрос, для transcribe - путь к WAV, для batch - каталог или шаблон, для recover - путь к журналу)'
+    )
+    
+    parser.add_argument('--page', type=int, default=1, help='Номер страницы (для list)')
+    parser.add_argument('--limit', type=int, default=20, help='Встреч на странице (для list) или результатов (для search)')
+    parser.add_argument(
+        '--sort',
+        choices=['date', 'duration', 'segments', 'id'],
+        default='date',
+        help='Поле сортировки (для list)'
+    )
+    parser.add_argument('--asc', action='store_true', help='Сортировать по возрастанию (для list)')
+    parser.add_argument('--since', help='Встречи начиная с даты YYYY-MM-DD (для list)')
+    parser.add_argument('--until', help='Встречи до даты YYYY-MM-DD включительно (для list)')
+    
+    parser.add_argument(
+        '--no-summary',
+        action='store_true',
+        help='Не генерировать саммари (для transcribe, batch и recover)'
     )
     
     parser.add_argument(
@@ -193,7 +431,22 @@ def main():
     
     try:
         if args.command == 'start':
+            from main import main as start_meeting
             start_meeting()
+        elif args.command == 'transcribe':
+            if args.argument:
+                transcribe_file(args.argument, with_summary=not args.no_summary)
+            else:
+                logger.error("Укажите путь к WAV файлу")
+                return 1
+        elif args.command == 'batch':
+            if args.argument:
+                batch_process(args.argument, with_summary=not args.no_summary)
+            else:
+                logger.error("Укажите каталог или шаблон файлов")
+                return 1
+        elif args.command == 'recover':
+            recover_meetings(args.argument, with_summary=not args.no_summary)
         elif args.command == 'clean':
             clean_models()
         elif args.command == 'clean-results':
@@ -201,7 +454,15 @@ def main():
         elif args.command == 'check':
             check_models()
         elif args.command == 'list':
-            list_results()
+            list_results(args.page, args.limit, args.sort, args.asc, args.since, args.until)
+        elif args.command == 'reindex':
+            reindex_results()
+        elif args.command == 'search':
+            if args.argument:
+                search_results(args.argument, args.limit)
+            else:
+                logger.error("Укажите поисковый запрос")
+                return 1
         elif args.command == 'show':
             if args.argument:
                 show_result(args.argument)
@@ -24,10 +24,187 @@ class Settings:
     CHUNK_SIZE: int = 1024
     """Размер аудио чанка для обработки"""
     
+    AUDIO_CAPTURE_MODE: str = "callback"
+    """Режим захвата аудио (callback - через кольцевой буфер, blocking - stream.read)"""
+    
+    RING_BUFFER_SECONDS: float = 30.0
+    """Емкость кольцевого буфера захвата в секундах"""
+    
     # STT settings
     WHISPER_MODEL: str = "base"
     """Модель Whisper для транскрибирования (tiny, base, small, medium, large)"""
     
+    STT_WINDOW_SECONDS: float = 5.0
+    """Длина окна аудио, передаваемого в Whisper (секунды)"""
+    
+    STT_HOP_SECONDS: float = 5.0
+    """Шаг между началами окон (секунды); меньше длины окна - окна перекрываются"""
+    
+    STT_BATCH_ENABLED: bool = False
+    """Декодировать окна встреч процесса батчами через общий планировщик (несколько комнат на сервере)"""
+    
+    STT_BATCH_SIZE: int = 8
+    """Максимальное количество окон в батче Whisper"""
+    
+    STT_BATCH_MAX_WAIT_SECONDS: float = 0.2
+    """Максимальное ожидание окон других встреч перед запуском батча (секунды)"""
+    
+    # VAD settings
+    VAD_ENABLED: bool = True
+    """Пропускать тишину перед Whisper с помощью детектора речи"""
+    
+    VAD_FRAME_MS: int = 30
+    """Длина кадра анализа VAD (мс)"""
+    
+    VAD_HANGOVER_MS: int = 300
+    """Сколько речь удерживается после последнего речевого кадра (мс)"""
+    
+    VAD_THRESHOLD_DB: float = -45.0
+    """Абсолютный порог энергии речи (дБ относительно полной шкалы)"""
+    
+    VAD_NOISE_MARGIN_DB: float = 10.0
+    """Превышение уровня шума, при котором кадр считается речью (дБ)"""
+    
+    VAD_ZCR_MAX: float = 0.35
+    """Максимальная доля переходов через ноль для речевого кадра"""
+    
+    VAD_MIN_SPEECH_MS: int = 250
+    """Минимальная длина участка речи (мс)"""
+    
+    # Diarization settings
+    DIARIZATION_ENABLED: bool = True
+    """Определять спикеров по голосу во время транскрибирования"""
+    
+    DIARIZATION_THRESHOLD: float = 2.5
+    """Максимальное нормированное расстояние от участка до спикера; дальше - новый спикер"""
+    
+    DIARIZATION_MAX_SPEAKERS: int = 8
+    """Максимальное количество спикеров"""
+    
+    DIARIZATION_MIN_SECONDS: float = 0.5
+    """Участки короче получают метку предыдущего спикера (секунды)"""
+    
+    # Transcript processing settings
+    TRANSCRIPT_RULES: str = "whitespace,hallucinations,fillers,repeats,numbers"
+    """Правила обработки текста сегментов через запятую в порядке применения (whitespace, hallucinations, fillers, repeats, numbers)"""
+    
+    TRANSCRIPT_FILLER_WORDS: str = "э,ээ,эээ,э-э,э-э-э,эм,эмм,мм,ммм,м-м,хм,гм"
+    """Слова-паразиты и междометия, удаляемые правилом fillers (через запятую)"""
+    
+    TRANSCRIPT_HALLUCINATIONS: str = (
+        "Продолжение следует|Субтитры сделал DimaTorzok|Субтитры создавал DimaTorzok|"
+        "Субтитры делал DimaTorzok|Редактор субтитров А.Семкин|Корректор А.Егорова|"
+        "Спасибо за просмотр|Подписывайтесь на канал|Ставьте лайки"
+    )
+    """Типовые галлюцинации Whisper, удаляемые правилом hallucinations (через |)"""
+    
+    TRANSCRIPT_NGRAM_SIZE: int = 3
+    """Длина n-граммы (в словах) для поиска повторов правилом hallucinations"""
+    
+    TRANSCRIPT_HISTORY_SEGMENTS: int = 50
+    """Сколько последних сегментов помнит правило hallucinations"""
+    
+    TRANSCRIPT_REPEAT_RATIO: float = 0.9
+    """Доля n-грамм сегмента, уже встречавшихся в истории, при которой сегмент отбрасывается как повтор"""
+    
+    # Offline transcription settings
+    OFFLINE_WORKERS: int = 2
+    """Количество процессов для транскрибирования файлов (0 - в текущем процессе)"""
+    
+    OFFLINE_CHUNK_SECONDS: float = 30.0
+    """Желаемая длина фрагмента записи для одного процесса (секунды)"""
+    
+    OFFLINE_SPLIT_SEARCH_SECONDS: float = 5.0
+    """Полуширина окна поиска паузы вокруг границы фрагмента (секунды)"""
+    
+    # Batch settings
+    BATCH_TRANSCRIBE_WORKERS: int = 2
+    """Количество процессов стадии транскрибирования пакетной обработки"""
+    
+    BATCH_SUMMARY_WORKERS: int = 1
+    """Количество потоков стадии саммари (у каждого свой экземпляр LLM)"""
+    
+    # Pipeline settings
+    PIPELINE_ENABLED: bool = False
+    """Запускать захват, STT, постобработку и уведомления в отдельных потоках"""
+    
+    PIPELINE_AUDIO_QUEUE_SIZE: int = 512
+    """Емкость очереди аудио чанков между захватом и STT"""
+    
+    PIPELINE_AUDIO_QUEUE_POLICY: str = "drop_oldest"
+    """Политика переполнения очереди аудио (block, drop_oldest, drop_newest)"""
+    
+    PIPELINE_SEGMENT_QUEUE_SIZE: int = 64
+    """Емкость очередей сегментов между стадиями"""
+    
+    PIPELINE_SEGMENT_QUEUE_POLICY: str = "block"
+    """Политика переполнения очередей сегментов (block, drop_oldest, drop_newest)"""
+    
+    # Observer settings
+    OBSERVER_DISPATCH_MODE: str = "async"
+    """Доставка уведомлений наблюдателям: async (своя очередь и поток у каждого) или sync (в потоке STT)"""
+    
+    OBSERVER_QUEUE_SIZE: int = 256
+    """Емкость очереди уведомлений каждого наблюдателя"""
+    
+    OBSERVER_QUEUE_POLICY: str = "coalesce"
+    """Политика переполнения очереди наблюдателя (block, drop_oldest, drop_newest, coalesce)"""
+    
+    OBSERVER_PUT_TIMEOUT_SECONDS: float = 1.0
+    """Максимальное ожидание места в очереди наблюдателя для политики block (секунды)"""
+    
+    OBSERVER_SLOW_CALL_SECONDS: float = 0.5
+    """Порог, после которого обработка уведомления наблюдателем считается медленной (секунды)"""
+    
+    OBSERVER_DRAIN_TIMEOUT_SECONDS: float = 10.0
+    """Максимальное ожидание обработки очередей наблюдателей по окончании встречи (секунды)"""
+    
+    # Broadcast settings
+    BROADCAST_ENABLED: bool = False
+    """Транслировать транскрипцию подписчикам по HTTP (Server-Sent Events)"""
+    
+    BROADCAST_HOST: str = "127.0.0.1"
+    """Адрес сервера трансляции"""
+    
+    BROADCAST_PORT: int = 8765
+    """Порт сервера трансляции"""
+    
+    BROADCAST_HISTORY_SIZE: int = 10000
+    """Сколько последних сегментов хранить для повтора при переподключении"""
+    
+    BROADCAST_CLIENT_QUEUE_SIZE: int = 256
+    """Очередь событий подписчика; не успевающий читать клиент отключается"""
+    
+    BROADCAST_HEARTBEAT_SECONDS: float = 15.0
+    """Период служебных сообщений, поддерживающих соединение (секунды)"""
+    
+    # Memory settings
+    MEMORY_BOUNDED_MODE: bool = False
+    """Режим ограниченной памяти для многочасовых встреч: сегменты выгружаются на диск и обрабатываются потоком"""
+    
+    MEMORY_SEGMENT_WINDOW: int = 200
+    """Сколько последних сегментов держать в памяти в режиме ограниченной памяти"""
+    
+    # Journal settings
+    JOURNAL_ENABLED: bool = True
+    """Записывать сегменты в журнал во время встречи для восстановления после сбоя"""
+    
+    JOURNAL_DIR: str = "results/journal"
+    """Папка журналов незавершенных встреч"""
+    
+    JOURNAL_FSYNC_POLICY: str = "interval"
+    """Сброс журнала на диск: always (после каждого сегмента), interval (в фоне), never (решает ОС)"""
+    
+    JOURNAL_FSYNC_INTERVAL_SECONDS: float = 2.0
+    """Период фонового сброса журнала на диск (для политики interval)"""
+    
+    # Model registry settings
+    MODEL_IDLE_SECONDS: float = 300.0
+    """Через сколько секунд без пользователей общая модель выгружается из памяти (0 - сразу)"""
+    
+    MODEL_STREAM_IDLE_SECONDS: float = 30.0
+    """Через сколько секунд без чтения потоковая генерация уступает модель другим пользователям"""
+    
     # Summary settings
     LLM_MODEL_NAME: str = "TinyLlama-1.1B-Chat-v1.0.Q4_K_M.gguf"
     """Имя файла LLM модели"""
@@ -38,6 +215,54 @@ class Settings:
     SUMMARY_MAX_TOKENS: int = 300
     """Максимальное количество токенов в саммари"""
     
+    LLM_CONTEXT_LENGTH: int = 2048
+    """Размер контекста LLM в токенах"""
+    
+    SUMMARY_MAP_MAX_TOKENS: int = 150
+    """Максимальное количество токенов в частичном саммари фрагмента"""
+    
+    SUMMARY_MAP_WORKERS: int = 1
+    """Количество экземпляров LLM для параллельной суммаризации фрагментов"""
+    
+    LLM_LOAD_MODE: str = "background"
+    """Когда загружать LLM: background (в фоне во время встречи), lazy (при первом обращении), eager (при запуске)"""
+    
+    LLM_LOAD_DELAY_SECONDS: float = 5.0
+    """Задержка фоновой загрузки LLM, чтобы не мешать запуску записи"""
+    
+    LLM_UNLOAD_AFTER_USE: bool = False
+    """Выгружать LLM из памяти после генерации итогового саммари"""
+    
+    LLM_THREADS: int = -1
+    """Количество потоков LLM (-1 - автоматически)"""
+    
+    LLM_BATCH_SIZE: int = 8
+    """Размер батча обработки промпта LLM"""
+    
+    LLM_USE_MMAP: bool = True
+    """Отображать файл LLM модели в память вместо чтения целиком"""
+    
+    SUMMARY_CACHE_ENABLED: bool = True
+    """Кэшировать сгенерированные саммари на диске"""
+    
+    SUMMARY_CACHE_DIR: str = "cache/summaries"
+    """Каталог кэша саммари"""
+    
+    SUMMARY_CACHE_MAX_MB: int = 64
+    """Максимальный размер кэша саммари (MB)"""
+    
+    SUMMARY_CACHE_MAX_AGE_DAYS: float = 30.0
+    """Записи кэша саммари без обращений дольше этого срока удаляются"""
+    
+    ROLLING_SUMMARY_ENABLED: bool = True
+    """Обновлять саммари во время встречи, а не только по ее окончании"""
+    
+    ROLLING_SUMMARY_EVERY_SEGMENTS: int = 20
+    """Обновлять саммари после стольких новых сегментов"""
+    
+    ROLLING_SUMMARY_EVERY_SECONDS: float = 180.0
+    """Обновлять саммари не реже, чем раз в столько секунд (при наличии новых сегментов)"""
+    
     # Logging
     LOG_LEVEL: str = "INFO"
     """Уровень логирования (DEBUG, INFO, WARNING, ERROR)"""
@@ -9,13 +9,21 @@
 
 from src.services.audio_capture import AudioCaptureService
 from src.services.stt_service import WhisperSTTService
-from src.services.summary_service import LlamaSummaryService
+from src.services.batch_decoder import BatchedWhisperDecoder
+from src.services.vad import EnergyVAD
+from src.services.diarization import SpeakerDiarizer
+from src.services.hierarchical_summary import build_summary_service
 from src.services.transcript_processor import TranscriptProcessor
 from src.controllers.meeting_controller import MeetingController
 from src.observers.transcript_observer import ConsoleTranscriptObserver
+from src.observers.rolling_summary_observer import RollingSummaryObserver
+from src.observers.broadcast_observer import BroadcastTranscriptObserver
 from src.utils.logger import get_logger
 from src.utils.model_downloader import setup_models
+from src.utils.model_registry import model_registry
+from config.settings import settings
 import sys
+import time
 
 logger = get_logger(__name__)
 
@@ -30,6 +38,7 @@ def main():
     4. Генерация саммари по завершении
     """
     logger.info("Запуск Meeting Summarizer")
+    started = time.perf_counter()
     
     try:
         # Автоматическая загрузка моделей
@@ -37,27 +46,57 @@ def main():
         
         # Инициализация сервисов
         audio_service = AudioCaptureService()
-        stt_service = WhisperSTTService(whisper_model)
-        summary_service = LlamaSummaryService(llm_model_path)
-        transcript_processor = TranscriptProcessor()
+        vad = EnergyVAD() if settings.VAD_ENABLED else None
+        diarizer = SpeakerDiarizer() if settings.DIARIZATION_ENABLED else None
+        # Встречи процесса могут делить один планировщик батчей (decoder.client() на каждую)
+        decoder = BatchedWhisperDecoder(whisper_model) if settings.STT_BATCH_ENABLED else None
+        stt_model = decoder.client() if decoder is not None else whisper_model
+        stt_service = WhisperSTTService(stt_model, vad=vad, diarizer=diarizer)
+        # LLM загружается в фоне или при первом обращении (LLM_LOAD_MODE)
+        summary_service = build_summary_service(llm_model_path)
+        transcript_processor = TranscriptProcessor(diarized=diarizer is not None)
+        rolling_summary = None
+        generator = summary_service.generator()
+        if settings.ROLLING_SUMMARY_ENABLED and generator is not None:
+            rolling_summary = RollingSummaryObserver(generator)
         
         # Инициализация контроллера
         controller = MeetingController(
             audio_service=audio_service,
             stt_service=stt_service,
             summary_service=summary_service,
-            transcript_processor=transcript_processor
+            transcript_processor=transcript_processor,
+            rolling_summary=rolling_summary
         )
         
         # Добавляем наблюдателя для вывода транскрипции в консоль
         controller.add_observer(ConsoleTranscriptObserver())
         
+        # Трансляция транскрипции подписчикам по HTTP
+        broadcast = None
+        if settings.BROADCAST_ENABLED:
+            broadcast = BroadcastTranscriptObserver()
+            broadcast.start()
+            controller.add_observer(broadcast)
+        
         # Начинаем встречу
         try:
+            logger.info(f"⏱ Запись начинается через {time.perf_counter() - started:.1f} с после запуска")
             logger.info("Нажмите Ctrl+C для завершения встречи")
             controller.start_meeting()
         except KeyboardInterrupt:
             logger.info("Программа завершена пользователем")
+        finally:
+            if broadcast is not None:
+                broadcast.stop()
+            if decoder is not None:
+                stt_model.close()
+                decoder.close()
+            # Модели остаются в реестре, пока их используют другие встречи процесса
+            summary_service.release()
+            model_registry.release(whisper_model)
+            for stats in model_registry.stats():
+                logger.info(f"Модель в реестре: {stats}")
             
     except Exception as e:
         logger.error(f"Критическая ошибка: {e}")
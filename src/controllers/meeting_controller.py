@@ -5,15 +5,24 @@
 и генерации саммари встречи.
 """
 
+import sys
+import time
+import uuid
 from datetime import datetime
-import os
-from typing import List
+from typing import Iterable, Iterator, List, Optional
+from config.settings import settings
 from src.services.audio_capture import AudioCaptureService
 from src.services.stt_service import STTService
 from src.services.summary_service import SummaryService
 from src.services.transcript_processor import TranscriptProcessor
 from src.models.transcript import TranscriptSegment, MeetingTranscript
 from src.observers.transcript_observer import TranscriptObserver
+from src.observers.rolling_summary_observer import RollingSummaryObserver
+from src.observers.observer_dispatcher import ObserverDispatcher
+from src.controllers.pipeline import MeetingPipeline
+from src.utils import results_writer
+from src.utils.segment_journal import SegmentJournal
+from src.utils.segment_store import SpillingSegmentStore
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -32,7 +41,11 @@ class MeetingController:
         audio_service: AudioCaptureService,
         stt_service: STTService,
         summary_service: SummaryService,
-        transcript_processor: TranscriptProcessor
+        transcript_processor: TranscriptProcessor,
+        pipeline_enabled: Optional[bool] = None,
+        rolling_summary: Optional[RollingSummaryObserver] = None,
+        memory_bounded: Optional[bool] = None,
+        dispatcher: Optional[ObserverDispatcher] = None
     ):
         """
         Инициализирует контроллер встречи.
@@ -42,6 +55,14 @@ class MeetingController:
             stt_service: Сервис транскрибирования
             summary_service: Сервис генерации саммари
             transcript_processor: Процессор транскрипции
+            pipeline_enabled: Запускать стадии в отдельных потоках
+                (по умолчанию из настроек)
+            rolling_summary: Наблюдатель, ведущий саммари во время встречи;
+                если задан, по окончании встречи выполняется только его финальное обновление
+            memory_bounded: Режим ограниченной памяти: сегменты сверх окна выгружаются
+                на диск и обрабатываются потоком (по умолчанию из настроек)
+            dispatcher: Рассылка уведомлений наблюдателям (по умолчанию по настройкам
+                OBSERVER_*: у каждого наблюдателя своя очередь и поток)
         """
         self.audio_service = audio_service
         self.stt_service = stt_service
@@ -51,16 +72,31 @@ class MeetingController:
         self.segments: List[TranscriptSegment] = []
         self.is_meeting_active = False
         self.start_time = None
+        self.meeting_id: Optional[str] = None
+        # Ошибка, прервавшая последнюю встречу (транскрипция сохранена не полностью)
+        self.last_error: Optional[Exception] = None
+        self.pipeline_enabled = settings.PIPELINE_ENABLED if pipeline_enabled is None else pipeline_enabled
+        self.pipeline: Optional[MeetingPipeline] = None
+        self.dispatcher = dispatcher or ObserverDispatcher()
+        self.rolling_summary = rolling_summary
+        if rolling_summary is not None:
+            # Скользящему саммари нужны все сегменты без склейки
+            self.add_observer(rolling_summary, policy="block")
+        self.last_summary_latency: Optional[float] = None
+        self.journal: Optional[SegmentJournal] = None
+        self.memory_bounded = settings.MEMORY_BOUNDED_MODE if memory_bounded is None else memory_bounded
         logger.info("MeetingController инициализирован")
         
-    def add_observer(self, observer: TranscriptObserver):
+    def add_observer(self, observer: TranscriptObserver, policy: Optional[str] = None):
         """
         Добавляет наблюдателя за транскрипцией.
         
         Args:
             observer: Наблюдатель для уведомления о новых сегментах
+            policy: Политика переполнения его очереди (по умолчанию OBSERVER_QUEUE_POLICY)
         """
         self.observers.append(observer)
+        self.dispatcher.add(observer, policy)
         
     def start_meeting(self):
         """
@@ -71,78 +107,195 @@ class MeetingController:
         """
         logger.info("Начало встречи")
         self.is_meeting_active = True
-        self.segments = []
+        self.segments = SpillingSegmentStore() if self.memory_bounded else []
         self.start_time = datetime.now()
+        # Суффикс различает встречи процесса, начатые в одну секунду
+        self.meeting_id = results_writer.meeting_file_id(self.start_time, uuid.uuid4().hex[:8])
+        self.last_error = None
+        self.transcript_processor.reset()
+        self._open_journal()
+        self.dispatcher.start()
         
         try:
-            # Захват аудио
-            audio_stream = self.audio_service.start_capture()
-            
-            # Транскрибирование в реальном времени
-            for segment in self.stt_service.transcribe_stream(audio_stream):
-                segment.start_time = (datetime.now() - self.start_time).total_seconds()
-                self.segments.append(segment)
+            if self.pipeline_enabled:
+                self.pipeline = MeetingPipeline(
+                    self.audio_service,
+                    self.stt_service,
+                    self.transcript_processor,
+                    self.on_segment
+                )
+                self.pipeline.start()
+                self.pipeline.wait()
+            else:
+                # Захват аудио
+                audio_stream = self.audio_service.start_capture()
                 
-                # Уведомляем наблюдателей
-                for observer in self.observers:
-                    observer.on_new_segment(segment)
+                # Транскрибирование в реальном времени;
+                # временные метки сегментов задаются STT сервисом по аудио часам
+                # Сегменты обрабатываются по мере поступления
+                for segment in self.stt_service.transcribe_stream(audio_stream):
+                    processed = self.transcript_processor.process_segment(segment)
+                    if processed is not None:
+                        self.on_segment(processed)
                     
         except KeyboardInterrupt:
             logger.info("Встреча прервана пользователем")
         except Exception as e:
             logger.error(f"Ошибка во время встречи: {e}")
+            self.last_error = e
         finally:
             self.stop_meeting()
     
+    def on_segment(self, segment: TranscriptSegment):
+        """
+        Сохраняет новый сегмент и уведомляет наблюдателей.
+        
+        Args:
+            segment: Новый сегмент транскрипции, уже обработанный TranscriptProcessor
+        """
+        self.segments.append(segment)
+        if self.journal is not None:
+            self.journal.append(segment)
+        
+        # Уведомляем наблюдателей (в асинхронном режиме - через их очереди)
+        self.dispatcher.on_new_segment(segment)
+    
     def stop_meeting(self):
         """
         Завершает встречу и генерирует саммари.
         
-        Обрабатывает транскрипцию, генерирует саммари
-        и сохраняет результаты в файлы.
+        Сохраняет обработанную транскрипцию, генерирует саммари
+        и сохраняет результаты в файлы. Если встречу прервала ошибка
+        (в том числе ошибка стадии конвейера), она сообщается в журнале
+        и сохраняется в last_error, а сохраняются уже полученные сегменты.
         
         Returns:
             tuple: (summary, transcript_path, summary_path) - сгенерированное саммари и пути к файлам
         """
         logger.info("Завершение встречи")
+        stopped_at = time.perf_counter()
         self.is_meeting_active = False
         self.audio_service.stop_capture()
+        if self.pipeline is not None:
+            # Дожидаемся обработки уже захваченного аудио
+            try:
+                self.pipeline.stop()
+            except Exception as e:
+                self.last_error = e
+            self.pipeline = None
+        if self.last_error is not None:
+            logger.error(f"Встреча прервана ошибкой, транскрипция сохраняется не полностью: {self.last_error}")
+        # Наблюдатели (в том числе скользящее саммари) дообрабатывают сегменты
+        self.dispatcher.flush()
+        for name, stats in self.transcript_processor.get_stats().items():
+            logger.info(f"Обработка транскрипции, правило {name}: {stats}")
         
         if self.segments:
-            # Обработка транскрипции
-            processed_segments = self.transcript_processor.process_segments(self.segments)
-            
-            # Создание объекта транскрипции
-            transcript = MeetingTranscript(
-                segments=processed_segments,
-                created_at=self.start_time,
-                duration=(datetime.now() - self.start_time).total_seconds()
-            )
-            
-            # Сохранение транскрипции
-            transcript_path = self.save_transcript(transcript)
+            duration = (datetime.now() - self.start_time).total_seconds()
+            if self.memory_bounded:
+                # Сегменты записываются потоком, саммари читает их из файла
+                transcript_path = self.save_segments(self.segments, self.start_time, duration)
+                make_tokens = lambda: self.summary_service.summarize_segments_stream(
+                    results_writer.read_transcript_segments(transcript_path)
+                )
+            else:
+                # Сегменты уже обработаны при поступлении
+                transcript = MeetingTranscript(
+                    segments=self.segments,
+                    created_at=self.start_time,
+                    duration=duration
+                )
+                
+                # Сохранение транскрипции
+                transcript_path = self.save_transcript(transcript)
+                make_tokens = lambda: self.summary_service.summarize_transcript_stream(transcript)
             
-            # Генерация саммари
-            full_text = transcript.get_full_text()
-            summary = self.summary_service.summarize(full_text)
+            # После сохранения транскрипции журнал больше не нужен
+            self._remove_journal()
+            self._release_segments()
             
-            # Сохранение саммари
-            summary_path = self.save_summary(summary, self.start_time)
+            # Генерация саммари; токены выводятся и сохраняются по мере появления
+            if self.rolling_summary is not None:
+                source = self.rolling_summary
+                tokens = self.rolling_summary.finalize_stream()
+            else:
+                source = self.summary_service
+                tokens = make_tokens()
             
-            # Вывод в консоль
             logger.info("=== САММАРИ ВСТРЕЧИ ===")
-            print(summary)
+            summary_path, summary = self.save_summary_stream(self._broadcast_summary(tokens), self.start_time)
             logger.info("========================")
+            self.last_summary_latency = time.perf_counter() - stopped_at
+            
             logger.info(f"💾 Транскрипция сохранена в: {transcript_path}")
             logger.info(f"💾 Саммари сохранено в: {summary_path}")
+            logger.info(f"⏱ Саммари готово через {self.last_summary_latency:.1f} с после окончания встречи")
+            metrics = source.last_metrics
+            if metrics is not None:
+                logger.info(
+                    f"⏱ Первый токен саммари через {metrics.time_to_first_token:.2f} с, "
+                    f"{metrics.tokens_per_second:.1f} токенов/с"
+                )
+            
+            self.dispatcher.close()
+            self._release_summary_model()
             
             return summary, transcript_path, summary_path
         else:
             logger.warning("Нет данных для саммари")
+            self._remove_journal()
+            self._release_segments()
+            if self.rolling_summary is not None:
+                self.rolling_summary.finalize()
             message = "Встреча не содержала речи"
             summary_path = self.save_summary(message, datetime.now())
+            self.dispatcher.close()
+            self._release_summary_model()
             return message, None, summary_path
     
+    def _open_journal(self):
+        """Создает журнал сегментов встречи, если он включен в настройках"""
+        self.journal = None
+        if not settings.JOURNAL_ENABLED:
+            return
+        try:
+            self.journal = SegmentJournal(self.meeting_id, self.start_time)
+        except OSError as e:
+            logger.warning(f"Не удалось создать журнал встречи: {e}")
+    
+    def _remove_journal(self):
+        """Удаляет журнал после сохранения транскрипции"""
+        if self.journal is not None:
+            self.journal.remove()
+            self.journal = None
+    
+    def _release_segments(self):
+        """Удаляет файл выгрузки сегментов в режиме ограниченной памяти"""
+        if isinstance(self.segments, SpillingSegmentStore):
+            self.segments.close()
+    
+    def _release_summary_model(self):
+        """Выгружает LLM после итогового саммари, если это включено в настройках"""
+        if settings.LLM_UNLOAD_AFTER_USE:
+            self.summary_service.release()
+    
+    def _broadcast_summary(self, tokens: Iterable[str]) -> Iterator[str]:
+        """
+        Выводит токены саммари в консоль и уведомляет наблюдателей.
+        
+        Args:
+            tokens: Токены саммари в порядке генерации
+            
+        Yields:
+            str: Тот же токен для дальнейшей обработки
+        """
+        for token in tokens:
+            sys.stdout.write(token)
+            sys.stdout.flush()
+            self.dispatcher.on_summary_token(token)
+            yield token
+        print()
+    
     def save_transcript(self, transcript: MeetingTranscript) -> str:
         """
         Сохраняет транскрипцию в файл.
@@ -153,27 +306,21 @@ class MeetingController:
         Returns:
             str: Путь к сохраненному файлу
         """
-        # Создаем папку для результатов
-        results_dir = "results"
-        os.makedirs(results_dir, exist_ok=True)
-        
-        # Формируем имя файла
-        timestamp = transcript.created_at.strftime("%Y%m%d_%H%M%S")
-        filename = f"transcript_{timestamp}.txt"
-        filepath = os.path.join(results_dir, filename)
+        return results_writer.save_transcript(transcript, meeting_id=self.meeting_id)
+    
+    def save_segments(self, segments: Iterable[TranscriptSegment], created_at: datetime, duration: float) -> str:
+        """
+        Сохраняет транскрипцию из потока сегментов.
         
-        # Сохраняем транскрипцию
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Транскрипция встречи от {transcript.created_at}\n")
-            f.write(f"Длительность: {transcript.duration:.2f} секунд\n")
-            f.write("=" * 50 + "\n\n")
+        Args:
+            segments: Обработанные сегменты по порядку
+            created_at: Время начала встречи
+            duration: Длительность встречи в секундах
             
-            for segment in transcript.segments:
-                speaker = segment.speaker or "Неизвестный"
-                f.write(f"[{segment.start_time:.2f}s] {speaker}: {segment.text}\n")
-        
-        logger.info(f"Транскрипция сохранена в: {filepath}")
-        return filepath
+        Returns:
+            str: Путь к сохраненному файлу
+        """
+        return results_writer.save_segments(segments, created_at, duration, meeting_id=self.meeting_id)
     
     def save_summary(self, summary: str, created_at: datetime) -> str:
         """
@@ -186,21 +333,17 @@ class MeetingController:
         Returns:
             str: Путь к сохраненному файлу
         """
-        # Создаем папку для результатов
-        results_dir = "results"
-        os.makedirs(results_dir, exist_ok=True)
-        
-        # Формируем имя файла
-        timestamp = created_at.strftime("%Y%m%d_%H%M%S")
-        filename = f"summary_{timestamp}.txt"
-        filepath = os.path.join(results_dir, filename)
-        
-        # Сохраняем саммари
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(f"Саммари встречи от {created_at}\n")
-            f.write("=" * 30 + "\n\n")
-            f.write(summary)
-            f.write("\n")
+        return results_writer.save_summary(summary, created_at, meeting_id=self.meeting_id)
+    
+    def save_summary_stream(self, tokens: Iterable[str], created_at: datetime) -> tuple:
+        """
+        Сохраняет саммари в файл по мере генерации.
         
-        logger.info(f"Саммари сохранено в: {filepath}")
-        return filepath
+        Args:
+            tokens: Токены саммари в порядке генерации
+            created_at: Время создания саммари
+            
+        Returns:
+            tuple: (путь к сохраненному файлу, полный текст саммари)
+        """
+        return results_writer.save_summary_stream(tokens, created_at, meeting_id=self.meeting_id)
@@ -0,0 +1,169 @@
+"""
+Многопоточный конвейер обработки встречи.
+
+Запускает захват аудио, транскрибирование, постобработку
+и уведомление наблюдателей в отдельных потоках, связанных
+ограниченными очередями.
+"""
+
+import threading
+from typing import Callable, List, Optional
+from config.settings import settings
+from src.services.audio_capture import AudioCaptureService
+from src.services.stt_service import STTService
+from src.services.transcript_processor import TranscriptProcessor
+from src.models.transcript import TranscriptSegment
+from src.utils.bounded_queue import BoundedQueue
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class MeetingPipeline:
+    """
+    Конвейер из четырех стадий:
+
+    capture -> [audio] -> stt -> [segments] -> postprocess -> [processed] -> dispatch
+
+    Каждая стадия работает в своем потоке и читает из очереди
+    предыдущей стадии, поэтому медленная стадия не останавливает
+    остальные, пока ее входная очередь не заполнится. Завершение
+    распространяется по цепочке закрытием очередей.
+    """
+
+    def __init__(
+        self,
+        audio_service: AudioCaptureService,
+        stt_service: STTService,
+        transcript_processor: TranscriptProcessor,
+        on_segment: Callable[[TranscriptSegment], None]
+    ):
+        """
+        Инициализирует конвейер.
+
+        Args:
+            audio_service: Сервис захвата аудио
+            stt_service: Сервис транскрибирования (с VAD, если настроен)
+            transcript_processor: Процессор для очистки сегментов
+            on_segment: Обработчик готового сегмента (стадия dispatch)
+        """
+        self.audio_service = audio_service
+        self.stt_service = stt_service
+        self.transcript_processor = transcript_processor
+        self.on_segment = on_segment
+
+        self.audio_queue = BoundedQueue(
+            settings.PIPELINE_AUDIO_QUEUE_SIZE, settings.PIPELINE_AUDIO_QUEUE_POLICY, "audio"
+        )
+        self.segment_queue = BoundedQueue(
+            settings.PIPELINE_SEGMENT_QUEUE_SIZE, settings.PIPELINE_SEGMENT_QUEUE_POLICY, "segments"
+        )
+        self.processed_queue = BoundedQueue(
+            settings.PIPELINE_SEGMENT_QUEUE_SIZE, settings.PIPELINE_SEGMENT_QUEUE_POLICY, "processed"
+        )
+        self.threads: List[threading.Thread] = []
+        self.error: Optional[Exception] = None
+
+    def start(self):
+        """Запускает потоки всех стадий"""
+        stages = [
+            ("capture", self._capture, None),
+            ("stt", self._transcribe, self.audio_queue),
+            ("postprocess", self._postprocess, self.segment_queue),
+            ("dispatch", self._dispatch, self.processed_queue),
+        ]
+        for name, target, input_queue in stages:
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(name, target, input_queue),
+                name=f"pipeline-{name}",
+                daemon=True
+            )
+            self.threads.append(thread)
+            thread.start()
+        logger.info("Конвейер встречи запущен")
+
+    def _run_stage(self, name: str, target: Callable[[], None], input_queue: Optional[BoundedQueue]):
+        """Выполняет стадию и при ошибке закрывает ее входную очередь"""
+        try:
+            target()
+        except Exception as e:
+            logger.error(f"Ошибка в стадии {name}: {e}")
+            self.error = self.error or e
+            self.audio_service.stop_capture()
+            if input_queue is not None:
+                # Освобождаем писателей предыдущей стадии
+                input_queue.close()
+
+    def _capture(self):
+        try:
+            for chunk in self.audio_service.start_capture():
+                if not self.audio_queue.put(chunk):
+                    if self.audio_queue.closed:
+                        break
+        finally:
+            self.audio_queue.close()
+
+    def _transcribe(self):
+        try:
+            for segment in self.stt_service.transcribe_stream(iter(self.audio_queue)):
+                self.segment_queue.put(segment)
+        finally:
+            self.segment_queue.close()
+
+    def _postprocess(self):
+        try:
+            for segment in self.segment_queue:
+                processed = self.transcript_processor.process_segment(segment)
+                if processed is not None:
+                    self.processed_queue.put(processed)
+        finally:
+            self.processed_queue.close()
+
+    def _dispatch(self):
+        for segment in self.processed_queue:
+            self.on_segment(segment)
+
+    def is_running(self) -> bool:
+        """Работает ли хотя бы одна стадия"""
+        return any(thread.is_alive() for thread in self.threads)
+
+    def wait(self, poll_interval: float = 0.5):
+        """
+        Ожидает завершения всех стадий.
+
+        Ожидание идет короткими интервалами, чтобы главный поток
+        мог получить KeyboardInterrupt.
+        """
+        for thread in self.threads:
+            while thread.is_alive():
+                thread.join(poll_interval)
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Останавливает захват и дожидается обработки уже захваченного аудио.
+
+        Args:
+            timeout: Максимальное ожидание каждой стадии (секунды)
+
+        Raises:
+            Exception: Первая ошибка стадии, если конвейер остановился из-за нее
+                (сегменты после ошибки не обработаны)
+        """
+        self.audio_service.stop_capture()
+        for thread in self.threads:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning(f"Стадия {thread.name} не завершилась за отведенное время")
+        for stats in self.get_stats():
+            logger.info(f"Очередь {stats['name']}: {stats}")
+        if self.error is not None:
+            raise self.error
+
+    def get_stats(self) -> List[dict]:
+        """
+        Возвращает статистику очередей между стадиями.
+
+        Returns:
+            List[dict]: Статистика каждой очереди
+        """
+        return [queue.stats() for queue in (self.audio_queue, self.segment_queue, self.processed_queue)]
@@ -5,80 +5,240 @@
 и полной транскрипции встречи.
 """
 
+import sys
+from array import array
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
-@dataclass
+# __slots__ у dataclass с полями по умолчанию поддерживаются с Python 3.10
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Идентификатор отсутствующего спикера в колонке спикеров
+NO_SPEAKER = -1
+
+@dataclass(**_SLOTS)
 class TranscriptSegment:
     """
     Сегмент транскрипции.
-    
+
     Представляет одну часть транскрибированного текста
     с временной меткой и дополнительной информацией.
-    
+
     Attributes:
         start_time: Время начала сегмента в секундах
         end_time: Время окончания сегмента в секундах
         text: Транскрибированный текст
         speaker: Идентификатор спикера (опционально)
     """
-    
+
     start_time: float
     """Время начала сегмента в секундах от начала записи"""
-    
+
     end_time: float
     """Время окончания сегмента в секундах от начала записи"""
-    
+
     text: str
     """Транскрибированный текст сегмента"""
-    
+
     speaker: Optional[str] = None
     """Идентификатор спикера (если определен)"""
 
-@dataclass
+class SegmentsView:
+    """
+    Представление сегментов транскрипции в виде последовательности.
+
+    Сегменты создаются из колонок MeetingTranscript при обращении,
+    поэтому изменение полученного сегмента не меняет транскрипцию.
+    """
+
+    def __init__(self, transcript: "MeetingTranscript"):
+        self._transcript = transcript
+
+    def __len__(self) -> int:
+        return len(self._transcript._starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._transcript.segment(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("индекс сегмента вне диапазона")
+        return self._transcript.segment(index)
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        for i in range(len(self)):
+            yield self._transcript.segment(i)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
 class MeetingTranscript:
     """
     Полная транскрипция встречи.
-    
+
     Содержит все сегменты транскрипции, метаданные встречи
     и методы для работы с полным текстом.
-    
+
+    Сегменты хранятся по колонкам: времена - в массивах чисел,
+    спикеры - номерами в таблице имен, тексты - подряд в одном
+    буфере UTF-8 с массивом смещений. Для каждого спикера ведется
+    список номеров его сегментов, полный текст кэшируется и
+    сбрасывается при добавлении сегмента.
+
     Attributes:
-        segments: Список сегментов транскрипции
+        segments: Сегменты транскрипции (последовательность TranscriptSegment)
         created_at: Время создания транскрипции
         duration: Длительность встречи в секундах
     """
-    
-    segments: List[TranscriptSegment]
-    """Список всех сегментов транскрипции встречи"""
-    
-    created_at: datetime
-    """Время создания транскрипции"""
-    
-    duration: float
-    """Длительность встречи в секундах"""
-    
+
+    def __init__(
+        self,
+        segments: Iterable[TranscriptSegment],
+        created_at: datetime,
+        duration: float
+    ):
+        """
+        Создает транскрипцию.
+
+        Args:
+            segments: Сегменты транскрипции
+            created_at: Время создания транскрипции
+            duration: Длительность встречи в секундах
+        """
+        self.created_at = created_at
+        """Время создания транскрипции"""
+
+        self.duration = duration
+        """Длительность встречи в секундах"""
+
+        self.segments = segments
+
+    @property
+    def segments(self) -> SegmentsView:
+        """Список всех сегментов транскрипции встречи"""
+        return SegmentsView(self)
+
+    @segments.setter
+    def segments(self, segments: Iterable[TranscriptSegment]):
+        self._starts = array("d")
+        self._ends = array("d")
+        self._speaker_ids = array("i")
+        # Тексты хранятся через пробел, поэтому буфер без последнего байта - полный текст
+        self._arena = bytearray()
+        self._offsets = array("Q", [0])
+        self._speakers: List[str] = []
+        self._speaker_lookup: Dict[str, int] = {}
+        self._speaker_index: Dict[int, array] = {}
+        self._full_text: Optional[str] = None
+        self._speaker_text: Dict[int, str] = {}
+        for segment in segments:
+            self.append(segment)
+
+    def append(self, segment: TranscriptSegment):
+        """
+        Добавляет сегмент в конец транскрипции.
+
+        Args:
+            segment: Новый сегмент
+        """
+        speaker_id = self._intern_speaker(segment.speaker)
+        self._starts.append(segment.start_time)
+        self._ends.append(segment.end_time)
+        self._speaker_ids.append(speaker_id)
+        self._arena += segment.text.encode("utf-8")
+        self._arena += b" "
+        self._offsets.append(len(self._arena))
+        self._full_text = None
+        if speaker_id != NO_SPEAKER:
+            self._speaker_index[speaker_id].append(len(self._starts) - 1)
+            self._speaker_text.pop(speaker_id, None)
+
+    def _intern_speaker(self, speaker: Optional[str]) -> int:
+        if speaker is None:
+            return NO_SPEAKER
+        speaker_id = self._speaker_lookup.get(speaker)
+        if speaker_id is None:
+            speaker_id = len(self._speakers)
+            self._speakers.append(speaker)
+            self._speaker_lookup[speaker] = speaker_id
+            self._speaker_index[speaker_id] = array("I")
+        return speaker_id
+
+    def _text(self, index: int) -> str:
+        return self._arena[self._offsets[index]:self._offsets[index + 1] - 1].decode("utf-8")
+
+    def segment(self, index: int) -> TranscriptSegment:
+        """
+        Возвращает сегмент по номеру.
+
+        Args:
+            index: Номер сегмента
+
+        Returns:
+            TranscriptSegment: Новый объект сегмента
+        """
+        speaker_id = self._speaker_ids[index]
+        return TranscriptSegment(
+            start_time=self._starts[index],
+            end_time=self._ends[index],
+            text=self._text(index),
+            speaker=None if speaker_id == NO_SPEAKER else self._speakers[speaker_id]
+        )
+
+    @property
+    def speakers(self) -> List[str]:
+        """Спикеры в порядке первого появления"""
+        return list(self._speakers)
+
     def get_full_text(self) -> str:
         """
         Возвращает полный текст транскрипции.
-        
+
         Returns:
             str: Объединенный текст всех сегментов
         """
-        return " ".join([segment.text for segment in self.segments])
-    
+        if self._full_text is None:
+            self._full_text = self._arena[:-1].decode("utf-8")
+        return self._full_text
+
     def get_speaker_text(self, speaker: str) -> str:
         """
         Возвращает текст всех сегментов определенного спикера.
-        
+
         Args:
             speaker: Идентификатор спикера
-            
+
         Returns:
             str: Текст всех сегментов указанного спикера
         """
-        return " ".join([
-            segment.text for segment in self.segments 
-            if segment.speaker == speaker
-        ])
+        speaker_id = self._speaker_lookup.get(speaker)
+        if speaker_id is None:
+            return ""
+        text = self._speaker_text.get(speaker_id)
+        if text is None:
+            text = " ".join(self._text(index) for index in self._speaker_index[speaker_id])
+            self._speaker_text[speaker_id] = text
+        return text
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, MeetingTranscript):
+            return NotImplemented
+        return (
+            self.created_at == other.created_at
+            and self.duration == other.duration
+            and self.segments == other.segments
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"MeetingTranscript(segments={self.segments!r}, "
+            f"created_at={self.created_at!r}, duration={self.duration!r})"
+        )
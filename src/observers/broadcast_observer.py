@@ -0,0 +1,315 @@
+"""
+Трансляция транскрипции по локальной сети.
+
+Наблюдатель поднимает HTTP сервер на asyncio и отдает сегменты
+подписчикам как Server-Sent Events (GET /events). Каждый сегмент
+получает номер (id события), поэтому переподключившийся клиент
+продолжает с нужного места по заголовку Last-Event-ID или параметру
+?offset=N. Событие кодируется один раз для всех подписчиков, у каждого
+подписчика своя ограниченная очередь: клиент, который не успевает
+читать, отключается и может переподключиться с повтором пропущенного.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+from config.settings import settings
+from src.models.transcript import TranscriptSegment
+from src.observers.transcript_observer import TranscriptObserver
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Путь потока событий
+EVENTS_PATH = "/events"
+
+# Максимальный размер заголовков запроса
+MAX_REQUEST_BYTES = 16 * 1024
+
+_STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream; charset=utf-8\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"Access-Control-Allow-Origin: *\r\n"
+    b"\r\n"
+)
+
+_HEARTBEAT = b": ping\n\n"
+
+# Событие, после которого сервер закрывает поток
+_END = object()
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> bytes:
+    """
+    Кодирует событие Server-Sent Events.
+
+    Args:
+        event: Тип события
+        data: Данные события (сериализуются в JSON одной строкой)
+        event_id: Номер события для повтора при переподключении
+
+    Returns:
+        bytes: Событие в кодировке UTF-8
+    """
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append("data: " + json.dumps(data, ensure_ascii=False))
+    return ("\n".join(lines) + "\n\n").encode("utf-8")
+
+def _response(status: str, body: str) -> bytes:
+    payload = body.encode("utf-8")
+    return (
+        f"HTTP/1.1 {status}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n"
+    ).encode("ascii") + payload
+
+class _Subscriber:
+    """Подключенный клиент и его очередь событий"""
+
+    def __init__(self, writer: asyncio.StreamWriter, queue_size: int):
+        self.writer = writer
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.task = asyncio.current_task()
+
+    def drop(self):
+        """Обрывает соединение и останавливает отправку"""
+        self.writer.transport.abort()
+        if self.task is not None:
+            self.task.cancel()
+
+class BroadcastTranscriptObserver(TranscriptObserver):
+    """
+    Наблюдатель, транслирующий сегменты и токены саммари подписчикам SSE.
+
+    Сервер работает в собственном потоке с циклом событий asyncio;
+    on_new_segment и on_summary_token только передают событие в этот
+    цикл и не ждут отправки клиентам.
+    """
+
+    def __init__(
+        self,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        history_size: Optional[int] = None,
+        client_queue_size: Optional[int] = None,
+        heartbeat_seconds: Optional[float] = None
+    ):
+        """
+        Инициализирует наблюдатель (сервер запускается методом start).
+
+        Args:
+            host: Адрес сервера (по умолчанию BROADCAST_HOST)
+            port: Порт сервера, 0 - любой свободный (по умолчанию BROADCAST_PORT)
+            history_size: Сколько последних сегментов хранить для повтора (по умолчанию BROADCAST_HISTORY_SIZE)
+            client_queue_size: Очередь событий подписчика (по умолчанию BROADCAST_CLIENT_QUEUE_SIZE)
+            heartbeat_seconds: Период служебных сообщений (по умолчанию BROADCAST_HEARTBEAT_SECONDS)
+        """
+        self.host = host or settings.BROADCAST_HOST
+        self.port = settings.BROADCAST_PORT if port is None else port
+        self.client_queue_size = client_queue_size or settings.BROADCAST_CLIENT_QUEUE_SIZE
+        self.heartbeat_seconds = heartbeat_seconds or settings.BROADCAST_HEARTBEAT_SECONDS
+        self.history: deque = deque(maxlen=history_size or settings.BROADCAST_HISTORY_SIZE)
+        self.next_id = 0
+        self.subscribers: Dict[int, _Subscriber] = {}
+        self.connections = 0
+        self.slow_disconnects = 0
+        self._handlers = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def url(self) -> str:
+        """Адрес потока событий"""
+        return f"http://{self.host}:{self.port}{EVENTS_PATH}"
+
+    def start(self):
+        """
+        Запускает сервер в фоновом потоке и ждет готовности.
+
+        Raises:
+            OSError: Если порт недоступен
+        """
+        self._thread = threading.Thread(target=self._run, name="broadcast-server", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        logger.info(f"Трансляция транскрипции: {self.url}")
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle_client, self.host, self.port, backlog=1024)
+            )
+        except OSError as e:
+            self._error = e
+            self._ready.set()
+            self._loop.close()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    def on_new_segment(self, segment: TranscriptSegment):
+        """
+        Передает сегмент подписчикам.
+
+        Args:
+            segment: Новый сегмент транскрипции
+        """
+        data = {
+            "start_time": segment.start_time,
+            "end_time": segment.end_time,
+            "speaker": segment.speaker,
+            "text": segment.text,
+        }
+        self._call(self._publish_segment, data)
+
+    def on_summary_token(self, token: str):
+        """
+        Передает токен саммари подписчикам (без повтора при переподключении).
+
+        Args:
+            token: Текст токена
+        """
+        self._call(self._publish, format_event("summary", {"token": token}))
+
+    def _call(self, callback, *args):
+        if self._loop is not None and not self._loop.is_closed():
+            try:
+                self._loop.call_soon_threadsafe(callback, *args)
+            except RuntimeError:
+                # Цикл уже остановлен
+                pass
+
+    def _publish_segment(self, data: dict):
+        event_id = self.next_id
+        self.next_id += 1
+        data["index"] = event_id
+        event = format_event("segment", data, event_id)
+        self.history.append((event_id, event))
+        self._publish(event)
+
+    def _publish(self, event):
+        for key, subscriber in list(self.subscribers.items()):
+            try:
+                subscriber.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Клиент не успевает читать: отключаем, он продолжит с Last-Event-ID
+                self.slow_disconnects += 1
+                del self.subscribers[key]
+                subscriber.drop()
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            request = await self._read_request(reader)
+            if request is None:
+                writer.write(_response("400 Bad Request", "bad request"))
+                return
+            path, offset = request
+            if path != EVENTS_PATH:
+                writer.write(_response("404 Not Found", "not found"))
+                return
+            await self._stream(writer, offset)
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+            try:
+                # Дожидаемся отправки буфера до остановки цикла
+                await writer.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            self._handlers.discard(task)
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, int]]:
+        """Читает запрос и возвращает путь и номер первого сегмента для повтора"""
+        head = await reader.readuntil(b"\r\n\r\n")
+        if len(head) > MAX_REQUEST_BYTES:
+            return None
+        lines = head.decode("latin-1").split("\r\n")
+        parts = lines[0].split()
+        if len(parts) != 3 or parts[0] != "GET":
+            return None
+        url = urlsplit(parts[1])
+        offset = 0
+        try:
+            values = parse_qs(url.query).get("offset")
+            if values:
+                offset = int(values[0])
+            for line in lines[1:]:
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "last-event-id" and value.strip():
+                    offset = max(offset, int(value.strip()) + 1)
+        except ValueError:
+            return None
+        return url.path, max(offset, 0)
+
+    async def _stream(self, writer: asyncio.StreamWriter, offset: int):
+        """Отправляет пропущенные сегменты, затем новые события до отключения"""
+        subscriber = _Subscriber(writer, self.client_queue_size)
+        key = id(subscriber)
+        # Подписка и снимок истории в одном шаге цикла: событие не теряется и не дублируется
+        self.subscribers[key] = subscriber
+        backlog = [event for event_id, event in self.history if event_id >= offset]
+        self.connections += 1
+        try:
+            writer.write(_STREAM_HEADERS)
+            for event in backlog:
+                writer.write(event)
+                await writer.drain()
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    event = _HEARTBEAT
+                if event is _END:
+                    break
+                writer.write(event)
+                await writer.drain()
+        finally:
+            self.subscribers.pop(key, None)
+
+    def stop(self, timeout: float = 5.0):
+        """Отправляет подписчикам событие end, закрывает соединения и останавливает сервер"""
+        if self._loop is None or self._loop.is_closed():
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(timeout), self._loop)
+        try:
+            future.result(timeout + 1)
+        except Exception as e:
+            logger.warning(f"Ошибка остановки трансляции: {e}")
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+        logger.info(
+            f"Трансляция остановлена: подключений {self.connections}, "
+            f"отключено медленных клиентов {self.slow_disconnects}"
+        )
+
+    async def _shutdown(self, timeout: float):
+        self._server.close()
+        self._publish(format_event("end", {"segments": self.next_id}))
+        for subscriber in list(self.subscribers.values()):
+            try:
+                subscriber.queue.put_nowait(_END)
+            except asyncio.QueueFull:
+                subscriber.drop()
+        if self._handlers:
+            await asyncio.wait(set(self._handlers), timeout=timeout)
+        for subscriber in list(self.subscribers.values()):
+            subscriber.drop()
+        await self._server.wait_closed()
@@ -0,0 +1,321 @@
+"""
+Доставка уведомлений наблюдателям за транскрипцией.
+
+В асинхронном режиме у каждого наблюдателя своя ограниченная
+очередь и рабочий поток, поэтому медленный наблюдатель (сетевая
+отправка, запись в файл, интерфейс) не задерживает транскрибирование.
+В синхронном режиме наблюдатели вызываются в потоке транскрибирования,
+как раньше.
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from config.settings import settings
+from src.models.transcript import TranscriptSegment
+from src.observers.transcript_observer import TranscriptObserver
+from src.utils.bounded_queue import BoundedQueue, QueueClosed
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+DISPATCH_MODES = ("sync", "async")
+
+@dataclass
+class ObserverEvent:
+    """Уведомление в очереди наблюдателя"""
+
+    kind: str
+    """Вид уведомления: segment или summary_token"""
+
+    payload: Any
+    """Сегмент или текст токена"""
+
+    enqueued_at: float
+    """Момент постановки в очередь (time.monotonic) для расчета отставания"""
+
+def coalesce_events(last: ObserverEvent, new: ObserverEvent) -> Optional[ObserverEvent]:
+    """
+    Объединяет два уведомления для политики coalesce.
+
+    Соседние сегменты одного спикера склеиваются в один сегмент,
+    соседние токены саммари - в один фрагмент текста. Время
+    постановки берется у более раннего уведомления.
+
+    Args:
+        last: Последнее уведомление в очереди
+        new: Новое уведомление
+
+    Returns:
+        Optional[ObserverEvent]: Объединенное уведомление или None, если объединить нельзя
+    """
+    if last.kind != new.kind:
+        return None
+    if last.kind == "summary_token":
+        return ObserverEvent(last.kind, last.payload + new.payload, last.enqueued_at)
+    if last.payload.speaker != new.payload.speaker:
+        return None
+    segment = TranscriptSegment(
+        start_time=last.payload.start_time,
+        end_time=new.payload.end_time,
+        text=f"{last.payload.text} {new.payload.text}",
+        speaker=last.payload.speaker
+    )
+    return ObserverEvent(last.kind, segment, last.enqueued_at)
+
+class ObserverChannel:
+    """
+    Канал доставки уведомлений одному наблюдателю.
+
+    Ведет метрики: отставание (время от постановки уведомления
+    до начала его обработки), задержку обработки, количество
+    доставленных уведомлений, ошибок и медленных вызовов.
+    """
+
+    def __init__(
+        self,
+        observer: TranscriptObserver,
+        mode: str,
+        queue_size: int,
+        policy: str,
+        put_timeout: float,
+        slow_call_seconds: float
+    ):
+        """
+        Создает канал; в асинхронном режиме - с очередью и рабочим потоком.
+
+        Args:
+            observer: Наблюдатель
+            mode: Режим доставки (sync, async)
+            queue_size: Емкость очереди
+            policy: Политика переполнения очереди
+            put_timeout: Максимальное ожидание места в очереди для политики block
+            slow_call_seconds: Порог медленного вызова наблюдателя
+        """
+        self.observer = observer
+        self.name = type(observer).__name__
+        self.mode = mode
+        self.put_timeout = put_timeout
+        self.slow_call_seconds = slow_call_seconds
+        self.delivered = 0
+        self.errors = 0
+        self.slow_calls = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self._handled = threading.Condition()
+        self.queue: Optional[BoundedQueue] = None
+        self.thread: Optional[threading.Thread] = None
+        if mode == "async":
+            self.queue = BoundedQueue(queue_size, policy, self.name, coalesce=coalesce_events)
+            self.thread = threading.Thread(target=self._run, name=f"observer-{self.name}", daemon=True)
+            self.thread.start()
+
+    def put(self, event: ObserverEvent):
+        """Доставляет уведомление сразу (sync) или ставит в очередь (async)"""
+        if self.queue is None:
+            self._handle(event)
+        elif not self.queue.put(event, timeout=self.put_timeout) and not self.queue.closed:
+            logger.debug(f"Уведомление для {self.name} отброшено: очередь заполнена")
+
+    def _run(self):
+        """Цикл рабочего потока наблюдателя"""
+        while True:
+            try:
+                event = self.queue.get()
+            except QueueClosed:
+                return
+            self._handle(event)
+
+    def _handle(self, event: ObserverEvent):
+        started = time.monotonic()
+        lag = started - event.enqueued_at
+        try:
+            if event.kind == "segment":
+                self.observer.on_new_segment(event.payload)
+            else:
+                self.observer.on_summary_token(event.payload)
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Ошибка наблюдателя {self.name}: {e}")
+        latency = time.monotonic() - started
+
+        with self._handled:
+            self.delivered += 1
+            self.lag_total += lag
+            self.lag_max = max(self.lag_max, lag)
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            if latency > self.slow_call_seconds:
+                if not self.slow_calls:
+                    logger.warning(f"Наблюдатель {self.name} обрабатывает уведомление {latency:.2f} с")
+                self.slow_calls += 1
+            self._handled.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ожидает обработки всех уведомлений в очереди.
+
+        Args:
+            timeout: Максимальное ожидание (секунды)
+
+        Returns:
+            bool: True, если очередь обработана
+        """
+        if self.queue is None:
+            return True
+        with self._handled:
+            return self._handled.wait_for(
+                lambda: len(self.queue) == 0 and self.queue.get_count == self.delivered
+                or not self.thread.is_alive(),
+                timeout
+            )
+
+    def close(self, timeout: Optional[float] = None):
+        """Закрывает очередь и ожидает обработки оставшихся уведомлений"""
+        if self.queue is None:
+            return
+        self.queue.close()
+        self.thread.join(timeout)
+        if self.thread.is_alive():
+            logger.warning(f"Наблюдатель {self.name} не обработал очередь за отведенное время")
+
+    def stats(self) -> dict:
+        """
+        Возвращает метрики канала.
+
+        Returns:
+            dict: Счетчики, среднее и максимальное отставание и задержка, статистика очереди
+        """
+        with self._handled:
+            delivered = self.delivered
+            stats = {
+                "observer": self.name,
+                "mode": self.mode,
+                "delivered": delivered,
+                "errors": self.errors,
+                "slow_calls": self.slow_calls,
+                "lag_avg_seconds": round(self.lag_total / delivered, 4) if delivered else 0.0,
+                "lag_max_seconds": round(self.lag_max, 4),
+                "latency_avg_seconds": round(self.latency_total / delivered, 4) if delivered else 0.0,
+                "latency_max_seconds": round(self.latency_max, 4),
+            }
+        if self.queue is not None:
+            queue_stats = self.queue.stats()
+            for key in ("policy", "capacity", "depth", "max_depth", "dropped", "coalesced", "put_wait_seconds"):
+                stats[key] = queue_stats[key]
+        return stats
+
+class ObserverDispatcher:
+    """
+    Рассылка уведомлений о сегментах и токенах саммари наблюдателям.
+
+    Каналы создаются при start() для всех зарегистрированных
+    наблюдателей и закрываются при close(). Наблюдатель, добавленный
+    во время работы, сразу получает свой канал.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        queue_size: Optional[int] = None,
+        policy: Optional[str] = None,
+        put_timeout: Optional[float] = None,
+        slow_call_seconds: Optional[float] = None,
+        drain_timeout: Optional[float] = None
+    ):
+        """
+        Инициализирует рассылку.
+
+        Args:
+            mode: sync или async (по умолчанию OBSERVER_DISPATCH_MODE)
+            queue_size: Емкость очереди наблюдателя (по умолчанию OBSERVER_QUEUE_SIZE)
+            policy: Политика переполнения по умолчанию (по умолчанию OBSERVER_QUEUE_POLICY)
+            put_timeout: Ожидание места в очереди для политики block (по умолчанию OBSERVER_PUT_TIMEOUT_SECONDS)
+            slow_call_seconds: Порог медленного вызова (по умолчанию OBSERVER_SLOW_CALL_SECONDS)
+            drain_timeout: Ожидание обработки очередей при flush и close (по умолчанию OBSERVER_DRAIN_TIMEOUT_SECONDS)
+
+        Raises:
+            ValueError: Если режим неизвестен
+        """
+        self.mode = mode or settings.OBSERVER_DISPATCH_MODE
+        if self.mode not in DISPATCH_MODES:
+            raise ValueError(f"Неизвестный режим доставки уведомлений: {self.mode}")
+        self.queue_size = queue_size or settings.OBSERVER_QUEUE_SIZE
+        self.policy = policy or settings.OBSERVER_QUEUE_POLICY
+        self.put_timeout = put_timeout if put_timeout is not None else settings.OBSERVER_PUT_TIMEOUT_SECONDS
+        self.slow_call_seconds = (
+            slow_call_seconds if slow_call_seconds is not None else settings.OBSERVER_SLOW_CALL_SECONDS
+        )
+        self.drain_timeout = drain_timeout if drain_timeout is not None else settings.OBSERVER_DRAIN_TIMEOUT_SECONDS
+        self._observers: List[tuple] = []
+        self.channels: List[ObserverChannel] = []
+        self.running = False
+
+    def add(self, observer: TranscriptObserver, policy: Optional[str] = None):
+        """
+        Регистрирует наблюдателя.
+
+        Args:
+            observer: Наблюдатель
+            policy: Политика переполнения его очереди (по умолчанию общая)
+        """
+        self._observers.append((observer, policy))
+        if self.running:
+            self.channels.append(self._channel(observer, policy))
+
+    def _channel(self, observer: TranscriptObserver, policy: Optional[str]) -> ObserverChannel:
+        return ObserverChannel(
+            observer, self.mode, self.queue_size, policy or self.policy, self.put_timeout, self.slow_call_seconds
+        )
+
+    def start(self):
+        """Создает каналы (и рабочие потоки) для зарегистрированных наблюдателей"""
+        if self.running:
+            return
+        self.channels = [self._channel(observer, policy) for observer, policy in self._observers]
+        self.running = True
+
+    def on_new_segment(self, segment: TranscriptSegment):
+        """Рассылает новый сегмент"""
+        self._publish("segment", segment)
+
+    def on_summary_token(self, token: str):
+        """Рассылает токен саммари"""
+        self._publish("summary_token", token)
+
+    def _publish(self, kind: str, payload: Any):
+        if not self.running:
+            self.start()
+        event = ObserverEvent(kind, payload, time.monotonic())
+        for channel in self.channels:
+            channel.put(event)
+
+    def flush(self):
+        """Ожидает, пока наблюдатели обработают поставленные уведомления"""
+        deadline = time.monotonic() + self.drain_timeout
+        for channel in self.channels:
+            if not channel.flush(max(0.0, deadline - time.monotonic())):
+                logger.warning(f"Наблюдатель {channel.name} отстает: очередь не обработана")
+
+    def close(self):
+        """Дожидается обработки очередей, останавливает рабочие потоки и выводит метрики"""
+        if not self.running:
+            return
+        deadline = time.monotonic() + self.drain_timeout
+        for channel in self.channels:
+            channel.close(max(0.0, deadline - time.monotonic()))
+        for stats in self.get_stats():
+            logger.info(f"Наблюдатель {stats['observer']}: {stats}")
+        self.running = False
+
+    def get_stats(self) -> List[dict]:
+        """
+        Возвращает метрики наблюдателей.
+
+        Returns:
+            List[dict]: Метрики каждого канала
+        """
+        return [channel.stats() for channel in self.channels]
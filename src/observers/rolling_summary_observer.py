@@ -0,0 +1,256 @@
+"""
+Наблюдатель, ведущий саммари во время встречи.
+
+Периодически добавляет новые сегменты в текущее саммари
+в фоновом потоке с низким приоритетом, чтобы по окончании
+встречи оставалось только небольшое финальное обновление.
+"""
+
+import os
+import threading
+import time
+from typing import Iterator, List, Optional
+from config.settings import settings
+from src.models.transcript import TranscriptSegment
+from src.observers.transcript_observer import TranscriptObserver
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ROLLING_PROMPT = """Текущее саммари встречи:
+{summary}
+
+Новый фрагмент встречи:
+{text}
+
+Обнови саммари с учетом нового фрагмента.
+ОБНОВЛЕННОЕ САММАРИ:"""
+
+# Запас токенов на расхождение токенизации при склейке
+SAFETY_TOKENS = 16
+
+# Приоритет (nice) фонового потока
+WORKER_NICENESS = 10
+
+class RollingSummaryObserver(TranscriptObserver):
+    """
+    Наблюдатель, поддерживающий текущее саммари встречи.
+
+    Новые сегменты накапливаются и сворачиваются в саммари каждые
+    every_segments сегментов или every_seconds секунд. Свертка идет
+    в отдельном потоке и не задерживает транскрибирование. Если модель
+    не загрузилась, наблюдатель отключается и сегменты не копит.
+    """
+
+    def __init__(
+        self,
+        generator,
+        every_segments: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+        context_tokens: Optional[int] = None,
+        max_new_tokens: Optional[int] = None
+    ):
+        """
+        Инициализирует наблюдателя и запускает фоновый поток.
+
+        Args:
+            generator: Модель с методами generate, tokenize и detokenize (LlamaSummaryService)
+            every_segments: Свертка после стольких новых сегментов
+            every_seconds: Свертка не реже, чем раз в столько секунд
+            context_tokens: Размер контекста модели
+            max_new_tokens: Максимальная длина саммари
+        """
+        self.generator = generator
+        self.every_segments = every_segments or settings.ROLLING_SUMMARY_EVERY_SEGMENTS
+        self.every_seconds = every_seconds or settings.ROLLING_SUMMARY_EVERY_SECONDS
+        self.context_tokens = context_tokens or settings.LLM_CONTEXT_LENGTH
+        self.max_new_tokens = max_new_tokens or settings.SUMMARY_MAX_TOKENS
+
+        self.summary = ""
+        self.disabled = False
+        self.folds = 0
+        self.fold_seconds = 0.0
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._fold_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._last_fold = time.monotonic()
+        self._worker = threading.Thread(target=self._run, name="rolling-summary", daemon=True)
+        self._worker.start()
+
+    def on_new_segment(self, segment: TranscriptSegment):
+        """
+        Добавляет сегмент в очередь на свертку.
+
+        Args:
+            segment: Новый сегмент транскрипции
+        """
+        if self.disabled:
+            return
+        with self._lock:
+            self._pending.append(segment.text)
+            pending = len(self._pending)
+        if pending >= self.every_segments:
+            self._wakeup.set()
+
+    def _run(self):
+        """Цикл фонового потока свертки"""
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), WORKER_NICENESS)
+        except (AttributeError, OSError):
+            # Приоритет отдельного потока поддерживается не везде
+            pass
+
+        while not self._stopped.is_set():
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            if self._stopped.is_set():
+                break
+            with self._lock:
+                pending = len(self._pending)
+            due = time.monotonic() - self._last_fold >= self.every_seconds
+            if pending >= self.every_segments or (pending and due):
+                if not self.generator.model:
+                    logger.error("Модель саммари не загружена, скользящее саммари отключено")
+                    self.disabled = True
+                    with self._lock:
+                        self._pending.clear()
+                    return
+                try:
+                    self._fold()
+                except Exception as e:
+                    logger.error(f"Ошибка обновления саммари: {e}")
+
+    def _take(self):
+        """
+        Выбирает накопленные сегменты, сколько помещается в контекст.
+
+        Сегмент длиннее бюджета режется по токенам: в промпт идет
+        начало, остаток остается в очереди первым.
+
+        Returns:
+            tuple: (количество сегментов, промпт или None, если сворачивать нечего)
+        """
+        budget = (
+            self.context_tokens
+            - len(self.generator.tokenize(ROLLING_PROMPT.format(summary=self.summary, text="")))
+            - self.max_new_tokens
+            - SAFETY_TOKENS
+        )
+        budget = max(budget, 2)
+        with self._lock:
+            taken, used = 0, 0
+            for text in self._pending:
+                tokens = self.generator.tokenize(text)
+                if not taken and len(tokens) + 1 > budget:
+                    self._pending[:1] = [
+                        self.generator.detokenize(tokens[:budget - 1]),
+                        self.generator.detokenize(tokens[budget - 1:]),
+                    ]
+                    taken = 1
+                    break
+                if taken and used + len(tokens) + 1 > budget:
+                    break
+                taken += 1
+                used += len(tokens) + 1
+            texts = self._pending[:taken]
+
+        if not texts:
+            return 0, None
+        return taken, ROLLING_PROMPT.format(summary=self.summary, text="\n".join(texts))
+
+    def _commit(self, taken: int, summary: str, started: float):
+        """Запоминает результат свертки и удаляет свернутые сегменты"""
+        elapsed = time.perf_counter() - started
+        self.summary = summary
+        with self._lock:
+            del self._pending[:taken]
+        self.folds += 1
+        self.fold_seconds += elapsed
+        self._last_fold = time.monotonic()
+        logger.debug(f"Саммари обновлено: {taken} сегментов за {elapsed:.1f} с")
+
+    def _fold(self):
+        """Сворачивает накопленные сегменты в саммари, сколько помещается в контекст"""
+        with self._fold_lock:
+            taken, prompt = self._take()
+            if prompt is None:
+                return
+            started = time.perf_counter()
+            self._commit(taken, self.generator.generate(prompt, self.max_new_tokens), started)
+
+    @property
+    def last_metrics(self):
+        """Метрики последней генерации модели"""
+        return getattr(self.generator, "last_metrics", None)
+
+    def finalize(self) -> str:
+        """
+        Останавливает фоновый поток и добавляет оставшиеся сегменты.
+
+        Если модель не загружена или генерация не удалась, возвращается
+        текущее саммари (или сообщение об ошибке, если его еще нет).
+
+        Returns:
+            str: Итоговое саммари встречи
+        """
+        self._stop()
+        if not self.generator.model:
+            logger.error("Модель саммари не загружена")
+            return self.summary or "Ошибка: модель не загружена"
+        try:
+            while self._pending:
+                self._fold()
+        except Exception as e:
+            logger.error(f"Ошибка генерации саммари: {e}")
+            return self.summary or "Ошибка генерации саммари"
+        logger.info(f"Саммари встречи обновлялось {self.folds} раз ({self.fold_seconds:.1f} с LLM)")
+        return self.summary
+
+    def finalize_stream(self) -> Iterator[str]:
+        """
+        Останавливает фоновый поток и добавляет оставшиеся сегменты,
+        отдавая токены последней свертки по мере генерации.
+
+        Если сворачивать нечего, текущее саммари отдается целиком;
+        если модель не загружена или генерация не удалась - текущее
+        саммари или сообщение об ошибке.
+
+        Yields:
+            str: Очередной фрагмент итогового саммари
+        """
+        # summary_service требует ctransformers, наблюдатель без модели от него не зависит
+        from src.services.summary_service import stream_safely
+
+        self._stop()
+        yield from stream_safely(self.generator, self._final_folds, fallback=lambda: self.summary)
+
+    def _final_folds(self) -> Iterator[str]:
+        """Сворачивает оставшиеся сегменты; токены последней свертки отдаются по мере генерации"""
+        streamed = False
+        while True:
+            with self._fold_lock:
+                taken, prompt = self._take()
+                if prompt is None:
+                    break
+                started = time.perf_counter()
+                if taken < len(self._pending):
+                    self._commit(taken, self.generator.generate(prompt, self.max_new_tokens), started)
+                    continue
+                parts = []
+                for token in self.generator.generate_stream(prompt, self.max_new_tokens):
+                    parts.append(token)
+                    yield token
+                self._commit(taken, "".join(parts).strip(), started)
+                streamed = True
+
+        if not streamed:
+            yield self.summary
+        logger.info(f"Саммари встречи обновлялось {self.folds} раз ({self.fold_seconds:.1f} с LLM)")
+
+    def _stop(self):
+        """Останавливает фоновый поток свертки"""
+        self._stopped.set()
+        self._wakeup.set()
+        self._worker.join()
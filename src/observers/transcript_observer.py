@@ -26,6 +26,17 @@ class TranscriptObserver(ABC):
         """
         pass
 
+    def on_summary_token(self, token: str):
+        """
+        Вызывается при генерации очередного токена саммари.
+
+        По умолчанию ничего не делает.
+
+        Args:
+            token: Текст токена
+        """
+        pass
+
 class ConsoleTranscriptObserver(TranscriptObserver):
     """
     Наблюдатель, выводящий транскрипцию в консоль.
@@ -5,10 +5,12 @@
 с локального устройства в реальном времени.
 """
 
+import time
 import sounddevice as sd
 import numpy as np
-from typing import Iterator
+from typing import Iterator, Optional
 from config.settings import settings
+from src.utils.ring_buffer import AudioRingBuffer
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -16,36 +18,55 @@ logger = get_logger(__name__)
 class AudioCaptureService:
     """
     Сервис захвата аудио с локального устройства.
-    
+
     Использует sounddevice для захвата аудио потока
     с микрофона или других аудиоустройств.
+
+    Поддерживает два режима:
+    - blocking: чтение stream.read в цикле генератора
+    - callback: устройство пишет в кольцевой буфер из своего потока,
+      а генератор читает из буфера окна фиксированного размера
     """
-    
-    def __init__(self):
+
+    def __init__(self, mode: Optional[str] = None, stream_factory=None):
         """
         Инициализирует сервис захвата аудио.
-        
+
         Устанавливает параметры захвата из настроек.
+
+        Args:
+            mode: Режим захвата (blocking, callback), по умолчанию из настроек
+            stream_factory: Фабрика потоков ввода (по умолчанию sounddevice.InputStream)
         """
         self.sample_rate = settings.SAMPLE_RATE
         self.chunk_size = settings.CHUNK_SIZE
+        self.mode = mode or settings.AUDIO_CAPTURE_MODE
+        if self.mode not in ("blocking", "callback"):
+            raise ValueError(f"Неизвестный режим захвата: {self.mode}")
+        self.stream_factory = stream_factory or sd.InputStream
         self.is_recording = False
-        logger.info("AudioCaptureService инициализирован")
-        
+        self.ring_buffer: Optional[AudioRingBuffer] = None
+        self.device_overflow_count = 0
+        logger.info(f"AudioCaptureService инициализирован (режим: {self.mode})")
+
     def start_capture(self) -> Iterator[np.ndarray]:
         """
         Начинает захват аудио и возвращает поток данных.
-        
+
         Returns:
             Iterator[np.ndarray]: Итератор аудио данных
-            
+
         Yields:
             np.ndarray: Чанк аудио данных в формате numpy массива
         """
         logger.info("Начало захвата аудио")
         self.is_recording = True
-        
-        with sd.InputStream(
+
+        if self.mode == "callback":
+            yield from self._capture_callback()
+            return
+
+        with self.stream_factory(
             samplerate=self.sample_rate,
             channels=1,
             dtype=np.float32,
@@ -54,13 +75,81 @@ class AudioCaptureService:
             while self.is_recording:
                 data, overflowed = stream.read(self.chunk_size)
                 if overflowed:
+                    self.device_overflow_count += 1
                     logger.warning("Аудио буфер переполнен")
                 yield data.flatten()
-    
+
+    def _capture_callback(self) -> Iterator[np.ndarray]:
+        """
+        Захват через callback устройства и кольцевой буфер.
+
+        Callback только копирует сэмплы в буфер, поэтому медленный
+        потребитель не блокирует устройство: данные накапливаются
+        в буфере, а при его переполнении учитываются потерянные сэмплы.
+
+        Yields:
+            np.ndarray: Окно из chunk_size сэмплов
+        """
+        ring = AudioRingBuffer(int(settings.RING_BUFFER_SECONDS * self.sample_rate))
+        self.ring_buffer = ring
+        reported_overflows = 0
+
+        def callback(indata, frames, time_info, status):
+            if status and getattr(status, "input_overflow", False):
+                self.device_overflow_count += 1
+            ring.write(indata[:, 0])
+
+        with self.stream_factory(
+            samplerate=self.sample_rate,
+            channels=1,
+            dtype=np.float32,
+            blocksize=self.chunk_size,
+            callback=callback
+        ) as stream:
+            while self.is_recording:
+                window = ring.read(self.chunk_size)
+
+                if ring.overflow_count != reported_overflows:
+                    reported_overflows = ring.overflow_count
+                    logger.warning(
+                        f"Аудио буфер переполнен: потеряно {ring.dropped_samples} сэмплов"
+                    )
+
+                if window is not None:
+                    yield window
+                    continue
+
+                if not stream.active:
+                    # Устройство завершило поток: отдаем остаток
+                    rest = ring.read_available()
+                    if len(rest):
+                        yield rest
+                    break
+
+                missing = self.chunk_size - ring.available
+                time.sleep(missing / self.sample_rate)
+
+    def get_stats(self) -> dict:
+        """
+        Возвращает статистику захвата.
+
+        Returns:
+            dict: Заполненность буфера и счетчики переполнений
+        """
+        ring = self.ring_buffer
+        return {
+            "mode": self.mode,
+            "fill_level": ring.fill_level if ring else 0.0,
+            "buffered_samples": ring.available if ring else 0,
+            "overflow_count": ring.overflow_count if ring else 0,
+            "dropped_samples": ring.dropped_samples if ring else 0,
+            "device_overflow_count": self.device_overflow_count,
+        }
+
     def stop_capture(self):
         """
         Останавливает захват аудио.
-        
+
         Завершает процесс захвата и освобождает ресурсы.
         """
         logger.info("Остановка захвата аудио")
@@ -0,0 +1,332 @@
+"""
+Батчевое декодирование Whisper для нескольких встреч.
+
+Когда на одном сервере идут несколько встреч, каждая вызывает
+model.transcribe для своего окна, и окна обрабатываются по одному.
+Планировщик собирает ожидающие окна всех встреч, считает для них
+log-mel спектрограммы одним векторизованным вызовом и прогоняет
+энкодер и декодер на всем батче. Батч запускается, как только окно
+пришло от каждой подключенной встречи, набран STT_BATCH_SIZE или
+самое старое окно ждет STT_BATCH_MAX_WAIT_SECONDS, поэтому
+задержка встречи ограничена, а пропускная способность растет
+с количеством комнат.
+"""
+
+import threading
+import time
+from typing import Any, Callable, List, Optional, Sequence
+import numpy as np
+from config.settings import settings
+from src.utils.logger import get_logger
+from src.utils.model_registry import SharedModel
+
+logger = get_logger(__name__)
+
+# Декодер батча: список окон аудио -> список результатов в формате model.transcribe
+BatchBackend = Callable[[List[np.ndarray]], List[dict]]
+
+class WhisperBatchBackend:
+    """
+    Декодирование батча окон моделью Whisper.
+
+    Каждое окно (не длиннее 30 секунд) декодируется за один проход
+    жадным поиском с временными метками; в отличие от model.transcribe
+    нет повторного декодирования с повышенной температурой.
+    """
+
+    def __init__(self, model, language: str = "ru", max_tokens: Optional[int] = None):
+        """
+        Args:
+            model: Модель Whisper или SharedModel из реестра моделей
+            language: Язык распознавания
+            max_tokens: Максимум токенов на окно (по умолчанию как в Whisper)
+        """
+        import torch
+        import whisper
+        from whisper.audio import HOP_LENGTH, N_FFT, N_SAMPLES, SAMPLE_RATE, mel_filters
+        from whisper.tokenizer import get_tokenizer
+
+        self._torch = torch
+        self._whisper = whisper
+        self.shared = model if isinstance(model, SharedModel) else None
+        self.model = model.model if self.shared is not None else model
+        self.language = language
+        self.max_tokens = max_tokens
+        self.n_fft = N_FFT
+        self.hop_length = HOP_LENGTH
+        self.n_samples = N_SAMPLES
+        self.sample_rate = SAMPLE_RATE
+        # Длительность одного шага временной метки (два кадра спектрограммы)
+        self.time_precision = 2 * HOP_LENGTH / SAMPLE_RATE
+        self.window = torch.hann_window(N_FFT, device=self.model.device)
+        self.filters = mel_filters(self.model.device, self.model.dims.n_mels)
+        languages = {"num_languages": self.model.num_languages} if hasattr(self.model, "num_languages") else {}
+        self.tokenizer = get_tokenizer(
+            self.model.is_multilingual, language=language, task="transcribe", **languages
+        )
+
+    def log_mel(self, windows: Sequence[np.ndarray]):
+        """
+        Считает log-mel спектрограммы батча окон одним вызовом.
+
+        Повторяет whisper.log_mel_spectrogram для окна, дополненного
+        тишиной до 30 секунд; нормировка по максимуму - у каждого окна своя.
+
+        Args:
+            windows: Окна аудио (float32, частота Whisper)
+
+        Returns:
+            torch.Tensor: Спектрограммы (окна, n_mels, 3000)
+        """
+        torch = self._torch
+        audio = np.zeros((len(windows), self.n_samples), dtype=np.float32)
+        for row, window in zip(audio, windows):
+            length = min(len(window), self.n_samples)
+            row[:length] = window[:length]
+        audio = torch.from_numpy(audio).to(self.model.device)
+        stft = torch.stft(audio, self.n_fft, self.hop_length, window=self.window, return_complex=True)
+        magnitudes = stft[..., :-1].abs() ** 2
+        log_spec = torch.clamp(self.filters @ magnitudes, min=1e-10).log10()
+        log_spec = torch.maximum(log_spec, log_spec.amax(dim=(1, 2), keepdim=True) - 8.0)
+        return (log_spec + 4.0) / 4.0
+
+    def __call__(self, windows: List[np.ndarray]) -> List[dict]:
+        mel = self.log_mel(windows)
+        options = self._whisper.DecodingOptions(
+            task="transcribe", language=self.language, fp16=False, sample_len=self.max_tokens
+        )
+        if self.shared is not None:
+            with self.shared.exclusive():
+                results = self._whisper.decode(self.model, mel, options)
+        else:
+            results = self._whisper.decode(self.model, mel, options)
+        return [
+            {"text": result.text, "segments": self._segments(result.tokens, len(window) / self.sample_rate)}
+            for result, window in zip(results, windows)
+        ]
+
+    def _segments(self, tokens: List[int], duration: float) -> List[dict]:
+        """Разбивает токены с временными метками на сегменты"""
+        timestamp_begin = self.tokenizer.timestamp_begin
+        segments = []
+        start = None
+        text_tokens: List[int] = []
+        for token in tokens:
+            if token < timestamp_begin:
+                text_tokens.append(token)
+                continue
+            time_mark = min((token - timestamp_begin) * self.time_precision, duration)
+            if start is None or not text_tokens:
+                start = time_mark
+                continue
+            segments.append({"start": start, "end": time_mark, "text": self.tokenizer.decode(text_tokens)})
+            start = None
+            text_tokens = []
+        if text_tokens:
+            segments.append({"start": start or 0.0, "end": duration, "text": self.tokenizer.decode(text_tokens)})
+        return segments
+
+class _Request:
+    """Окно, ожидающее декодирования"""
+
+    def __init__(self, audio: np.ndarray):
+        self.audio = audio
+        self.submitted = time.monotonic()
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+        self.error: Optional[BaseException] = None
+
+class BatchedWhisperClient:
+    """
+    Клиент планировщика для одной встречи.
+
+    Передается в WhisperSTTService вместо модели: transcribe
+    ставит окно в общий батч и ждет результата.
+    """
+
+    def __init__(self, decoder: "BatchedWhisperDecoder"):
+        self.decoder = decoder
+        self.closed = False
+
+    def transcribe(self, audio: np.ndarray, **kwargs) -> dict:
+        """
+        Транскрибирует окно в составе батча.
+
+        Args:
+            audio: Окно аудио
+            **kwargs: Параметры model.transcribe (язык задается декодером батча)
+
+        Returns:
+            dict: Текст и сегменты окна в формате model.transcribe
+        """
+        return self.decoder.submit(audio)
+
+    def close(self):
+        """Отключает встречу от планировщика"""
+        if not self.closed:
+            self.closed = True
+            self.decoder._disconnect()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class BatchedWhisperDecoder:
+    """
+    Планировщик батчей Whisper для встреч одного процесса.
+
+    Каждая встреча получает клиента через client(); окна клиентов
+    декодируются в фоновом потоке батчами.
+    """
+
+    def __init__(
+        self,
+        model=None,
+        backend: Optional[BatchBackend] = None,
+        max_batch: Optional[int] = None,
+        max_wait_seconds: Optional[float] = None
+    ):
+        """
+        Инициализирует планировщик и запускает поток декодирования.
+
+        Args:
+            model: Модель Whisper (или SharedModel), если backend не задан
+            backend: Декодер батча (по умолчанию WhisperBatchBackend(model))
+            max_batch: Максимальный размер батча (по умолчанию STT_BATCH_SIZE)
+            max_wait_seconds: Максимальное ожидание батча (по умолчанию STT_BATCH_MAX_WAIT_SECONDS)
+
+        Raises:
+            ValueError: Если не заданы ни модель, ни декодер батча
+        """
+        if backend is None:
+            if model is None:
+                raise ValueError("Нужна модель Whisper или декодер батча")
+            backend = WhisperBatchBackend(model)
+        self.backend = backend
+        self.max_batch = max_batch or settings.STT_BATCH_SIZE
+        self.max_wait_seconds = (
+            max_wait_seconds if max_wait_seconds is not None else settings.STT_BATCH_MAX_WAIT_SECONDS
+        )
+        self.clients = 0
+        self.batches = 0
+        self.windows = 0
+        self.max_batch_seen = 0
+        self.wait_total = 0.0
+        self.decode_seconds = 0.0
+        self._pending: List[_Request] = []
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="stt-batcher", daemon=True)
+        self._thread.start()
+
+    def client(self) -> BatchedWhisperClient:
+        """Подключает встречу и возвращает ее клиента"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Планировщик батчей остановлен")
+            self.clients += 1
+        return BatchedWhisperClient(self)
+
+    def _disconnect(self):
+        with self._condition:
+            self.clients -= 1
+            # Батч мог ждать окна от этой встречи
+            self._condition.notify_all()
+
+    def submit(self, audio: np.ndarray) -> dict:
+        """
+        Ставит окно в очередь и ждет результата декодирования.
+
+        Args:
+            audio: Окно аудио
+
+        Returns:
+            dict: Результат в формате model.transcribe
+
+        Raises:
+            RuntimeError: Если планировщик остановлен
+            Exception: Ошибка декодирования батча
+        """
+        request = _Request(audio)
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Планировщик батчей остановлен")
+            self._pending.append(request)
+            self._condition.notify_all()
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _next_batch(self) -> Optional[List[_Request]]:
+        """Ждет условия запуска батча; None - планировщик остановлен и очередь пуста"""
+        with self._condition:
+            while True:
+                if not self._pending:
+                    if self._closed:
+                        return None
+                    self._condition.wait()
+                    continue
+                # Каждая встреча ждет результата своего окна, поэтому больше окон не придет
+                full = len(self._pending) >= min(self.max_batch, max(1, self.clients))
+                remaining = self._pending[0].submitted + self.max_wait_seconds - time.monotonic()
+                if full or remaining <= 0 or self._closed:
+                    batch = self._pending[:self.max_batch]
+                    del self._pending[:self.max_batch]
+                    return batch
+                self._condition.wait(remaining)
+
+    def _run(self):
+        """Цикл потока декодирования"""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            started = time.monotonic()
+            try:
+                results = self.backend([request.audio for request in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Декодер вернул {len(results)} результатов для {len(batch)} окон")
+            except Exception as e:
+                logger.error(f"Ошибка декодирования батча Whisper: {e}")
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+            finished = time.monotonic()
+            self.batches += 1
+            self.windows += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+            self.wait_total += sum(started - request.submitted for request in batch)
+            self.decode_seconds += finished - started
+            for request, result in zip(batch, results):
+                request.result = result
+                request.done.set()
+
+    def close(self, timeout: Optional[float] = None):
+        """Декодирует оставшиеся окна, останавливает поток и выводит статистику"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+        logger.info(f"Батчевое декодирование Whisper: {self.stats()}")
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику планировщика.
+
+        Returns:
+            dict: Количество батчей и окон, средний и максимальный размер батча,
+                среднее ожидание окна в очереди и среднее время декодирования батча
+        """
+        return {
+            "clients": self.clients,
+            "batches": self.batches,
+            "windows": self.windows,
+            "batch_avg": round(self.windows / self.batches, 2) if self.batches else 0.0,
+            "batch_max": self.max_batch_seen,
+            "wait_avg_seconds": round(self.wait_total / self.windows, 4) if self.windows else 0.0,
+            "decode_avg_seconds": round(self.decode_seconds / self.batches, 4) if self.batches else 0.0,
+        }
@@ -0,0 +1,254 @@
+"""
+Пакетная обработка записанных встреч.
+
+Транскрибирует и суммаризирует каталог записей двумя стадиями
+с собственным числом исполнителей, пропускает уже обработанные
+файлы по хэшу содержимого и продолжает работу после сбоя
+по журналу заданий.
+"""
+
+import glob
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from config.settings import settings
+from src.models.transcript import MeetingTranscript
+from src.services.offline_transcriber import OfflineTranscriber, load_whisper_model
+from src.services.transcript_processor import TranscriptProcessor
+from src.utils import results_writer
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Стадии задания в журнале
+STAGE_TRANSCRIBED = "transcribed"
+STAGE_SUMMARIZED = "summarized"
+STAGE_FAILED = "failed"
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """
+    Вычисляет SHA-256 содержимого файла.
+
+    Args:
+        path: Путь к файлу
+        block_size: Размер блока чтения
+
+    Returns:
+        str: Хэш в шестнадцатеричном виде
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def find_inputs(source: str) -> List[str]:
+    """
+    Находит записи для обработки.
+
+    Args:
+        source: Каталог (берутся все *.wav) или glob шаблон
+
+    Returns:
+        List[str]: Отсортированный список путей
+    """
+    pattern = os.path.join(source, "*.wav") if os.path.isdir(source) else source
+    return sorted(path for path in glob.glob(pattern) if os.path.isfile(path))
+
+class JobLedger:
+    """
+    Журнал заданий пакетной обработки.
+
+    Хранится как JSONL файл, в который дописывается запись о каждой
+    завершенной стадии. Последняя запись для хэша определяет его
+    состояние, поэтому после сбоя теряется только незавершенная стадия.
+    """
+
+    def __init__(self, path: str):
+        """
+        Загружает журнал.
+
+        Args:
+            path: Путь к файлу журнала
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, dict] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Недописанная строка после сбоя
+                        continue
+                    self.jobs[record["hash"]] = record
+
+    def get(self, content_hash: str) -> Optional[dict]:
+        """Возвращает последнюю запись задания"""
+        return self.jobs.get(content_hash)
+
+    def record(self, content_hash: str, **fields) -> dict:
+        """
+        Дописывает состояние задания.
+
+        Args:
+            content_hash: Хэш содержимого записи
+            **fields: Поля состояния (stage, path, transcript_path, ...)
+
+        Returns:
+            dict: Полная запись задания
+        """
+        with self._lock:
+            record = dict(self.jobs.get(content_hash, {}))
+            record.update(fields, hash=content_hash, time=datetime.now().isoformat())
+            self.jobs[content_hash] = record
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            return record
+
+def _transcribe_job(path: str, meeting_id: str, results_dir: str, model_loader: Callable) -> str:
+    """Транскрибирует одну запись в рабочем процессе и сохраняет результат"""
+    transcript = OfflineTranscriber(workers=0, model_loader=model_loader).transcribe_file(path)
+    transcript = MeetingTranscript(
+        segments=TranscriptProcessor().process_segments(transcript.segments),
+        created_at=transcript.created_at,
+        duration=transcript.duration
+    )
+    return results_writer.save_transcript(transcript, results_dir, meeting_id)
+
+class BatchProcessor:
+    """
+    Пакетная обработка записей двумя стадиями.
+
+    Стадия транскрибирования выполняется в пуле процессов,
+    стадия саммари - в пуле потоков, у каждого из которых свой
+    экземпляр сервиса саммари. Записи передаются во вторую стадию
+    по мере готовности транскрипций.
+    """
+
+    def __init__(
+        self,
+        transcribe_workers: Optional[int] = None,
+        summary_workers: Optional[int] = None,
+        results_dir: str = results_writer.RESULTS_DIR,
+        summary_service_factory: Optional[Callable] = None,
+        model_loader: Callable = load_whisper_model
+    ):
+        """
+        Инициализирует пакетную обработку.
+
+        Args:
+            transcribe_workers: Процессов транскрибирования (по умолчанию из настроек)
+            summary_workers: Потоков саммари (0 - без саммари)
+            results_dir: Папка результатов
+            summary_service_factory: Фабрика SummaryService для потока саммари
+            model_loader: Функция загрузки модели Whisper в рабочем процессе
+        """
+        self.transcribe_workers = transcribe_workers or settings.BATCH_TRANSCRIBE_WORKERS
+        self.summary_workers = settings.BATCH_SUMMARY_WORKERS if summary_workers is None else summary_workers
+        self.results_dir = results_dir
+        self.summary_service_factory = summary_service_factory
+        self.model_loader = model_loader
+        self.ledger = JobLedger(os.path.join(results_dir, "batch_ledger.jsonl"))
+        self._local = threading.local()
+        self.stats = {"skipped": 0, "transcribed": 0, "summarized": 0, "failed": 0}
+
+    def _summarize_job(self, transcript_path: str, meeting_id: str) -> str:
+        """Генерирует саммари транскрипции в потоке стадии саммари"""
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = self.summary_service_factory()
+        transcript = results_writer.read_transcript(transcript_path)
+        summary = service.summarize_transcript(transcript)
+        return results_writer.save_summary(summary, transcript.created_at, self.results_dir, meeting_id)
+
+    def run(self, source: str) -> dict:
+        """
+        Обрабатывает все записи из каталога или по шаблону.
+
+        Args:
+            source: Каталог или glob шаблон
+
+        Returns:
+            dict: Количество пропущенных, обработанных и неудачных заданий
+        """
+        inputs = find_inputs(source)
+        logger.info(f"Найдено записей: {len(inputs)}")
+        with_summary = self.summary_workers > 0 and self.summary_service_factory is not None
+
+        transcribe_pool = ProcessPoolExecutor(max_workers=self.transcribe_workers)
+        summary_pool = ThreadPoolExecutor(max_workers=max(1, self.summary_workers))
+        pending = {}
+        seen = set()
+
+        def submit_summary(content_hash: str, job: dict):
+            future = summary_pool.submit(self._summarize_job, job["transcript_path"], job["meeting_id"])
+            pending[future] = (STAGE_SUMMARIZED, content_hash)
+
+        try:
+            for path in inputs:
+                content_hash = file_hash(path)
+                job = self.ledger.get(content_hash)
+                if content_hash in seen or self._is_done(job, with_summary):
+                    self.stats["skipped"] += 1
+                    continue
+                seen.add(content_hash)
+
+                if job and job["stage"] == STAGE_TRANSCRIBED and os.path.exists(job["transcript_path"]):
+                    submit_summary(content_hash, job)
+                    continue
+
+                created_at = datetime.fromtimestamp(os.path.getmtime(path))
+                meeting_id = results_writer.meeting_file_id(created_at, content_hash[:8])
+                future = transcribe_pool.submit(
+                    _transcribe_job, path, meeting_id, self.results_dir, self.model_loader
+                )
+                pending[future] = (STAGE_TRANSCRIBED, content_hash)
+                self.ledger.jobs.setdefault(content_hash, {}).update(path=path, meeting_id=meeting_id)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, content_hash = pending.pop(future)
+                    job = self.ledger.get(content_hash)
+                    try:
+                        output = future.result()
+                    except Exception as e:
+                        logger.error(f"Ошибка обработки {job.get('path')}: {e}")
+                        self.ledger.record(content_hash, stage=STAGE_FAILED, error=str(e))
+                        self.stats["failed"] += 1
+                        continue
+
+                    if stage == STAGE_TRANSCRIBED:
+                        job = self.ledger.record(content_hash, stage=STAGE_TRANSCRIBED, transcript_path=output)
+                        self.stats["transcribed"] += 1
+                        logger.info(f"Транскрибировано: {job['path']}")
+                        if with_summary:
+                            submit_summary(content_hash, job)
+                    else:
+                        self.ledger.record(content_hash, stage=STAGE_SUMMARIZED, summary_path=output)
+                        self.stats["summarized"] += 1
+                        logger.info(f"Саммари готово: {job['path']}")
+        finally:
+            transcribe_pool.shutdown(cancel_futures=True)
+            summary_pool.shutdown(cancel_futures=True)
+
+        logger.info(f"Пакетная обработка завершена: {self.stats}")
+        return self.stats
+
+    @staticmethod
+    def _is_done(job: Optional[dict], with_summary: bool) -> bool:
+        """Завершено ли задание с учетом нужных стадий"""
+        if not job:
+            return False
+        if job["stage"] == STAGE_SUMMARIZED:
+            return True
+        return job["stage"] == STAGE_TRANSCRIBED and not with_summary
@@ -0,0 +1,331 @@
+"""
+Легковесная диаризация спикеров на CPU.
+
+Для каждого участка речи считается компактный спектральный отпечаток
+(среднее и разброс MFCC по кадрам и высота основного тона), а спикер
+назначается онлайн кластеризацией: отпечаток сравнивается с центроидами
+уже известных спикеров, и если ближайший слишком далеко, заводится
+новый спикер.
+Метки доступны сразу при транскрибировании, а не только в конце встречи.
+"""
+
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Параметры кадров и спектра
+FRAME_MS = 25
+HOP_MS = 10
+N_MELS = 26
+N_MFCC = 13
+PRE_EMPHASIS = 0.97
+
+# Кадры тише самого громкого на столько дБ не учитываются в отпечатке
+ENERGY_RANGE_DB = 30.0
+
+# Диапазон поиска основного тона (Гц) и минимальная периодичность вокализованного кадра
+PITCH_MIN_HZ = 70.0
+PITCH_MAX_HZ = 400.0
+PITCH_MIN_CORRELATION = 0.3
+
+# Сколько полутонов разницы основного тона равны единице расстояния
+PITCH_SEMITONES_SCALE = 1.0
+
+# Ожидаемый квадрат расстояния от отпечатка секундного участка до истинного
+# центроида его спикера; с длительностью участка разброс убывает как 1/t
+NOISE_SECONDS = 1.8
+
+@lru_cache(maxsize=4)
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Треугольные мел-фильтры (n_mels x n_fft // 2 + 1)"""
+    def to_mel(hz):
+        return 2595.0 * np.log10(1.0 + hz / 700.0)
+
+    def to_hz(mel):
+        return 700.0 * (10.0 ** (mel / 2595.0) - 1.0)
+
+    edges = to_hz(np.linspace(to_mel(0.0), to_mel(sample_rate / 2), n_mels + 2))
+    bins = np.fft.rfftfreq(n_fft, 1.0 / sample_rate)
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (bins - lower) / (center - lower)
+    falling = (upper - bins) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+@lru_cache(maxsize=4)
+def _dct_matrix(n_mels: int, n_mfcc: int) -> np.ndarray:
+    """Матрица DCT-II с ортонормировкой (n_mfcc x n_mels)"""
+    k = np.arange(n_mfcc)[:, None]
+    n = np.arange(n_mels)[None, :]
+    matrix = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2.0 / n_mels)
+    matrix[0] /= np.sqrt(2.0)
+    return matrix.astype(np.float32)
+
+@lru_cache(maxsize=4)
+def _window(frame: int) -> np.ndarray:
+    return np.hamming(frame).astype(np.float32)
+
+@lru_cache(maxsize=4)
+def _window_correlation(frame: int) -> np.ndarray:
+    """Нормированная автокорреляция окна: поправка на затухание автокорреляции кадра с задержкой"""
+    window = _window(frame).astype(np.float64)
+    correlation = np.correlate(window, window, mode="full")[frame - 1:]
+    return np.maximum(correlation / correlation[0], 1e-3)
+
+def frame_features(audio: np.ndarray, sample_rate: int) -> np.ndarray:
+    """
+    Вычисляет признаки всех кадров участка одним векторным проходом.
+
+    Один спектр кадра используется и для MFCC, и для автокорреляции,
+    по которой оценивается основной тон.
+
+    Args:
+        audio: Сэмплы (моно)
+        sample_rate: Частота дискретизации (Гц)
+
+    Returns:
+        np.ndarray: Кадры x (N_MFCC + 2): MFCC, логарифм энергии кадра
+            и основной тон в Гц (NaN для невокализованных кадров)
+    """
+    frame = sample_rate * FRAME_MS // 1000
+    hop = sample_rate * HOP_MS // 1000
+    # Вдвое длиннее кадра, чтобы автокорреляция не заворачивалась
+    n_fft = 1 << (2 * frame - 1).bit_length()
+    audio = np.asarray(audio, dtype=np.float32)
+    if len(audio) < frame:
+        return np.empty((0, N_MFCC + 2), dtype=np.float32)
+
+    emphasized = np.empty_like(audio)
+    emphasized[0] = audio[0]
+    emphasized[1:] = audio[1:] - PRE_EMPHASIS * audio[:-1]
+    frames = np.lib.stride_tricks.sliding_window_view(emphasized, frame)[::hop] * _window(frame)
+    power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+    mel = np.log(power @ _mel_filterbank(sample_rate, n_fft, N_MELS).T + 1e-10)
+    coefficients = mel @ _dct_matrix(N_MELS, N_MFCC).T
+    energy = np.log(power.sum(axis=1) + 1e-10)
+
+    correlation = np.fft.irfft(power, n_fft)[:, :frame] / _window_correlation(frame)
+    low = int(sample_rate / PITCH_MAX_HZ)
+    high = min(int(sample_rate / PITCH_MIN_HZ), frame - 1)
+    lags = low + np.argmax(correlation[:, low:high], axis=1)
+    strength = correlation[np.arange(len(lags)), lags] / (correlation[:, 0] + 1e-10)
+    pitch = np.where(strength >= PITCH_MIN_CORRELATION, sample_rate / lags, np.nan)
+    return np.column_stack([coefficients, energy, pitch]).astype(np.float32)
+
+def speaker_embedding(audio: np.ndarray, sample_rate: int) -> Optional[np.ndarray]:
+    """
+    Строит отпечаток голоса участка по громким кадрам.
+
+    Нулевой коэффициент MFCC (общая громкость) не используется.
+
+    Args:
+        audio: Сэмплы участка речи
+        sample_rate: Частота дискретизации (Гц)
+
+    Returns:
+        Optional[np.ndarray]: Среднее и разброс MFCC (по N_MFCC - 1) и медиана
+            основного тона в полутонах (NaN, если вокализованных кадров нет);
+            None, если участок слишком короткий
+    """
+    features = frame_features(audio, sample_rate)
+    if len(features) < 2:
+        return None
+    energy = features[:, N_MFCC]
+    loud = features[energy >= energy.max() - ENERGY_RANGE_DB / 10.0 * np.log(10.0)]
+    if len(loud) < 2:
+        return None
+    coefficients = loud[:, 1:N_MFCC]
+    pitch = loud[:, N_MFCC + 1]
+    pitch = pitch[~np.isnan(pitch)]
+    semitones = 12.0 * np.log2(np.median(pitch)) if len(pitch) >= 3 else np.nan
+    return np.concatenate([coefficients.mean(axis=0), coefficients.std(axis=0), [semitones]])
+
+class OnlineSpeakerClusterer:
+    """
+    Онлайн кластеризация отпечатков голоса.
+
+    Расстояние между участком и спикером - разница средних MFCC,
+    отнесенная к среднему разбросу MFCC внутри участков (не зависит
+    от масштаба коэффициентов и известно уже по первому участку),
+    вместе с разницей основного тона в единицах PITCH_SEMITONES_SCALE,
+    нормированная на ожидаемый разброс при данной длительности.
+    Участок относится к ближайшему спикеру, если расстояние не больше
+    порога или лимит спикеров исчерпан; иначе заводится новый спикер.
+    Центроиды - средние отпечатков с весом по длительности участков;
+    сошедшиеся центроиды объединяются.
+    """
+
+    def __init__(self, threshold: float, max_speakers: int):
+        """
+        Инициализирует кластеризацию.
+
+        Args:
+            threshold: Максимальное расстояние до центроида спикера
+            max_speakers: Максимальное количество спикеров
+        """
+        self.threshold = threshold
+        self.max_speakers = max_speakers
+        self.centroids: List[np.ndarray] = []
+        self.weights: List[float] = []
+        self.pitch_weights: List[float] = []
+        self.ids: List[int] = []
+        self._next_id = 0
+        self._spread_sum: Optional[np.ndarray] = None
+        self._spread_weight = 0.0
+
+    def distances(self, embedding: np.ndarray, weight: float = 1.0) -> np.ndarray:
+        """
+        Расстояния от отпечатка до центроидов всех спикеров.
+
+        Тембровая часть нормируется на ожидаемый разброс: отпечаток
+        короткого участка и центроид по немногим участкам сами по себе неточны.
+
+        Args:
+            embedding: Отпечаток участка
+            weight: Длительность участка в секундах
+
+        Returns:
+            np.ndarray: Нормированное расстояние до каждого спикера
+        """
+        if not self.centroids:
+            return np.empty(0)
+        half = (len(embedding) - 1) // 2
+        spread = np.maximum(self._spread_sum / self._spread_weight, 1e-3)
+        centroids = np.stack(self.centroids)
+        expected = NOISE_SECONDS * (1.0 / weight + 1.0 / np.asarray(self.weights))
+        squared = (((centroids[:, :half] - embedding[:half]) / spread) ** 2).sum(axis=1) / expected
+        if not np.isnan(embedding[-1]):
+            pitch = (centroids[:, -1] - embedding[-1]) / PITCH_SEMITONES_SCALE
+            squared += np.nan_to_num(pitch, nan=0.0) ** 2
+        return np.sqrt(squared)
+
+    def assign(self, embedding: np.ndarray, weight: float = 1.0) -> Tuple[int, float]:
+        """
+        Назначает спикера отпечатку.
+
+        Args:
+            embedding: Отпечаток участка
+            weight: Вес участка (длительность в секундах)
+
+        Returns:
+            tuple: (номер спикера с нуля в порядке появления, расстояние до его центроида)
+        """
+        half = (len(embedding) - 1) // 2
+        if self._spread_sum is None:
+            self._spread_sum = np.zeros(half)
+        self._spread_sum += embedding[half:2 * half] * weight
+        self._spread_weight += weight
+
+        distances = self.distances(embedding, weight)
+        if len(distances):
+            best = int(np.argmin(distances))
+            distance = float(distances[best])
+            if distance <= self.threshold or len(self.centroids) >= self.max_speakers:
+                self._add(best, embedding, weight)
+                speaker = self.ids[best]
+                self._merge_close(best)
+                return speaker, distance
+
+        self.centroids.append(embedding.astype(np.float64))
+        self.weights.append(weight)
+        self.pitch_weights.append(0.0 if np.isnan(embedding[-1]) else weight)
+        self.ids.append(self._next_id)
+        self._next_id += 1
+        return self.ids[-1], 0.0
+
+    def _add(self, index: int, embedding: np.ndarray, weight: float, pitch_weight: Optional[float] = None):
+        """Сдвигает центроид спикера к отпечатку с весом weight"""
+        centroid = self.centroids[index]
+        total = self.weights[index] + weight
+        centroid[:-1] += (embedding[:-1] - centroid[:-1]) * weight / total
+        self.weights[index] = total
+        pitch_weight = weight if pitch_weight is None else pitch_weight
+        if not np.isnan(embedding[-1]) and pitch_weight > 0:
+            pitch_total = self.pitch_weights[index] + pitch_weight
+            previous = 0.0 if np.isnan(centroid[-1]) else centroid[-1]
+            centroid[-1] = previous + (embedding[-1] - previous) * pitch_weight / pitch_total
+            self.pitch_weights[index] = pitch_total
+
+    def _merge_close(self, index: int):
+        """
+        Объединяет спикера с ближайшим, если их центроиды сошлись.
+
+        Так исправляются лишние спикеры, заведенные по первым
+        неточным участкам; остается метка более раннего спикера.
+        """
+        distances = self.distances(self.centroids[index], self.weights[index])
+        distances[index] = np.inf
+        other = int(np.argmin(distances))
+        if distances[other] > self.threshold:
+            return
+        keep, drop = sorted((index, other), key=lambda i: self.ids[i])
+        self._add(keep, self.centroids[drop], self.weights[drop], self.pitch_weights[drop])
+        for values in (self.centroids, self.weights, self.pitch_weights, self.ids):
+            del values[drop]
+
+class SpeakerDiarizer:
+    """
+    Диаризация участков речи по мере транскрибирования.
+
+    Участок короче min_seconds не дает надежного отпечатка
+    и получает метку предыдущего участка.
+    """
+
+    def __init__(
+        self,
+        sample_rate: Optional[int] = None,
+        threshold: Optional[float] = None,
+        max_speakers: Optional[int] = None,
+        min_seconds: Optional[float] = None
+    ):
+        """
+        Инициализирует диаризацию.
+
+        Args:
+            sample_rate: Частота дискретизации (по умолчанию SAMPLE_RATE)
+            threshold: Максимальное расстояние до спикера (по умолчанию DIARIZATION_THRESHOLD)
+            max_speakers: Максимум спикеров (по умолчанию DIARIZATION_MAX_SPEAKERS)
+            min_seconds: Минимальная длина участка для отпечатка (по умолчанию DIARIZATION_MIN_SECONDS)
+        """
+        self.sample_rate = sample_rate or settings.SAMPLE_RATE
+        self.min_seconds = min_seconds if min_seconds is not None else settings.DIARIZATION_MIN_SECONDS
+        self.clusterer = OnlineSpeakerClusterer(
+            threshold if threshold is not None else settings.DIARIZATION_THRESHOLD,
+            max_speakers or settings.DIARIZATION_MAX_SPEAKERS
+        )
+        self.last_label: Optional[str] = None
+        self.processed_seconds = 0.0
+
+    @property
+    def speaker_count(self) -> int:
+        """Количество найденных спикеров"""
+        return len(self.clusterer.centroids)
+
+    @staticmethod
+    def label(index: int) -> str:
+        """Метка спикера по номеру с нуля"""
+        return f"Спикер {index + 1}"
+
+    def assign(self, audio: np.ndarray) -> Optional[str]:
+        """
+        Определяет спикера участка речи.
+
+        Args:
+            audio: Сэмплы участка
+
+        Returns:
+            Optional[str]: Метка спикера или None, если спикер еще неизвестен
+        """
+        seconds = len(audio) / self.sample_rate
+        self.processed_seconds += seconds
+        if seconds < self.min_seconds:
+            return self.last_label
+        embedding = speaker_embedding(audio, self.sample_rate)
+        if embedding is None:
+            return self.last_label
+        index, _ = self.clusterer.assign(embedding, seconds)
+        self.last_label = self.label(index)
+        return self.last_label
@@ -0,0 +1,164 @@
+"""
+Имитация аудио устройства ввода.
+
+Позволяет тестировать захват аудио без микрофона: повторяет
+интерфейс sounddevice.InputStream в блокирующем и callback режимах.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+import numpy as np
+
+
+class FakeInputStream:
+    """
+    Поток ввода, воспроизводящий заранее заданный сигнал.
+
+    Поддерживает контекстный менеджер, блокирующий read() и
+    callback режим с отдельным потоком, как sounddevice.InputStream.
+    """
+
+    def __init__(
+        self,
+        signal: np.ndarray,
+        samplerate: int,
+        blocksize: int,
+        channels: int = 1,
+        dtype=np.float32,
+        callback=None,
+        speed: float = 1.0,
+        loop: bool = False
+    ):
+        """
+        Инициализирует поток.
+
+        Args:
+            signal: Воспроизводимый сигнал (моно)
+            samplerate: Частота дискретизации (Гц)
+            blocksize: Размер блока в сэмплах
+            channels: Количество каналов
+            dtype: Тип сэмплов
+            callback: Функция callback(indata, frames, time, status)
+            speed: Ускорение относительно реального времени (0 - без пауз)
+            loop: Зацикливать сигнал
+        """
+        self.signal = np.asarray(signal, dtype=dtype)
+        self.samplerate = samplerate
+        self.blocksize = blocksize
+        self.channels = channels
+        self.dtype = dtype
+        self.callback = callback
+        self.speed = speed
+        self.loop = loop
+        self.position = 0
+        self.active = False
+        self.finished = threading.Event()
+        self._thread = None
+
+    def _next_block(self, frames: int) -> np.ndarray:
+        """Возвращает следующий блок сигнала в формате (frames, channels)"""
+        block = np.zeros((frames, self.channels), dtype=self.dtype)
+        filled = 0
+        while filled < frames:
+            if self.position >= len(self.signal):
+                if not self.loop or len(self.signal) == 0:
+                    break
+                self.position = 0
+            take = min(frames - filled, len(self.signal) - self.position)
+            block[filled:filled + take, :] = self.signal[self.position:self.position + take, None]
+            self.position += take
+            filled += take
+        return block
+
+    def _sleep_block(self, frames: int):
+        """Выдерживает паузу длительностью блока с учетом ускорения"""
+        if self.speed > 0:
+            time.sleep(frames / self.samplerate / self.speed)
+
+    def _run(self):
+        """Цикл callback потока"""
+        status = SimpleNamespace(input_overflow=False)
+        while self.active:
+            if not self.loop and self.position >= len(self.signal):
+                break
+            block = self._next_block(self.blocksize)
+            self.callback(block, self.blocksize, None, status)
+            self._sleep_block(self.blocksize)
+        self.active = False
+        self.finished.set()
+
+    def start(self):
+        """Запускает поток"""
+        self.active = True
+        if self.callback is not None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Останавливает поток"""
+        self.active = False
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """Закрывает поток"""
+        self.stop()
+
+    def read(self, frames: int):
+        """
+        Блокирующее чтение, как sounddevice.InputStream.read.
+
+        Args:
+            frames: Количество сэмплов
+
+        Returns:
+            tuple: (data, overflowed)
+        """
+        block = self._next_block(frames)
+        self._sleep_block(frames)
+        return block, False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FakeInputDevice:
+    """
+    Фабрика потоков ввода, совместимая с sounddevice.InputStream.
+
+    Передается в AudioCaptureService вместо реального устройства.
+    """
+
+    def __init__(self, signal: np.ndarray, speed: float = 1.0, loop: bool = False):
+        """
+        Инициализирует устройство.
+
+        Args:
+            signal: Воспроизводимый сигнал (моно)
+            speed: Ускорение относительно реального времени (0 - без пауз)
+            loop: Зацикливать сигнал
+        """
+        self.signal = signal
+        self.speed = speed
+        self.loop = loop
+        self.streams = []
+
+    def __call__(self, samplerate, channels=1, dtype=np.float32, blocksize=1024, callback=None, **kwargs):
+        stream = FakeInputStream(
+            self.signal,
+            samplerate=samplerate,
+            blocksize=blocksize,
+            channels=channels,
+            dtype=dtype,
+            callback=callback,
+            speed=self.speed,
+            loop=self.loop
+        )
+        self.streams.append(stream)
+        return stream
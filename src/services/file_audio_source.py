@@ -0,0 +1,238 @@
+"""
+Источник аудио из WAV файла.
+
+Читает записанные встречи через memory map без загрузки
+всего файла в память и приводит их к частоте settings.SAMPLE_RATE.
+"""
+
+import os
+import struct
+from math import gcd
+from typing import Iterator, List, Optional
+import numpy as np
+from config.settings import settings
+from src.services.vad import EnergyVAD
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Формат WAVE_FORMAT_PCM / WAVE_FORMAT_IEEE_FLOAT / WAVE_FORMAT_EXTENSIBLE
+_PCM, _FLOAT, _EXTENSIBLE = 1, 3, 0xFFFE
+
+# Длина блока при последовательном чтении (секунды)
+READ_BLOCK_SECONDS = 10.0
+
+# Запас по краям фрагмента при ресемплинге (секунды): FFT считает сигнал
+# периодическим, искажения на стыке концов отбрасываются вместе с запасом
+RESAMPLE_MARGIN_SECONDS = 0.5
+
+def resample(samples: np.ndarray, source_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Меняет частоту дискретизации через FFT.
+
+    Обрезка или дополнение спектра одновременно служит
+    фильтром против наложения частот.
+
+    Args:
+        samples: Моно сэмплы
+        source_rate: Исходная частота (Гц)
+        target_rate: Целевая частота (Гц)
+
+    Returns:
+        np.ndarray: Сэмплы float32 на целевой частоте
+    """
+    if source_rate == target_rate or len(samples) == 0:
+        return samples.astype(np.float32, copy=False)
+    target_length = int(round(len(samples) * target_rate / source_rate))
+    spectrum = np.fft.rfft(samples)
+    result = np.fft.irfft(spectrum, n=target_length) * (target_length / len(samples))
+    return result.astype(np.float32)
+
+class WavFileAudioSource:
+    """
+    Аудио источник на основе WAV файла.
+
+    Данные отображаются в память через np.memmap; при чтении фрагмента
+    конвертируется и ресемплируется только он. Позиции задаются
+    в сэмплах целевой частоты.
+    """
+
+    def __init__(self, path: str, target_rate: Optional[int] = None):
+        """
+        Открывает WAV файл.
+
+        Args:
+            path: Путь к WAV файлу
+            target_rate: Целевая частота (по умолчанию settings.SAMPLE_RATE)
+
+        Raises:
+            ValueError: Если формат файла не поддерживается
+        """
+        self.path = path
+        self.target_rate = target_rate or settings.SAMPLE_RATE
+        self._parse_header()
+        frames = self._data_size // self._frame_bytes
+        self._data = np.memmap(
+            path, dtype=self._dtype, mode="r",
+            offset=self._data_offset, shape=(frames, self.channels)
+        )
+        self.source_frames = frames
+
+    def _parse_header(self):
+        """Находит чанки fmt и data в RIFF заголовке"""
+        with open(self.path, "rb") as f:
+            riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+            if riff != b"RIFF" or wave != b"WAVE":
+                raise ValueError(f"Не WAV файл: {self.path}")
+
+            fmt = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    break
+                chunk_id, size = struct.unpack("<4sI", header)
+                if chunk_id == b"fmt ":
+                    fmt = f.read(size)
+                elif chunk_id == b"data":
+                    self._data_offset = f.tell()
+                    # Размер может быть неверным у незавершенных записей
+                    self._data_size = min(size, os.path.getsize(self.path) - self._data_offset)
+                    break
+                else:
+                    f.seek(size, os.SEEK_CUR)
+                if size % 2:
+                    f.seek(1, os.SEEK_CUR)
+
+        if fmt is None or not hasattr(self, "_data_offset"):
+            raise ValueError(f"Поврежденный WAV файл: {self.path}")
+
+        format_tag, channels, rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+        if format_tag == _EXTENSIBLE and len(fmt) >= 26:
+            format_tag = struct.unpack("<H", fmt[24:26])[0]
+
+        dtypes = {
+            (_PCM, 8): np.uint8,
+            (_PCM, 16): np.dtype("<i2"),
+            (_PCM, 32): np.dtype("<i4"),
+            (_FLOAT, 32): np.dtype("<f4"),
+            (_FLOAT, 64): np.dtype("<f8"),
+        }
+        if (format_tag, bits) not in dtypes:
+            raise ValueError(f"Неподдерживаемый формат WAV: format={format_tag}, bits={bits}")
+
+        self._dtype = dtypes[(format_tag, bits)]
+        self._format_tag = format_tag
+        self._bits = bits
+        self.channels = channels
+        self.source_rate = rate
+        self._frame_bytes = block_align
+
+    @property
+    def num_samples(self) -> int:
+        """Длина записи в сэмплах целевой частоты"""
+        return int(self.source_frames * self.target_rate / self.source_rate)
+
+    @property
+    def duration(self) -> float:
+        """Длительность записи в секундах"""
+        return self.source_frames / self.source_rate
+
+    def _to_float(self, frames: np.ndarray) -> np.ndarray:
+        """Конвертирует кадры в моно float в диапазоне [-1, 1]"""
+        if self._format_tag == _FLOAT:
+            samples = frames.astype(np.float32)
+        elif self._bits == 8:
+            samples = (frames.astype(np.float32) - 128.0) / 128.0
+        else:
+            samples = frames.astype(np.float32) / float(2 ** (self._bits - 1))
+        return samples.mean(axis=1) if self.channels > 1 else samples[:, 0]
+
+    def read(self, start: int, stop: int) -> np.ndarray:
+        """
+        Читает фрагмент записи.
+
+        Фрагмент ресемплируется вместе с запасом RESAMPLE_MARGIN_SECONDS
+        с обеих сторон, поэтому соседние блоки стыкуются без искажений.
+
+        Args:
+            start: Первый сэмпл (целевая частота)
+            stop: Сэмпл после последнего (целевая частота)
+
+        Returns:
+            np.ndarray: Моно сэмплы float32 на целевой частоте
+        """
+        stop = min(stop, self.num_samples)
+        if stop <= start:
+            return np.zeros(0, dtype=np.float32)
+        if self.source_rate == self.target_rate:
+            samples = self._to_float(self._data[start:stop])
+        else:
+            # Границы запаса - на сэмплах, общих для обеих частот (шаг step
+            # целевых и source_step исходных), чтобы блоки не сдвигались по фазе
+            common = gcd(self.source_rate, self.target_rate)
+            step, source_step = self.target_rate // common, self.source_rate // common
+            margin = int(RESAMPLE_MARGIN_SECONDS * self.target_rate)
+            first = max(0, start - margin) // step
+            last = -(-(stop + margin) // step)
+            samples = self._to_float(self._data[first * source_step:min(last * source_step, self.source_frames)])
+            samples = resample(samples, self.source_rate, self.target_rate)
+            samples = samples[start - first * step:]
+        # Округление границ может дать расхождение в один-два сэмпла
+        if len(samples) < stop - start:
+            samples = np.pad(samples, (0, stop - start - len(samples)))
+        return samples[:stop - start]
+
+    def iter_chunks(self, chunk_size: Optional[int] = None) -> Iterator[np.ndarray]:
+        """
+        Последовательно отдает запись чанками, как AudioCaptureService.
+
+        Args:
+            chunk_size: Размер чанка (по умолчанию settings.CHUNK_SIZE)
+
+        Yields:
+            np.ndarray: Чанк сэмплов float32
+        """
+        chunk_size = chunk_size or settings.CHUNK_SIZE
+        block = int(READ_BLOCK_SECONDS * self.target_rate)
+        for block_start in range(0, self.num_samples, block):
+            samples = self.read(block_start, block_start + block)
+            for offset in range(0, len(samples), chunk_size):
+                yield samples[offset:offset + chunk_size]
+
+    def find_split_points(self, chunk_seconds: float, search_seconds: float) -> List[int]:
+        """
+        Выбирает точки разреза записи в паузах.
+
+        Для каждой границы, кратной chunk_seconds, ищется самый тихий
+        кадр в пределах search_seconds вокруг нее, но не раньше
+        предыдущей точки разреза.
+
+        Args:
+            chunk_seconds: Желаемая длина фрагмента (секунды)
+            search_seconds: Полуширина окна поиска паузы (секунды)
+
+        Returns:
+            List[int]: Границы фрагментов в сэмплах, от 0 до num_samples
+        """
+        vad = EnergyVAD(sample_rate=self.target_rate)
+        block = int(READ_BLOCK_SECONDS * self.target_rate) // vad.frame_size * vad.frame_size
+        energies = [
+            vad.frame_features(self.read(start, start + block))[0]
+            for start in range(0, self.num_samples, block)
+        ]
+        energy_db = np.concatenate(energies) if energies else np.zeros(0)
+
+        frame_seconds = vad.frame_size / self.target_rate
+        chunk_frames = int(chunk_seconds / frame_seconds)
+        search_frames = int(search_seconds / frame_seconds)
+
+        points = [0]
+        target = chunk_frames
+        while target + search_frames < len(energy_db):
+            low = max(points[-1] // vad.frame_size + 1, target - search_frames)
+            high = target + search_frames
+            cut = low + int(np.argmin(energy_db[low:high]))
+            points.append(cut * vad.frame_size)
+            target = cut + chunk_frames
+        points.append(self.num_samples)
+        return points
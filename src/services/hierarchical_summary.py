@@ -0,0 +1,351 @@
+"""
+Иерархическая (map-reduce) генерация саммари.
+
+Длинная транскрипция не помещается в контекст LLM, поэтому она
+режется на фрагменты по бюджету токенов, фрагменты суммаризируются
+отдельно, а частичные саммари рекурсивно объединяются.
+"""
+
+import itertools
+import queue
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+from config.settings import settings
+from src.models.transcript import MeetingTranscript, TranscriptSegment
+from src.services.summary_service import (
+    GenerationMetrics, SummaryService, LlamaSummaryService, SUMMARY_PROMPT, stream_safely
+)
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAP_PROMPT = """Кратко перескажи основные мысли фрагмента встречи:
+
+{text}
+
+КРАТКОЕ СОДЕРЖАНИЕ:"""
+
+REDUCE_PROMPT = """Объедини краткие содержания частей встречи в одно саммари встречи:
+
+{text}
+
+САММАРИ:"""
+
+# Запас токенов на расхождение токенизации при склейке
+SAFETY_TOKENS = 16
+
+# Максимальная глубина свертки
+MAX_LEVELS = 6
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+class HierarchicalSummaryService(SummaryService):
+    """
+    Map-reduce суммаризация с бюджетом токенов.
+
+    Текст токенизируется один раз и упаковывается во фрагменты,
+    не разрывая сегменты транскрипции (сегмент режется только если
+    он сам не помещается в бюджет). Фрагменты суммаризируются
+    параллельно на доступных экземплярах модели, после чего
+    частичные саммари сворачиваются, пока не поместятся в один промпт.
+    """
+
+    def __init__(
+        self,
+        workers: Sequence[LlamaSummaryService],
+        context_tokens: Optional[int] = None,
+        map_max_tokens: Optional[int] = None,
+        final_max_tokens: Optional[int] = None
+    ):
+        """
+        Инициализирует сервис.
+
+        Args:
+            workers: Экземпляры модели; их количество задает параллельность map
+            context_tokens: Размер контекста модели (по умолчанию LLM_CONTEXT_LENGTH)
+            map_max_tokens: Длина частичного саммари (по умолчанию SUMMARY_MAP_MAX_TOKENS)
+            final_max_tokens: Длина итогового саммари (по умолчанию SUMMARY_MAX_TOKENS)
+
+        Raises:
+            ValueError: Если бюджет фрагмента не позволяет сворачивать саммари
+        """
+        if not workers:
+            raise ValueError("Нужен хотя бы один экземпляр модели")
+        self.workers = list(workers)
+        self.context_tokens = context_tokens or settings.LLM_CONTEXT_LENGTH
+        self.map_max_tokens = map_max_tokens or settings.SUMMARY_MAP_MAX_TOKENS
+        self.final_max_tokens = final_max_tokens or settings.SUMMARY_MAX_TOKENS
+        self._free_workers = queue.Queue()
+        for worker in self.workers:
+            self._free_workers.put(worker)
+        self.level_stats: List[dict] = []
+
+    @property
+    def tokenizer(self) -> LlamaSummaryService:
+        return self.workers[0]
+
+    @property
+    def last_metrics(self) -> Optional[GenerationMetrics]:
+        """Метрики последней генерации итогового саммари"""
+        return self.workers[0].last_metrics
+
+    def generator(self) -> LlamaSummaryService:
+        """Первый экземпляр модели (им же генерируется итоговое саммари)"""
+        return self.workers[0]
+
+    def release(self):
+        """Выгружает все экземпляры модели"""
+        for worker in self.workers:
+            worker.unload()
+
+    def budget(self, template: str, max_new_tokens: int) -> int:
+        """
+        Вычисляет бюджет токенов текста для промпта.
+
+        Args:
+            template: Шаблон промпта с полем {text}
+            max_new_tokens: Сколько токенов зарезервировать под ответ
+
+        Returns:
+            int: Максимум токенов текста
+        """
+        overhead = len(self.tokenizer.tokenize(template.format(text="")))
+        return self.context_tokens - overhead - max_new_tokens - SAFETY_TOKENS
+
+    def summarize(self, text: str) -> str:
+        """
+        Генерирует саммари текста, разбивая его по предложениям.
+
+        Args:
+            text: Полный текст транскрипции встречи
+
+        Returns:
+            str: Сгенерированное саммари встречи
+        """
+        units = [sentence for sentence in _SENTENCE_END.split(text) if sentence.strip()]
+        return self._summarize_safely(units)
+
+    def summarize_transcript(self, transcript: MeetingTranscript) -> str:
+        """
+        Генерирует саммари, разбивая транскрипцию по сегментам.
+
+        Args:
+            transcript: Транскрипция встречи
+
+        Returns:
+            str: Сгенерированное саммари встречи
+        """
+        return self._summarize_safely([segment.text for segment in transcript.segments])
+
+    def summarize_transcript_stream(self, transcript: MeetingTranscript) -> Iterator[str]:
+        """
+        Генерирует саммари транскрипции, отдавая токены итогового уровня по мере появления.
+
+        Args:
+            transcript: Транскрипция встречи
+
+        Yields:
+            str: Текст очередного токена итогового саммари
+        """
+        units = [segment.text for segment in transcript.segments]
+        yield from stream_safely(self.tokenizer, lambda: self.summarize_units_stream(units))
+
+    def summarize_segments_stream(self, segments: Iterable[TranscriptSegment]) -> Iterator[str]:
+        """
+        Генерирует саммари по потоку сегментов (режим ограниченной памяти).
+
+        Сегменты упаковываются во фрагменты по мере чтения, в памяти
+        держатся только текущие фрагменты и частичные саммари.
+
+        Args:
+            segments: Сегменты транскрипции (перебираются один раз)
+
+        Yields:
+            str: Текст очередного токена итогового саммари
+        """
+        units = (segment.text for segment in segments)
+        yield from stream_safely(self.tokenizer, lambda: self.summarize_units_stream(units))
+
+    def _summarize_safely(self, units: List[str]) -> str:
+        if not self.tokenizer.model:
+            return "Ошибка: модель не загружена"
+        try:
+            return self.summarize_units(units)
+        except Exception as e:
+            logger.error(f"Ошибка генерации саммари: {e}")
+            return "Ошибка генерации саммари"
+
+    def summarize_units(self, units: Iterable[str]) -> str:
+        """
+        Сворачивает текстовые единицы в итоговое саммари.
+
+        Args:
+            units: Неделимые по возможности единицы текста (сегменты), список или поток
+
+        Returns:
+            str: Итоговое саммари
+        """
+        level, total, prompt = self._reduce(units)
+        started = time.perf_counter()
+        summary = self.workers[0].generate(prompt, self.final_max_tokens)
+        self._log_level(level, "final", 1, total, [summary], time.perf_counter() - started)
+        return summary
+
+    def summarize_units_stream(self, units: Iterable[str]) -> Iterator[str]:
+        """
+        Сворачивает текстовые единицы и генерирует итоговое саммари потоком токенов.
+
+        Args:
+            units: Неделимые по возможности единицы текста (сегменты), список или поток
+
+        Yields:
+            str: Текст очередного токена итогового саммари
+        """
+        level, total, prompt = self._reduce(units)
+        started = time.perf_counter()
+        parts = []
+        for token in self.workers[0].generate_stream(prompt, self.final_max_tokens):
+            parts.append(token)
+            yield token
+        self._log_level(level, "final", 1, total, ["".join(parts)], time.perf_counter() - started)
+
+    def _reduce(self, units: Iterable[str]):
+        """
+        Выполняет уровни map, пока текст не поместится в итоговый промпт.
+
+        Единицы читаются по мере упаковки во фрагменты, поэтому поток
+        единиц не накапливается в памяти целиком.
+
+        Returns:
+            tuple: (уровень, токенов на входе итогового уровня, итоговый промпт)
+        """
+        self.level_stats = []
+        pending = iter(units)
+        level = 0
+
+        while True:
+            final_template = SUMMARY_PROMPT if level == 0 else REDUCE_PROMPT
+            final_budget = self.budget(final_template, self.final_max_tokens)
+
+            # Читаем единицы, пока они помещаются в итоговый промпт
+            head: List[Tuple[str, List[int]]] = []
+            total = 0
+            fits = True
+            for unit in pending:
+                unit_tokens = self.tokenizer.tokenize(unit)
+                head.append((unit, unit_tokens))
+                total += len(unit_tokens) + 1
+                if total > final_budget:
+                    fits = False
+                    break
+
+            if fits or level >= MAX_LEVELS:
+                if not fits:
+                    logger.warning("Достигнута максимальная глубина свертки, текст будет обрезан")
+                text = next(self._pack(head, final_budget), "")
+                return level, total, final_template.format(text=text)
+
+            template = MAP_PROMPT if level == 0 else REDUCE_PROMPT
+            chunk_budget = self.budget(template, self.map_max_tokens)
+            if chunk_budget < 2 * (self.map_max_tokens + 1):
+                raise ValueError("Бюджет фрагмента слишком мал для свертки саммари")
+
+            started = time.perf_counter()
+            counter = {"tokens": 0}
+
+            def tokenized():
+                for unit, unit_tokens in itertools.chain(
+                    head, ((unit, self.tokenizer.tokenize(unit)) for unit in pending)
+                ):
+                    counter["tokens"] += len(unit_tokens) + 1
+                    yield unit, unit_tokens
+
+            outputs = self._map(template, self._pack(tokenized(), chunk_budget))
+            self._log_level(level, "map", len(outputs), counter["tokens"], outputs, time.perf_counter() - started)
+            pending = iter(outputs)
+            level += 1
+
+    def _pack(self, units: Iterable[Tuple[str, List[int]]], budget: int) -> Iterator[str]:
+        """Жадно упаковывает единицы (текст, токены) во фрагменты не больше budget токенов"""
+        current: List[str] = []
+        used = 0
+
+        for unit, unit_tokens in units:
+            if len(unit_tokens) + 1 > budget:
+                # Сегмент длиннее бюджета режется по токенам
+                step = budget - 1
+                pieces = [
+                    (self.tokenizer.detokenize(unit_tokens[i:i + step]), len(unit_tokens[i:i + step]))
+                    for i in range(0, len(unit_tokens), step)
+                ]
+            else:
+                pieces = [(unit, len(unit_tokens))]
+
+            for piece, count in pieces:
+                if current and used + count + 1 > budget:
+                    yield "\n".join(current)
+                    current, used = [], 0
+                current.append(piece)
+                used += count + 1
+
+        if current:
+            yield "\n".join(current)
+
+    def _map(self, template: str, chunks: Iterable[str]) -> List[str]:
+        """
+        Суммаризирует фрагменты параллельно на свободных экземплярах модели.
+
+        Фрагменты берутся из потока по мере освобождения экземпляров,
+        одновременно в работе не больше двух фрагментов на экземпляр.
+        """
+        def run(chunk: str) -> str:
+            worker = self._free_workers.get()
+            try:
+                return worker.generate(template.format(text=chunk), self.map_max_tokens)
+            finally:
+                self._free_workers.put(worker)
+
+        outputs = []
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=len(self.workers)) as executor:
+            for chunk in chunks:
+                in_flight.append(executor.submit(run, chunk))
+                if len(in_flight) >= 2 * len(self.workers):
+                    outputs.append(in_flight.popleft().result())
+            while in_flight:
+                outputs.append(in_flight.popleft().result())
+        return outputs
+
+    def _log_level(self, level, kind, chunks, tokens_in, outputs, elapsed, output_tokens=None):
+        if output_tokens is None:
+            output_tokens = [self.tokenizer.tokenize(output) for output in outputs]
+        stats = {
+            "level": level,
+            "kind": kind,
+            "chunks": chunks,
+            "tokens_in": tokens_in,
+            "tokens_out": sum(len(t) for t in output_tokens),
+            "seconds": round(elapsed, 3),
+        }
+        self.level_stats.append(stats)
+        logger.info(
+            f"Саммари, уровень {level} ({kind}): фрагментов {chunks}, "
+            f"токенов {stats['tokens_in']} -> {stats['tokens_out']}, {elapsed:.1f} с"
+        )
+
+def build_summary_service(model_path: str) -> SummaryService:
+    """
+    Создает сервис саммари по настройкам.
+
+    Args:
+        model_path: Путь к файлу модели LLM
+
+    Returns:
+        SummaryService: Иерархический сервис на SUMMARY_MAP_WORKERS экземплярах модели
+    """
+    # Экземпляры с разными номерами в реестре моделей; встречи процесса делят их между собой
+    workers = [LlamaSummaryService(model_path, replica=i) for i in range(max(1, settings.SUMMARY_MAP_WORKERS))]
+    return HierarchicalSummaryService(workers)
@@ -0,0 +1,165 @@
+"""
+Транскрибирование записанных встреч из файлов.
+
+Режет запись на фрагменты в паузах и транскрибирует их
+параллельно в пуле процессов, каждый из которых загружает
+модель Whisper один раз.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+from config.settings import settings
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.services.file_audio_source import WavFileAudioSource
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Результат фрагмента: (начало, конец, текст) в секундах от начала фрагмента
+ChunkResult = List[Tuple[float, float, str]]
+
+def load_whisper_model():
+    """
+    Загружает модель Whisper из настроек.
+
+    Returns:
+        whisper.Model: Загруженная модель
+    """
+    import whisper
+    return whisper.load_model(settings.WHISPER_MODEL)
+
+# Состояние рабочего процесса: модель и открытые файлы
+_worker_model = None
+_worker_loader = None
+_worker_source = None
+
+def _init_worker(model_loader: Callable, threads: int):
+    """Инициализирует рабочий процесс: потоки torch и модель"""
+    global _worker_model, _worker_loader
+    if _worker_model is not None and _worker_loader is model_loader:
+        return
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _worker_model = model_loader()
+    _worker_loader = model_loader
+
+def _transcribe_chunk(path: str, start: int, stop: int) -> ChunkResult:
+    """Транскрибирует фрагмент файла в рабочем процессе"""
+    global _worker_source
+    if _worker_source is None or _worker_source.path != path:
+        _worker_source = WavFileAudioSource(path)
+    source = _worker_source
+
+    result = _worker_model.transcribe(
+        source.read(start, stop),
+        fp16=False,
+        task="transcribe",
+        language="ru"
+    )
+    segments = result.get("segments") or [
+        {"start": 0.0, "end": (stop - start) / source.target_rate, "text": result["text"]}
+    ]
+    return [
+        (segment["start"], segment["end"], segment["text"].strip())
+        for segment in segments
+        if segment["text"].strip()
+    ]
+
+class OfflineTranscriber:
+    """
+    Транскрибирование WAV файлов быстрее реального времени.
+
+    Запись режется в паузах на фрагменты около OFFLINE_CHUNK_SECONDS,
+    фрагменты распределяются по рабочим процессам, а результаты
+    собираются в одну MeetingTranscript с глобальными метками времени.
+    """
+
+    def __init__(self, workers: Optional[int] = None, model_loader: Callable = load_whisper_model):
+        """
+        Инициализирует транскрибер.
+
+        Args:
+            workers: Количество рабочих процессов (0 - в текущем процессе)
+            model_loader: Функция загрузки модели (должна сериализоваться pickle)
+        """
+        self.workers = settings.OFFLINE_WORKERS if workers is None else workers
+        self.model_loader = model_loader
+        self.last_stats: dict = {}
+
+    def transcribe_file(self, path: str) -> MeetingTranscript:
+        """
+        Транскрибирует WAV файл.
+
+        Args:
+            path: Путь к WAV файлу
+
+        Returns:
+            MeetingTranscript: Транскрипция с метками времени от начала записи
+        """
+        started = time.perf_counter()
+        source = WavFileAudioSource(path)
+        points = source.find_split_points(
+            settings.OFFLINE_CHUNK_SECONDS, settings.OFFLINE_SPLIT_SEARCH_SECONDS
+        )
+        chunks = list(zip(points[:-1], points[1:]))
+        logger.info(
+            f"Файл {path}: {source.duration:.1f} с, {len(chunks)} фрагментов, "
+            f"процессов: {self.workers or 1}"
+        )
+
+        results = self._run(path, chunks)
+
+        segments = []
+        for (start, _), chunk_segments in zip(chunks, results):
+            offset = start / source.target_rate
+            for segment_start, segment_end, text in chunk_segments:
+                segments.append(TranscriptSegment(
+                    start_time=offset + segment_start,
+                    end_time=offset + segment_end,
+                    text=text
+                ))
+
+        elapsed = time.perf_counter() - started
+        rtf = elapsed / source.duration if source.duration else 0.0
+        self.last_stats = {
+            "audio_seconds": source.duration,
+            "elapsed_seconds": elapsed,
+            "rtf": rtf,
+            "chunks": len(chunks),
+            "workers": self.workers or 1,
+        }
+        logger.info(
+            f"Транскрибирование завершено за {elapsed:.1f} с, "
+            f"RTF {rtf:.3f} (x{1 / rtf if rtf else 0:.1f} к реальному времени)"
+        )
+
+        return MeetingTranscript(
+            segments=segments,
+            created_at=datetime.fromtimestamp(os.path.getmtime(path)),
+            duration=source.duration
+        )
+
+    def _run(self, path: str, chunks: List[Tuple[int, int]]) -> List[ChunkResult]:
+        """Транскрибирует фрагменты в пуле процессов или в текущем процессе"""
+        threads = max(1, (os.cpu_count() or 1) // max(1, self.workers))
+        if self.workers <= 1:
+            _init_worker(self.model_loader, threads)
+            return [_transcribe_chunk(path, start, stop) for start, stop in chunks]
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.model_loader, threads)
+        ) as executor:
+            return list(executor.map(
+                _transcribe_chunk,
+                [path] * len(chunks),
+                [start for start, _ in chunks],
+                [stop for _, stop in chunks]
+            ))
@@ -1,54 +1,182 @@
+import re
 import numpy as np
 from abc import ABC, abstractmethod
-from typing import Iterator
-from datetime import datetime
+from collections import deque
+from typing import Iterator, List, Optional
 from config.settings import settings
-from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.models.transcript import TranscriptSegment
+from src.services.vad import VoiceActivityDetector
+from src.services.diarization import SpeakerDiarizer
+from src.utils.window_buffer import SampleWindowBuffer
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Допуск на неточность временных меток Whisper (секунды)
+TIMESTAMP_TOLERANCE = 0.5
+
+# Сколько последних слов хранится для склейки перекрывающихся гипотез
+HISTORY_WORDS = 32
+
+_WORD_NORMALIZE = re.compile(r"[^\w]+")
+
+def _normalize_word(word: str) -> str:
+    return _WORD_NORMALIZE.sub("", word.lower())
+
+def merge_overlap(history: List[str], text: str) -> str:
+    """
+    Удаляет из начала text слова, уже выданные в конце history.
+
+    Ищет самое длинное совпадение суффикса history с префиксом text
+    (без учета регистра и пунктуации).
+
+    Args:
+        history: Последние выданные слова
+        text: Новая гипотеза
+
+    Returns:
+        str: Текст без повторяющегося начала
+    """
+    words = text.split()
+    normalized_history = [_normalize_word(w) for w in history]
+    normalized_words = [_normalize_word(w) for w in words]
+
+    for k in range(min(len(normalized_history), len(normalized_words)), 0, -1):
+        if normalized_history[-k:] == normalized_words[:k]:
+            return " ".join(words[k:])
+    return text
+
 class STTService(ABC):
     @abstractmethod
     def transcribe_stream(self, audio_stream: Iterator[np.ndarray]) -> Iterator[TranscriptSegment]:
         pass
 
 class WhisperSTTService(STTService):
-    def __init__(self, model):
+    def __init__(
+        self,
+        model,
+        window_seconds: Optional[float] = None,
+        hop_seconds: Optional[float] = None,
+        vad: Optional[VoiceActivityDetector] = None,
+        diarizer: Optional[SpeakerDiarizer] = None
+    ):
         self.model = model
+        self.vad = vad
+        # Спикер определяется по звуку каждого сегмента Whisper сразу при выдаче
+        self.diarizer = diarizer
         self.sample_rate = settings.SAMPLE_RATE
+        window_seconds = window_seconds or settings.STT_WINDOW_SECONDS
+        hop_seconds = hop_seconds or settings.STT_HOP_SECONDS
+        if not 0 < hop_seconds <= window_seconds:
+            raise ValueError("Шаг окна должен быть в пределах (0, длина окна]")
+        self.window_size = int(window_seconds * self.sample_rate)
+        self.hop_size = int(hop_seconds * self.sample_rate)
+        # Буфер выделяется один раз и переиспользуется для всех окон
+        self.window = SampleWindowBuffer(self.window_size)
+        self.samples_consumed = 0
+        self._committed_until = 0.0
+        self._history = deque(maxlen=HISTORY_WORDS)
         logger.info(f"Whisper STT сервис инициализирован")
-        
+
     def transcribe_stream(self, audio_stream: Iterator[np.ndarray]) -> Iterator[TranscriptSegment]:
-        """Транскрибирует поток аудио в реальном времени"""
-        buffer = np.array([], dtype=np.float32)
-        buffer_duration = 0
-        start_time = datetime.now()
-        
+        """
+        Транскрибирует поток аудио в реальном времени.
+
+        Окна длиной window_size идут с шагом hop_size. Временные метки
+        сегментов считаются по аудио часам: смещение окна в сэмплах
+        плюс метки сегментов Whisper. Перекрывающиеся гипотезы
+        склеиваются без дублирования текста.
+        """
+        window = self.window
+        window.clear()
+        self.samples_consumed = 0
+        self._committed_until = 0.0
+        self._history.clear()
+
+        if self.vad is not None:
+            yield from self._transcribe_speech(audio_stream)
+            return
+
         for audio_chunk in audio_stream:
-            buffer = np.concatenate([buffer, audio_chunk])
-            buffer_duration += len(audio_chunk) / self.sample_rate
-            
-            # Транскрибируем каждые 5 секунд
-            if buffer_duration >= 5.0:
-                try:
-                    result = self.model.transcribe(
-                        buffer, 
-                        fp16=False,
-                        task="transcribe",
-                        language="ru"
-                    )
-                    
-                    if result["text"].strip():
-                        segment = TranscriptSegment(
-                            start_time=0,  # Будет обновлено в контроллере
-                            end_time=0,
-                            text=result["text"].strip()
-                        )
-                        yield segment
-                        
-                except Exception as e:
-                    logger.error(f"Ошибка транскрипции: {e}")
-                
-                buffer = np.array([], dtype=np.float32)
-                buffer_duration = 0
+            offset = 0
+            while offset < len(audio_chunk):
+                offset += window.append(audio_chunk[offset:])
+
+                # Транскрибируем каждое полное окно
+                if window.is_full:
+                    yield from self._transcribe_window(window.view(), final=False)
+                    window.consume(self.hop_size)
+                    self.samples_consumed += self.hop_size
+
+        # Остаток после окончания потока
+        window_end = (self.samples_consumed + window.size) / self.sample_rate
+        if window.size and window_end > self._committed_until + TIMESTAMP_TOLERANCE:
+            yield from self._transcribe_window(window.view(), final=True)
+
+    def _transcribe_speech(self, audio_stream: Iterator[np.ndarray]) -> Iterator[TranscriptSegment]:
+        """
+        Транскрибирует только участки речи, найденные VAD.
+
+        Участки уже разрезаны по паузам и не длиннее окна,
+        поэтому каждый передается в Whisper целиком.
+        """
+        for region in self.vad.split(audio_stream):
+            self.samples_consumed = region.start_sample
+            yield from self._transcribe_window(region.audio, final=True)
+
+    def _transcribe_window(self, audio: np.ndarray, final: bool) -> Iterator[TranscriptSegment]:
+        """
+        Транскрибирует одно окно (audio - view на буфер окна).
+
+        Если окно не последнее, выдаются только сегменты, начинающиеся
+        до начала следующего окна: остальные будут распознаны повторно
+        с большим контекстом.
+        """
+        window_start = self.samples_consumed / self.sample_rate
+        window_end = window_start + len(audio) / self.sample_rate
+        commit_limit = window_end if final else window_start + self.hop_size / self.sample_rate
+
+        try:
+            result = self.model.transcribe(
+                audio,
+                fp16=False,
+                task="transcribe",
+                language="ru"
+            )
+        except Exception as e:
+            logger.error(f"Ошибка транскрипции: {e}")
+            return
+
+        raw_segments = result.get("segments")
+        if not raw_segments:
+            raw_segments = [{"start": 0.0, "end": window_end - window_start, "text": result["text"]}]
+
+        for raw in raw_segments:
+            start = window_start + raw["start"]
+            end = min(window_start + raw["end"], window_end)
+            if start >= commit_limit:
+                break
+            segment = self._commit(start, end, raw["text"].strip())
+            if segment:
+                if self.diarizer is not None:
+                    first = max(0, int((segment.start_time - window_start) * self.sample_rate))
+                    last = int((end - window_start) * self.sample_rate)
+                    segment.speaker = self.diarizer.assign(audio[first:last])
+                yield segment
+
+    def _commit(self, start: float, end: float, text: str) -> Optional[TranscriptSegment]:
+        """Отбрасывает уже выданную часть гипотезы и выдает остаток"""
+        if not text:
+            return None
+        if end <= self._committed_until:
+            return None
+        overlapping = self.vad is None and self.hop_size < self.window_size
+        if overlapping and start < self._committed_until + TIMESTAMP_TOLERANCE:
+            text = merge_overlap(list(self._history), text)
+            start = max(start, self._committed_until)
+            if not text:
+                return None
+
+        self._committed_until = end
+        self._history.extend(text.split())
+        return TranscriptSegment(start_time=start, end_time=end, text=text)
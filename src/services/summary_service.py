@@ -5,91 +5,445 @@
 встречи с использованием LLM моделей.
 """
 
+import gc
+import threading
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
-import os
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
 from ctransformers import AutoModelForCausalLM
 from config.settings import settings
+from src.models.transcript import MeetingTranscript, TranscriptSegment
+from src.utils.summary_cache import SummaryCache, model_identity
+from src.utils.model_registry import model_registry
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+SUMMARY_PROMPT = """Создай краткое саммари встречи на основе следующего текста:
+
+{text}
+
+САММАРИ:"""
+
+# Параметры сэмплирования LLM
+GENERATION_PARAMS = {"temperature": 0.7, "top_p": 0.9, "repetition_penalty": 1.1}
+
+@dataclass
+class GenerationMetrics:
+    """
+    Метрики одной генерации.
+
+    Attributes:
+        time_to_first_token: Время до первого токена (секунды)
+        tokens: Количество сгенерированных токенов
+        total_seconds: Полное время генерации (секунды)
+    """
+
+    time_to_first_token: float
+    """Время от начала генерации до первого токена (секунды)"""
+
+    tokens: int
+    """Количество сгенерированных токенов"""
+
+    total_seconds: float
+    """Полное время генерации (секунды)"""
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Скорость генерации после первого токена"""
+        decode_seconds = self.total_seconds - self.time_to_first_token
+        if self.tokens <= 1 or decode_seconds <= 0:
+            return 0.0
+        return (self.tokens - 1) / decode_seconds
+
 class SummaryService(ABC):
     """
     Абстрактный класс сервиса генерации саммари.
-    
+
     Определяет интерфейс для различных реализаций
     генерации саммари встреч.
     """
-    
+
     @abstractmethod
     def summarize(self, text: str) -> str:
         """
         Генерирует саммари из текста.
-        
+
         Args:
             text: Текст для суммаризации
-            
+
         Returns:
             str: Сгенерированное саммари
         """
         pass
 
+    def summarize_transcript(self, transcript: MeetingTranscript) -> str:
+        """
+        Генерирует саммари транскрипции встречи.
+
+        По умолчанию суммаризирует полный текст; реализации могут
+        использовать границы сегментов.
+
+        Args:
+            transcript: Транскрипция встречи
+
+        Returns:
+            str: Сгенерированное саммари
+        """
+        return self.summarize(transcript.get_full_text())
+
+    def summarize_transcript_stream(self, transcript: MeetingTranscript) -> Iterator[str]:
+        """
+        Генерирует саммари транскрипции по мере появления токенов.
+
+        По умолчанию отдает саммари целиком одним фрагментом.
+
+        Args:
+            transcript: Транскрипция встречи
+
+        Yields:
+            str: Очередной фрагмент саммари
+        """
+        yield self.summarize_transcript(transcript)
+
+    def summarize_segments_stream(self, segments: Iterable[TranscriptSegment]) -> Iterator[str]:
+        """
+        Генерирует саммари по потоку сегментов (режим ограниченной памяти).
+
+        По умолчанию собирает полный текст сегментов в одну строку, то есть
+        память не ограничивает; реализации с моделью должны переопределять
+        метод и читать поток по частям (см. HierarchicalSummaryService).
+
+        Args:
+            segments: Сегменты транскрипции (перебираются один раз)
+
+        Yields:
+            str: Очередной фрагмент саммари
+        """
+        yield self.summarize(" ".join(segment.text for segment in segments))
+
+    @property
+    def last_metrics(self) -> Optional[GenerationMetrics]:
+        """Метрики последней генерации (если реализация их собирает)"""
+        return None
+
+    def generator(self) -> Optional["LlamaSummaryService"]:
+        """
+        Модель для генерации вне сервиса (например, скользящего саммари).
+
+        Returns:
+            Optional[LlamaSummaryService]: Модель с методами generate и tokenize
+                или None, если реализация ее не предоставляет
+        """
+        return None
+
+    def release(self):
+        """Освобождает ресурсы модели (по умолчанию ничего не делает)"""
+        pass
+
 class LlamaSummaryService(SummaryService):
     """
     Сервис генерации саммари с использованием Llama модели.
-    
+
     Использует локальную LLM для генерации краткого содержания
     транскрибированной встречи.
     """
-    
-    def __init__(self, model_path: str):
+
+    def __init__(
+        self,
+        model_path: str,
+        load_mode: Optional[str] = None,
+        cache: Optional[SummaryCache] = None,
+        replica: int = 0
+    ):
         """
         Инициализирует сервис с указанной моделью.
-        
+
+        Модель загружается при первом обращении; в режиме background
+        загрузка начинается в фоновом потоке через LLM_LOAD_DELAY_SECONDS,
+        в режиме eager - сразу в конструкторе.
+
         Args:
             model_path: Путь к файлу модели LLM
+            load_mode: Режим загрузки (по умолчанию LLM_LOAD_MODE)
+            cache: Кэш саммари (по умолчанию дисковый кэш, если SUMMARY_CACHE_ENABLED)
+            replica: Номер экземпляра модели в реестре: сервисы с одним номером
+                (например, разных встреч) используют один экземпляр, с разными - разные
         """
         self.model_path = model_path
-        logger.info("Загрузка LLM модели...")
+        self.replica = replica
+        self.load_mode = load_mode or settings.LLM_LOAD_MODE
+        if cache is None and settings.SUMMARY_CACHE_ENABLED:
+            cache = SummaryCache()
+        self.cache = cache
+        self.load_seconds: Optional[float] = None
+        self._last_metrics: Optional[GenerationMetrics] = None
+        self._model = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+        if self.load_mode == "eager":
+            self.load()
+        elif self.load_mode == "background":
+            threading.Thread(target=self._load_in_background, name="llm-loader", daemon=True).start()
+
+    @property
+    def model(self):
+        """Модель LLM; загружается при первом обращении (None, если загрузка не удалась)"""
+        return self.load()
+
+    @model.setter
+    def model(self, model):
+        with self._load_lock:
+            self._model = model
+            self._loaded = True
+
+    @property
+    def is_loaded(self) -> bool:
+        """Загружена ли модель (или попытка загрузки уже была)"""
+        return self._loaded
+
+    def load(self):
+        """
+        Загружает модель, если она еще не загружена.
+
+        Одновременные вызовы дожидаются одной загрузки.
+
+        Returns:
+            Модель LLM или None, если загрузка не удалась
+        """
+        with self._load_lock:
+            if not self._loaded:
+                self._model = self._load_model()
+                self._loaded = True
+            return self._model
+
+    def _load_model(self):
+        """Получает модель из реестра процесса; загружает ее из файла с параметрами из настроек"""
+        params = {
+            "context_length": settings.LLM_CONTEXT_LENGTH,
+            "threads": settings.LLM_THREADS,
+            "batch_size": settings.LLM_BATCH_SIZE,
+            "mmap": settings.LLM_USE_MMAP,
+        }
+
+        def load():
+            logger.info("Загрузка LLM модели...")
+            return AutoModelForCausalLM.from_pretrained(self.model_path, model_type="llama", **params)
+
+        started = time.perf_counter()
         try:
-            self.model = AutoModelForCausalLM.from_pretrained(
-                self.model_path,
-                model_type="llama"
-            )
-            logger.info("LLM модель загружена успешно")
+            model = model_registry.acquire("llm", load, path=self.model_path, replica=self.replica, **params)
         except Exception as e:
             logger.error(f"Ошибка загрузки LLM: {e}")
-            self.model = None
-    
+            return None
+        self.load_seconds = time.perf_counter() - started
+        logger.info(f"LLM модель готова за {self.load_seconds:.1f} с")
+        return model
+
+    def _load_in_background(self):
+        """Загружает модель в фоновом потоке после задержки"""
+        time.sleep(settings.LLM_LOAD_DELAY_SECONDS)
+        self.load()
+
+    def unload(self):
+        """Освобождает модель (выгружает, если ее не используют другие встречи); следующее обращение загрузит ее заново"""
+        with self._load_lock:
+            if self._model is not None:
+                logger.info("Выгрузка LLM модели")
+                model_registry.release(self._model, evict=True)
+            self._model = None
+            self._loaded = False
+        gc.collect()
+
+    def generator(self) -> "LlamaSummaryService":
+        """Сервис сам генерирует текст моделью"""
+        return self
+
+    def release(self):
+        """Выгружает модель из памяти"""
+        self.unload()
+
+    def tokenize(self, text: str) -> List[int]:
+        """
+        Разбивает текст на токены модели.
+
+        Args:
+            text: Исходный текст
+
+        Returns:
+            List[int]: Токены
+        """
+        return self.model.tokenize(text)
+
+    def detokenize(self, tokens: List[int]) -> str:
+        """
+        Собирает текст из токенов модели.
+
+        Args:
+            tokens: Токены
+
+        Returns:
+            str: Текст
+        """
+        return self.model.detokenize(tokens)
+
+    @property
+    def last_metrics(self) -> Optional[GenerationMetrics]:
+        """Метрики последней генерации"""
+        return self._last_metrics
+
+    def generate_stream(self, prompt: str, max_new_tokens: Optional[int] = None) -> Iterator[str]:
+        """
+        Генерирует продолжение промпта, отдавая токены по мере появления.
+
+        Начальные пробелы ответа пропускаются. По завершении
+        метрики сохраняются в last_metrics, а ответ - в кэш саммари;
+        при попадании в кэш ответ отдается целиком без обращения к модели.
+
+        Args:
+            prompt: Промпт
+            max_new_tokens: Максимум новых токенов (по умолчанию SUMMARY_MAX_TOKENS)
+
+        Yields:
+            str: Текст очередного токена
+        """
+        params = dict(GENERATION_PARAMS, max_new_tokens=max_new_tokens or settings.SUMMARY_MAX_TOKENS)
+        key = None
+        if self.cache is not None:
+            key = self.cache.make_key(prompt, model_identity(self.model_path), **params)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._last_metrics = None
+                yield cached
+                return
+
+        started = time.perf_counter()
+        first_token_at = None
+        tokens = 0
+        leading = True
+        parts = []
+
+        for token in self.model(prompt, stream=True, **params):
+            tokens += 1
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            if leading:
+                token = token.lstrip()
+                if not token:
+                    continue
+                leading = False
+            parts.append(token)
+            yield token
+
+        finished = time.perf_counter()
+        self._last_metrics = GenerationMetrics(
+            time_to_first_token=(first_token_at or finished) - started,
+            tokens=tokens,
+            total_seconds=finished - started
+        )
+        if key is not None:
+            self.cache.put(key, "".join(parts))
+
+    def generate(self, prompt: str, max_new_tokens: Optional[int] = None) -> str:
+        """
+        Генерирует продолжение промпта.
+
+        Args:
+            prompt: Промпт
+            max_new_tokens: Максимум новых токенов (по умолчанию SUMMARY_MAX_TOKENS)
+
+        Returns:
+            str: Сгенерированный текст
+        """
+        return "".join(self.generate_stream(prompt, max_new_tokens)).strip()
+
     def summarize(self, text: str) -> str:
         """
         Генерирует саммари из текста встречи.
-        
+
         Args:
             text: Полный текст транскрипции встречи
-            
+
         Returns:
             str: Сгенерированное саммари встречи
         """
         if not self.model:
             return "Ошибка: модель не загружена"
-        
-        prompt = f"""Создай краткое саммари встречи на основе следующего текста:
 
-{text}
-
-САММАРИ:"""
-        
         try:
-            summary = self.model(
-                prompt,
-                max_new_tokens=settings.SUMMARY_MAX_TOKENS,
-                temperature=0.7,
-                top_p=0.9,
-                repetition_penalty=1.1
-            )
-            return summary.strip()
+            return self.generate(SUMMARY_PROMPT.format(text=text))
         except Exception as e:
             logger.error(f"Ошибка генерации саммари: {e}")
             return "Ошибка генерации саммари"
+
+    def summarize_stream(self, text: str) -> Iterator[str]:
+        """
+        Генерирует саммари из текста встречи по мере появления токенов.
+
+        Args:
+            text: Полный текст транскрипции встречи
+
+        Yields:
+            str: Текст очередного токена
+        """
+        yield from stream_safely(self, lambda: self.generate_stream(SUMMARY_PROMPT.format(text=text)))
+
+    def summarize_transcript_stream(self, transcript: MeetingTranscript) -> Iterator[str]:
+        """
+        Генерирует саммари транскрипции по мере появления токенов.
+
+        Args:
+            transcript: Транскрипция встречи
+
+        Yields:
+            str: Текст очередного токена
+        """
+        yield from self.summarize_stream(transcript.get_full_text())
+
+    def summarize_segments_stream(self, segments: Iterable[TranscriptSegment]) -> Iterator[str]:
+        """
+        Генерирует саммари по потоку сегментов по мере появления токенов.
+
+        Сегменты упаковываются во фрагменты по бюджету токенов модели
+        и сворачиваются map-reduce, как в HierarchicalSummaryService
+        с одним экземпляром модели, поэтому весь текст в памяти не собирается.
+
+        Args:
+            segments: Сегменты транскрипции (перебираются один раз)
+
+        Yields:
+            str: Текст очередного токена
+        """
+        # Импорт здесь: hierarchical_summary сам импортирует этот модуль
+        from src.services.hierarchical_summary import HierarchicalSummaryService
+
+        yield from HierarchicalSummaryService([self]).summarize_segments_stream(segments)
+
+def stream_safely(generator: LlamaSummaryService, make_stream, fallback=None) -> Iterator[str]:
+    """
+    Оборачивает потоковую генерацию обработкой ошибок, как в summarize.
+
+    Args:
+        generator: Сервис, модель которого используется
+        make_stream: Функция, создающая поток токенов
+        fallback: Функция, возвращающая текст вместо сообщения об ошибке
+            (например, уже готовое саммари); пустой текст - сообщение об ошибке
+
+    Yields:
+        str: Текст очередного токена или сообщение об ошибке
+    """
+    if not generator.model:
+        logger.error("Модель саммари не загружена")
+        yield (fallback() if fallback else "") or "Ошибка: модель не загружена"
+        return
+    produced = False
+    try:
+        for token in make_stream():
+            produced = True
+            yield token
+    except Exception as e:
+        logger.error(f"Ошибка генерации саммари: {e}")
+        if not produced:
+            yield (fallback() if fallback else "") or "Ошибка генерации саммари"
@@ -1,34 +1,445 @@
+"""
+Постобработка сегментов транскрипции.
+
+Текст сегмента проходит конвейер правил (нормализация пробелов,
+фильтр галлюцинаций Whisper, удаление слов-паразитов, схлопывание
+повторов, запись чисел цифрами). Шаблоны правил компилируются один раз при создании
+процессора, каждое правило - один проход регулярного выражения
+по тексту. Сегменты обрабатываются по мере поступления и не
+изменяются: процессор возвращает новый сегмент.
+"""
+
 import re
-from typing import List
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import replace
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+from config.settings import settings
 from src.models.transcript import TranscriptSegment
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+class TranscriptRule(ABC):
+    """Правило обработки текста сегмента"""
+
+    name = ""
+
+    @abstractmethod
+    def apply(self, text: str) -> str:
+        """
+        Применяет правило к тексту сегмента.
+
+        Args:
+            text: Текст сегмента
+
+        Returns:
+            str: Обработанный текст
+        """
+        pass
+
+    def reset(self):
+        """Сбрасывает состояние правила перед новой встречей"""
+
+    def stats(self) -> Optional[dict]:
+        """Статистика правила для журнала (None, если правило ее не ведет)"""
+        return None
+
+class WhitespaceRule(TranscriptRule):
+    """Схлопывает пробелы и повторяющиеся знаки препинания"""
+
+    name = "whitespace"
+
+    def __init__(self):
+        self._spaces = re.compile(r"\s+")
+        self._punctuation = re.compile(r"[.!?]{2,}")
+
+    def apply(self, text: str) -> str:
+        return self._punctuation.sub(".", self._spaces.sub(" ", text)).strip()
+
+class FillerWordsRule(TranscriptRule):
+    """Удаляет слова-паразиты и междометия вместе с запятой после них"""
+
+    name = "fillers"
+
+    def __init__(self, words: Optional[Iterable[str]] = None):
+        """
+        Args:
+            words: Удаляемые слова и сочетания (по умолчанию TRANSCRIPT_FILLER_WORDS)
+        """
+        if words is None:
+            words = settings.TRANSCRIPT_FILLER_WORDS.split(",")
+        words = sorted({word.strip().lower() for word in words if word.strip()}, key=len, reverse=True)
+        alternatives = "|".join(r"\s+".join(map(re.escape, word.split())) for word in words)
+        self._pattern = re.compile(rf"\s*(?<!\w)(?:{alternatives})(?!\w)(?:\s*,)?", re.IGNORECASE) if words else None
+
+    def apply(self, text: str) -> str:
+        if self._pattern is None:
+            return text
+        return self._pattern.sub("", text).lstrip(" ,")
+
+class RepeatedPhraseRule(TranscriptRule):
+    """Схлопывает подряд повторенные слова и фразы ("я думаю я думаю что" -> "я думаю что")"""
+
+    name = "repeats"
+
+    def __init__(self, max_words: int = 4):
+        """
+        Args:
+            max_words: Максимальная длина повторяемой фразы в словах
+        """
+        self._pattern = re.compile(
+            rf"(?<!\w)(\w+(?:[\s,]+\w+){{0,{max_words - 1}}})(?:[\s,]+\1)+(?!\w)", re.IGNORECASE
+        )
+
+    def apply(self, text: str) -> str:
+        return self._pattern.sub(r"\1", text)
+
+# Основание и модуль полиномиального хэша n-грамм
+_HASH_BASE = 1_000_003
+_HASH_MOD = (1 << 61) - 1
+
+_TOKEN = re.compile(r"\w+")
+
+class HallucinationFilterRule(TranscriptRule):
+    """
+    Фильтр галлюцинаций и зацикливания Whisper.
+
+    На тишине и шуме Whisper выдает типовые фразы из субтитров
+    ("Продолжение следует...") и повторяет текст. Правило удаляет
+    фразы из стоп-списка, зацикленный текст внутри сегмента
+    (фрагмент, сразу повторенный целиком) и сегменты, почти все
+    n-граммы которых встречались в последних сегментах потока.
+    N-граммы слов хранятся скользящими хэшами в окне фиксированного
+    размера, поэтому память на поток постоянна.
+    """
+
+    name = "hallucinations"
+
+    def __init__(
+        self,
+        phrases: Optional[Iterable[str]] = None,
+        ngram_size: Optional[int] = None,
+        history_segments: Optional[int] = None,
+        repeat_ratio: Optional[float] = None
+    ):
+        """
+        Args:
+            phrases: Стоп-список фраз (по умолчанию TRANSCRIPT_HALLUCINATIONS)
+            ngram_size: Длина n-граммы в словах (по умолчанию TRANSCRIPT_NGRAM_SIZE)
+            history_segments: Сколько последних сегментов помнить (по умолчанию TRANSCRIPT_HISTORY_SEGMENTS)
+            repeat_ratio: Доля повторенных n-грамм, при которой сегмент отбрасывается
+                (по умолчанию TRANSCRIPT_REPEAT_RATIO)
+        """
+        if phrases is None:
+            phrases = settings.TRANSCRIPT_HALLUCINATIONS.split("|")
+        phrases = sorted({phrase.strip() for phrase in phrases if phrase.strip()}, key=len, reverse=True)
+        alternatives = "|".join(r"\s+".join(map(re.escape, phrase.split())) for phrase in phrases)
+        self._blocklist = (
+            re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)[.!?…]*", re.IGNORECASE) if phrases else None
+        )
+        self.ngram_size = ngram_size or settings.TRANSCRIPT_NGRAM_SIZE
+        self.repeat_ratio = repeat_ratio if repeat_ratio is not None else settings.TRANSCRIPT_REPEAT_RATIO
+        self._power = pow(_HASH_BASE, self.ngram_size - 1, _HASH_MOD)
+        self._history: deque = deque(maxlen=history_segments or settings.TRANSCRIPT_HISTORY_SEGMENTS)
+        self._counts: Dict[int, int] = {}
+        self.reset()
+
+    def reset(self):
+        self._history.clear()
+        self._counts.clear()
+        self.chars_removed = 0
+        self.tokens_removed = 0
+        self.segments_dropped = 0
+
+    def stats(self) -> dict:
+        return {
+            "chars_removed": self.chars_removed,
+            "tokens_removed": self.tokens_removed,
+            "segments_dropped": self.segments_dropped,
+        }
+
+    def _ngram_hashes(self, tokens: List[str]) -> List[int]:
+        """Скользящие хэши n-грамм: каждый следующий за O(1) из предыдущего"""
+        n = self.ngram_size
+        if len(tokens) < n:
+            return []
+        codes = [hash(token) % _HASH_MOD for token in tokens]
+        value = 0
+        for code in codes[:n]:
+            value = (value * _HASH_BASE + code) % _HASH_MOD
+        hashes = [value]
+        for i in range(n, len(codes)):
+            value = ((value - codes[i - n] * self._power) * _HASH_BASE + codes[i]) % _HASH_MOD
+            hashes.append(value)
+        return hashes
+
+    def apply(self, text: str) -> str:
+        original = text
+        if self._blocklist is not None:
+            text = self._blocklist.sub("", text)
+        matches = list(_TOKEN.finditer(text))
+        tokens = [match.group(0).lower() for match in matches]
+        hashes = self._ngram_hashes(tokens)
+
+        # Зацикливание: n-грамма встретилась раньше, и весь фрагмент между повторами сразу повторен
+        removed = [False] * len(tokens)
+        last_seen: Dict[int, int] = {}
+        i = 0
+        while i < len(hashes):
+            j = last_seen.get(hashes[i])
+            last_seen[hashes[i]] = i
+            period = i - j if j is not None else 0
+            if period and tokens[j:i] == tokens[i:i + period]:
+                for k in range(i, i + period):
+                    removed[k] = True
+                i += period
+            else:
+                i += 1
+        if any(removed):
+            text = self._join(text, matches, removed)
+            kept = [hashes[i] for i in range(len(hashes)) if not any(removed[i:i + self.ngram_size])]
+        else:
+            kept = hashes
+
+        # Повтор недавних сегментов: почти все n-граммы уже встречались
+        unique = set(kept)
+        if len(unique) > 1:
+            repeated = sum(1 for value in unique if value in self._counts)
+            if repeated >= self.repeat_ratio * len(unique):
+                text = ""
+                self.segments_dropped += 1
+            else:
+                self._remember(unique)
+
+        text = text.strip()
+        if text != original:
+            self.chars_removed += len(original) - len(text)
+            self.tokens_removed += len(original.split()) - len(text.split())
+        return text
+
+    @staticmethod
+    def _join(text: str, matches: List[re.Match], removed: List[bool]) -> str:
+        """Собирает текст без удаленных слов; знаки после слова удаляются вместе с ним"""
+        parts = [text[:matches[0].start()]]
+        for index, match in enumerate(matches):
+            if not removed[index]:
+                end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
+                parts.append(text[match.start():end])
+        return "".join(parts)
+
+    def _remember(self, hashes: set):
+        """Добавляет n-граммы сегмента в окно истории, вытесняя самый старый сегмент"""
+        if len(self._history) == self._history.maxlen:
+            for value in self._history[0]:
+                count = self._counts[value] - 1
+                if count:
+                    self._counts[value] = count
+                else:
+                    del self._counts[value]
+        self._history.append(hashes)
+        for value in hashes:
+            self._counts[value] = self._counts.get(value, 0) + 1
+
+# Числительные: значение и разряд внутри группы (сотни, десятки, единицы)
+_UNITS = {
+    "один": 1, "одна": 1, "одно": 1, "два": 2, "две": 2, "три": 3, "четыре": 4,
+    "пять": 5, "шесть": 6, "семь": 7, "восемь": 8, "девять": 9,
+    "десять": 10, "одиннадцать": 11, "двенадцать": 12, "тринадцать": 13, "четырнадцать": 14,
+    "пятнадцать": 15, "шестнадцать": 16, "семнадцать": 17, "восемнадцать": 18, "девятнадцать": 19,
+}
+_TENS = {
+    "двадцать": 20, "тридцать": 30, "сорок": 40, "пятьдесят": 50,
+    "шестьдесят": 60, "семьдесят": 70, "восемьдесят": 80, "девяносто": 90,
+}
+_HUNDREDS = {
+    "сто": 100, "двести": 200, "триста": 300, "четыреста": 400, "пятьсот": 500,
+    "шестьсот": 600, "семьсот": 700, "восемьсот": 800, "девятьсот": 900,
+}
+_SCALES = {
+    "тысяча": 10 ** 3, "тысячи": 10 ** 3, "тысяч": 10 ** 3, "тысячу": 10 ** 3,
+    "миллион": 10 ** 6, "миллиона": 10 ** 6, "миллионов": 10 ** 6,
+    "миллиард": 10 ** 9, "миллиарда": 10 ** 9, "миллиардов": 10 ** 9,
+}
+_NUMBER_WORDS = {}
+for _rank, _table in ((1, _UNITS), (2, _TENS), (3, _HUNDREDS), (4, _SCALES)):
+    _NUMBER_WORDS.update((_word, (_rank, _value)) for _word, _value in _table.items())
+
+class NumberNormalizationRule(TranscriptRule):
+    """
+    Записывает количественные числительные цифрами ("двадцать пять" -> "25").
+
+    Одиночные числительные меньше десяти остаются словами
+    ("два человека"), как принято в тексте.
+    """
+
+    name = "numbers"
+
+    def __init__(self):
+        word = "|".join(sorted(_NUMBER_WORDS, key=len, reverse=True))
+        self._pattern = re.compile(rf"(?<!\w)(?:{word})(?:\s+(?:{word}))*(?!\w)", re.IGNORECASE)
+
+    def apply(self, text: str) -> str:
+        return self._pattern.sub(self._replace, text)
+
+    @staticmethod
+    def _replace(match: re.Match) -> str:
+        """Разбивает серию числительных на числа и записывает их цифрами"""
+        words = match.group(0).split()
+        parts = []
+        number: List[str] = []
+        total = group = 0
+        last_rank = scale_limit = None
+
+        def flush():
+            if len(number) == 1 and total + group < 10:
+                parts.append(number[0])
+            elif number:
+                parts.append(str(total + group))
+
+        for word in words:
+            rank, value = _NUMBER_WORDS[word.lower()]
+            if rank == 4:
+                valid = scale_limit is None or value < scale_limit
+            else:
+                # После десятков допустимы только единицы: "двадцать пять", но не "двадцать пятнадцать"
+                valid = last_rank is None or rank < last_rank and not (last_rank == 2 and value >= 10)
+            if not valid:
+                flush()
+                number, total, group, last_rank, scale_limit = [], 0, 0, None, None
+            number.append(word)
+            if rank == 4:
+                total += max(group, 1) * value
+                group, last_rank, scale_limit = 0, None, value
+            else:
+                group += value
+                last_rank = rank
+        flush()
+        return " ".join(parts)
+
+# Правила, доступные по имени в TRANSCRIPT_RULES
+RULES = {
+    rule.name: rule
+    for rule in (WhitespaceRule, HallucinationFilterRule, FillerWordsRule, RepeatedPhraseRule, NumberNormalizationRule)
+}
+
+def build_rules(names: Iterable[str]) -> List[TranscriptRule]:
+    """
+    Создает правила по именам.
+
+    Args:
+        names: Имена правил в порядке применения
+
+    Returns:
+        List[TranscriptRule]: Правила
+
+    Raises:
+        ValueError: Если правило неизвестно
+    """
+    rules = []
+    for name in names:
+        name = name.strip()
+        if not name:
+            continue
+        if name not in RULES:
+            raise ValueError(f"Неизвестное правило обработки транскрипции: {name}")
+        rules.append(RULES[name]())
+    return rules
+
+# Спикер сегментов, которым диаризация не успела назначить метку;
+# отличается от меток спикеров диаризации ("Спикер 1", "Спикер 2", ...)
+UNDIARIZED_SPEAKER = "Спикер ?"
+
 class TranscriptProcessor:
+    """
+    Потоковый процессор транскрипции.
+
+    process_segment обрабатывает сегмент при поступлении, поэтому
+    к концу встречи транскрипция уже готова. Процессор хранит номер
+    следующего сегмента для спикеров-заглушек (и состояние правил),
+    поэтому у каждого потока сегментов свой экземпляр или reset().
+    """
+
+    def __init__(self, rules: Optional[Sequence[Union[str, TranscriptRule]]] = None, diarized: bool = False):
+        """
+        Инициализирует процессор и компилирует правила.
+
+        Args:
+            rules: Имена правил или готовые правила (по умолчанию TRANSCRIPT_RULES)
+            diarized: Спикеров размечает диаризация; сегменты без метки получают
+                UNDIARIZED_SPEAKER, а не чередующуюся заглушку
+        """
+        self.diarized = diarized
+        if rules is None:
+            rules = settings.TRANSCRIPT_RULES.split(",")
+        self.rules: List[TranscriptRule] = [
+            rule for item in rules for rule in ([item] if isinstance(item, TranscriptRule) else build_rules([item]))
+        ]
+        self.processed = 0
+
+    def reset(self):
+        """Начинает новый поток сегментов"""
+        self.processed = 0
+        for rule in self.rules:
+            rule.reset()
+
+    def get_stats(self) -> Dict[str, dict]:
+        """
+        Возвращает статистику правил, которые ее ведут.
+
+        Returns:
+            Dict[str, dict]: Статистика по имени правила
+        """
+        return {rule.name: rule.stats() for rule in self.rules if rule.stats() is not None}
+
     def clean_text(self, text: str) -> str:
-        """Очищает текст от лишних символов"""
-        # Удаляем лишние пробелы
-        text = re.sub(r'\s+', ' ', text)
-        # Удаляем повторяющиеся знаки препинания
-        text = re.sub(r'[.!?]{2,}', '.', text)
+        """Очищает текст правилами конвейера"""
+        for rule in self.rules:
+            text = rule.apply(text)
+            if not text:
+                break
         return text.strip()
-    
+
+    def process_segment(self, segment: TranscriptSegment) -> Optional[TranscriptSegment]:
+        """
+        Обрабатывает очередной сегмент потока.
+
+        Args:
+            segment: Сегмент от STT (не изменяется)
+
+        Returns:
+            Optional[TranscriptSegment]: Обработанный сегмент или None, если текст пуст
+        """
+        text = self.clean_text(segment.text)
+        if not text:
+            return None
+        speaker = segment.speaker
+        if speaker is None:
+            speaker = self._placeholder_speaker(self.processed)
+        self.processed += 1
+        return replace(segment, text=text, speaker=speaker)
+
     def detect_speakers(self, segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
-        """Пытается определить спикеров (упрощенная реализация)"""
-        # В реальной реализации можно использовать диаризацию
-        for i, segment in enumerate(segments):
-            segment.speaker = f"Спикер {i % 2 + 1}"
-        return segments
-    
-    def process_segments(self, segments: List[TranscriptSegment]) -> List[TranscriptSegment]:
-        """Обрабатывает сегменты транскрипции"""
-        processed_segments = []
-        
+        """Размечает спикеров-заглушек для сегментов, которым диаризация не назначила спикера"""
+        return [
+            segment if segment.speaker is not None else replace(segment, speaker=self._placeholder_speaker(i))
+            for i, segment in enumerate(segments)
+        ]
+
+    def _placeholder_speaker(self, index: int) -> str:
+        """Спикер-заглушка для сегмента с номером index"""
+        if self.diarized:
+            return UNDIARIZED_SPEAKER
+        return f"Спикер {index % 2 + 1}"
+
+    def process_segments(self, segments: Iterable[TranscriptSegment]) -> List[TranscriptSegment]:
+        """Обрабатывает все сегменты транскрипции (например, восстановленной или из файла)"""
+        return list(self.iter_process(segments))
+
+    def iter_process(self, segments: Iterable[TranscriptSegment]) -> Iterator[TranscriptSegment]:
+        """Обрабатывает сегменты потоком, не накапливая их в памяти (как process_segments)"""
+        self.reset()
         for segment in segments:
-            cleaned_text = self.clean_text(segment.text)
-            if cleaned_text:
-                segment.text = cleaned_text
-                processed_segments.append(segment)
-        
-        return self.detect_speakers(processed_segments)
+            processed = self.process_segment(segment)
+            if processed is not None:
+                yield processed
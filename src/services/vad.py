@@ -0,0 +1,289 @@
+"""
+Детектор речевой активности (VAD).
+
+Отделяет участки речи от тишины перед транскрибированием,
+чтобы не вызывать Whisper на паузах и резать окна по паузам.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from config.settings import settings
+from src.utils.window_buffer import SampleWindowBuffer
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass
+class SpeechRegion:
+    """
+    Участок речи в аудио потоке.
+
+    Attributes:
+        start_sample: Номер первого сэмпла от начала потока
+        audio: Сэмплы участка
+    """
+
+    start_sample: int
+    """Номер первого сэмпла участка от начала потока"""
+
+    audio: np.ndarray
+    """Сэмплы участка речи"""
+
+    @property
+    def end_sample(self) -> int:
+        """Номер сэмпла, следующего за участком"""
+        return self.start_sample + len(self.audio)
+
+class VoiceActivityDetector(ABC):
+    """
+    Абстрактный класс детектора речевой активности.
+
+    Преобразует поток аудио чанков в поток участков речи
+    и ведет статистику пропущенного аудио.
+    """
+
+    def __init__(self):
+        self.total_samples = 0
+        self.speech_samples = 0
+
+    @property
+    def skipped_fraction(self) -> float:
+        """Доля аудио, не переданного дальше (0.0 - 1.0)"""
+        if not self.total_samples:
+            return 0.0
+        return 1.0 - self.speech_samples / self.total_samples
+
+    @abstractmethod
+    def split(self, audio_stream: Iterator[np.ndarray]) -> Iterator[SpeechRegion]:
+        """
+        Выделяет участки речи из потока аудио.
+
+        Args:
+            audio_stream: Поток аудио чанков
+
+        Yields:
+            SpeechRegion: Участок речи
+        """
+        pass
+
+class EnergyVAD(VoiceActivityDetector):
+    """
+    VAD на основе энергии и частоты переходов через ноль.
+
+    Признаки считаются векторно по блокам кадров. Кадр считается
+    речью, если его энергия выше порога шума, а частота переходов
+    через ноль не похожа на шум. После речи кадры еще hangover_ms
+    считаются речью, чтобы не резать слова на коротких паузах.
+
+    Участки режутся по паузам; если участок длиннее max_region_seconds,
+    он режется по кадру с минимальной энергией в его хвосте.
+    """
+
+    # Сколько кадров анализируется за раз
+    BLOCK_FRAMES = 16
+
+    # Доля хвоста участка, в которой ищется точка разреза
+    CUT_SEARCH_FRACTION = 0.4
+
+    # Скорость подстройки уровня шума вверх (на блок)
+    NOISE_RISE_RATE = 0.01
+
+    # Превышение порога, при котором кадр считается речью при любом ZCR (дБ)
+    LOUD_MARGIN_DB = 10.0
+
+    def __init__(
+        self,
+        sample_rate: Optional[int] = None,
+        frame_ms: Optional[int] = None,
+        hangover_ms: Optional[int] = None,
+        threshold_db: Optional[float] = None,
+        noise_margin_db: Optional[float] = None,
+        zcr_max: Optional[float] = None,
+        min_speech_ms: Optional[int] = None,
+        max_region_seconds: Optional[float] = None
+    ):
+        """
+        Инициализирует детектор. Параметры по умолчанию берутся из настроек.
+
+        Args:
+            sample_rate: Частота дискретизации (Гц)
+            frame_ms: Длина кадра анализа (мс)
+            hangover_ms: Удержание речи после последнего речевого кадра (мс)
+            threshold_db: Абсолютный порог энергии (дБ относительно полной шкалы)
+            noise_margin_db: Превышение уровня шума для речи (дБ)
+            zcr_max: Максимальная частота переходов через ноль для речи
+            min_speech_ms: Минимальная длина участка речи (мс)
+            max_region_seconds: Максимальная длина участка (секунды)
+        """
+        super().__init__()
+        self.sample_rate = sample_rate or settings.SAMPLE_RATE
+        frame_ms = frame_ms or settings.VAD_FRAME_MS
+        hangover_ms = settings.VAD_HANGOVER_MS if hangover_ms is None else hangover_ms
+        min_speech_ms = settings.VAD_MIN_SPEECH_MS if min_speech_ms is None else min_speech_ms
+        max_region_seconds = max_region_seconds or settings.STT_WINDOW_SECONDS
+
+        self.frame_size = int(self.sample_rate * frame_ms / 1000)
+        self.block_size = self.frame_size * self.BLOCK_FRAMES
+        self.hangover_frames = int(hangover_ms / frame_ms)
+        self.min_speech_samples = int(self.sample_rate * min_speech_ms / 1000)
+        self.max_region_frames = max(1, int(max_region_seconds * self.sample_rate / self.frame_size))
+        self.threshold_db = settings.VAD_THRESHOLD_DB if threshold_db is None else threshold_db
+        self.noise_margin_db = settings.VAD_NOISE_MARGIN_DB if noise_margin_db is None else noise_margin_db
+        self.zcr_max = zcr_max or settings.VAD_ZCR_MAX
+
+        self._region = SampleWindowBuffer(self.max_region_frames * self.frame_size)
+        self._region_energy = np.zeros(self.max_region_frames, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        """Сбрасывает состояние детектора и статистику"""
+        self.total_samples = 0
+        self.speech_samples = 0
+        # До первой паузы считаем, что шум ниже абсолютного порога
+        self.noise_floor_db = self.threshold_db - self.noise_margin_db
+        self._frame_index = 0
+        self._last_speech_frame = -1
+        self._region.clear()
+        self._region_frames = 0
+        self._region_start = 0
+
+    def frame_features(self, samples: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Вычисляет энергию и ZCR для всех кадров блока.
+
+        Неполный последний кадр дополняется нулями.
+
+        Args:
+            samples: Сэмплы блока
+
+        Returns:
+            tuple: (энергия кадров в дБ, доля переходов через ноль)
+        """
+        n_frames = -(-len(samples) // self.frame_size)
+        padded = n_frames * self.frame_size
+        if padded != len(samples):
+            samples = np.pad(samples, (0, padded - len(samples)))
+        frames = samples.reshape(n_frames, self.frame_size)
+
+        energy_db = 10.0 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame_size - 1)
+        return energy_db, zcr
+
+    def _classify(self, energy_db: np.ndarray, zcr: np.ndarray) -> np.ndarray:
+        """Определяет речевые кадры и обновляет оценку уровня шума"""
+        block_floor = float(np.percentile(energy_db, 10))
+        if block_floor < self.noise_floor_db:
+            self.noise_floor_db = block_floor
+        else:
+            self.noise_floor_db += self.NOISE_RISE_RATE * (block_floor - self.noise_floor_db)
+
+        threshold = max(self.threshold_db, self.noise_floor_db + self.noise_margin_db)
+        return (energy_db > threshold) & (
+            (zcr < self.zcr_max) | (energy_db > threshold + self.LOUD_MARGIN_DB)
+        )
+
+    def split(self, audio_stream: Iterator[np.ndarray]) -> Iterator[SpeechRegion]:
+        """
+        Выделяет участки речи из потока аудио.
+
+        Args:
+            audio_stream: Поток аудио чанков
+
+        Yields:
+            SpeechRegion: Участок речи не длиннее max_region_seconds
+        """
+        self.reset()
+        block = SampleWindowBuffer(self.block_size)
+
+        for audio_chunk in audio_stream:
+            offset = 0
+            while offset < len(audio_chunk):
+                offset += block.append(audio_chunk[offset:])
+                if block.is_full:
+                    yield from self._process_block(block.view())
+                    block.clear()
+
+        if block.size:
+            yield from self._process_block(block.view())
+        yield from self._flush_region()
+
+        logger.info(
+            f"VAD: пропущено {self.skipped_fraction:.1%} аудио "
+            f"({(self.total_samples - self.speech_samples) / self.sample_rate:.1f} с)"
+        )
+
+    def _process_block(self, samples: np.ndarray) -> Iterator[SpeechRegion]:
+        """Классифицирует кадры блока и собирает участки речи"""
+        energy_db, zcr = self.frame_features(samples)
+        raw_speech = self._classify(energy_db, zcr)
+        n_frames = len(energy_db)
+
+        # Удержание (hangover): кадр - речь, если последний речевой кадр
+        # был не дальше hangover_frames назад
+        index = np.arange(self._frame_index, self._frame_index + n_frames)
+        last_speech = np.maximum.accumulate(np.where(raw_speech, index, -1))
+        last_speech = np.maximum(last_speech, self._last_speech_frame)
+        speech = (last_speech >= 0) & (index - last_speech <= self.hangover_frames)
+        self._last_speech_frame = int(last_speech[-1])
+
+        bounds = np.flatnonzero(np.diff(speech.astype(np.int8))) + 1
+        starts = np.concatenate(([0], bounds))
+        ends = np.concatenate((bounds, [n_frames]))
+
+        block_start = self.total_samples
+        for first, last in zip(starts, ends):
+            sample_from = first * self.frame_size
+            sample_to = min(last * self.frame_size, len(samples))
+            if speech[first]:
+                if self._region.size == 0:
+                    self._region_start = block_start + sample_from
+                yield from self._extend_region(samples[sample_from:sample_to], energy_db[first:last])
+            else:
+                yield from self._flush_region()
+
+        self._frame_index += n_frames
+        self.total_samples += len(samples)
+
+    def _extend_region(self, samples: np.ndarray, energy_db: np.ndarray) -> Iterator[SpeechRegion]:
+        """Дописывает речевые кадры в текущий участок"""
+        position = 0
+        while position < len(samples):
+            written = self._region.append(samples[position:])
+            first_frame = position // self.frame_size
+            frames = -(-written // self.frame_size)
+            self._region_energy[self._region_frames:self._region_frames + frames] = \
+                energy_db[first_frame:first_frame + frames]
+            self._region_frames += frames
+            position += written
+
+            if self._region.is_full:
+                yield self._cut_region()
+
+    def _cut_region(self) -> SpeechRegion:
+        """Режет переполненный участок по самому тихому кадру в хвосте"""
+        search_from = int(self._region_frames * (1.0 - self.CUT_SEARCH_FRACTION))
+        cut_frame = search_from + int(np.argmin(self._region_energy[search_from:self._region_frames]))
+        if cut_frame == 0:
+            cut_frame = self._region_frames
+        cut = cut_frame * self.frame_size
+
+        region = SpeechRegion(self._region_start, self._region.view()[:cut].copy())
+        self.speech_samples += cut
+
+        self._region.consume(cut)
+        rest = self._region_frames - cut_frame
+        self._region_energy[:rest] = self._region_energy[cut_frame:self._region_frames]
+        self._region_frames = rest
+        self._region_start += cut
+        return region
+
+    def _flush_region(self) -> Iterator[SpeechRegion]:
+        """Завершает текущий участок на паузе"""
+        if self._region.size >= self.min_speech_samples:
+            self.speech_samples += self._region.size
+            yield SpeechRegion(self._region_start, self._region.view().copy())
+        self._region.clear()
+        self._region_frames = 0
@@ -0,0 +1,179 @@
+"""
+Ограниченная очередь между стадиями обработки.
+
+Предоставляет потокобезопасную очередь с политикой
+переполнения и статистикой глубины.
+"""
+
+import threading
+import time
+from collections import deque
+from queue import Empty
+from typing import Any, Callable, Iterator, Optional
+
+POLICIES = ("block", "drop_oldest", "drop_newest", "coalesce")
+
+class QueueClosed(Exception):
+    """Очередь закрыта и пуста"""
+
+class BoundedQueue:
+    """
+    Ограниченная очередь с политикой переполнения.
+
+    Политики при заполненной очереди:
+    - block: писатель ждет освобождения места (обратное давление)
+    - drop_oldest: самый старый элемент отбрасывается
+    - drop_newest: новый элемент отбрасывается
+    - coalesce: новый элемент объединяется с последним в очереди
+      функцией coalesce; если объединить нельзя (функция вернула None
+      или не задана), отбрасывается самый старый элемент
+
+    После close() новые элементы не принимаются, а читатели
+    дочитывают оставшиеся элементы и получают QueueClosed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        policy: str = "block",
+        name: str = "queue",
+        coalesce: Optional[Callable[[Any, Any], Optional[Any]]] = None
+    ):
+        """
+        Инициализирует очередь.
+
+        Args:
+            maxsize: Максимальное количество элементов
+            policy: Политика переполнения (block, drop_oldest, drop_newest, coalesce)
+            name: Имя очереди для статистики
+            coalesce: Объединение (последний, новый) -> элемент или None для политики coalesce
+        """
+        if maxsize <= 0:
+            raise ValueError("Размер очереди должен быть положительным")
+        if policy not in POLICIES:
+            raise ValueError(f"Неизвестная политика очереди: {policy}")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.name = name
+        self.coalesce = coalesce
+        self._items = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self.closed = False
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.max_depth = 0
+        self.put_wait_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        Добавляет элемент в очередь.
+
+        Args:
+            item: Элемент
+            timeout: Максимальное ожидание для политики block (секунды)
+
+        Returns:
+            bool: True, если элемент принят
+        """
+        with self._lock:
+            if self.closed:
+                return False
+
+            if len(self._items) >= self.maxsize:
+                if self.policy == "drop_newest":
+                    self.dropped += 1
+                    return False
+                if self.policy == "coalesce":
+                    merged = self.coalesce(self._items[-1], item) if self.coalesce else None
+                    if merged is not None:
+                        self._items[-1] = merged
+                        self.coalesced += 1
+                        return True
+                    self._items.popleft()
+                    self.dropped += 1
+                elif self.policy == "drop_oldest":
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    started = time.monotonic()
+                    accepted = self._not_full.wait_for(
+                        lambda: self.closed or len(self._items) < self.maxsize, timeout
+                    )
+                    self.put_wait_seconds += time.monotonic() - started
+                    if not accepted:
+                        self.dropped += 1
+                        return False
+                    if self.closed:
+                        return False
+
+            self._items.append(item)
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._not_empty.notify()
+            return True
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Извлекает элемент из очереди.
+
+        Args:
+            timeout: Максимальное ожидание (секунды)
+
+        Returns:
+            Any: Элемент очереди
+
+        Raises:
+            QueueClosed: Очередь закрыта и пуста
+            queue.Empty: Истекло время ожидания
+        """
+        with self._lock:
+            if not self._not_empty.wait_for(lambda: self._items or self.closed, timeout):
+                raise Empty
+            if not self._items:
+                raise QueueClosed
+            item = self._items.popleft()
+            self.get_count += 1
+            self._not_full.notify()
+            return item
+
+    def close(self):
+        """Закрывает очередь для записи и будит ожидающие потоки"""
+        with self._lock:
+            self.closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+    def __iter__(self) -> Iterator[Any]:
+        """Итерирует элементы до закрытия очереди"""
+        while True:
+            try:
+                yield self.get()
+            except QueueClosed:
+                return
+
+    def stats(self) -> dict:
+        """
+        Возвращает статистику очереди.
+
+        Returns:
+            dict: Текущая и максимальная глубина, счетчики и время ожидания
+        """
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "capacity": self.maxsize,
+            "depth": len(self._items),
+            "max_depth": self.max_depth,
+            "put_count": self.put_count,
+            "get_count": self.get_count,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "put_wait_seconds": round(self.put_wait_seconds, 3),
+        }
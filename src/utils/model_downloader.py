@@ -11,6 +11,7 @@ import whisper
 from tqdm import tqdm
 from config.settings import settings
 from src.utils.logger import get_logger
+from src.utils.model_registry import model_registry
 
 logger = get_logger(__name__)
 
@@ -78,15 +79,21 @@ def ensure_whisper_model():
     """
     Проверяет и загружает Whisper модель при необходимости.
     
+    Модель берется из реестра процесса: встречи одного процесса
+    используют один экземпляр. После использования модель
+    освобождается через model_registry.release.
+    
     Returns:
-        whisper.Model: Загруженная модель Whisper
+        SharedModel: Модель Whisper из реестра
         
     Raises:
         Exception: Если загрузка не удалась
     """
     try:
         logger.info(f"Проверка Whisper модели: {settings.WHISPER_MODEL}")
-        model = whisper.load_model(settings.WHISPER_MODEL)
+        model = model_registry.acquire(
+            "whisper", lambda: whisper.load_model(settings.WHISPER_MODEL), model=settings.WHISPER_MODEL
+        )
         logger.info(f"Whisper модель '{settings.WHISPER_MODEL}' готова")
         return model
     except Exception as e:
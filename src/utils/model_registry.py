@@ -0,0 +1,335 @@
+"""
+Общий для процесса реестр моделей.
+
+Несколько встреч в одном процессе (несколько комнат на сервере)
+получают один экземпляр Whisper и LLM вместо собственной загрузки.
+Модель хранится под ключом из имени и параметров загрузки, реестр
+считает ссылки на нее и выгружает модель, которой никто не
+пользуется дольше MODEL_IDLE_SECONDS. Обращения к модели идут через
+прокси с блокировкой: модели не потокобезопасны, поэтому вызовы
+разных встреч выполняются по очереди (для параллельной работы
+нужны разные экземпляры - параметр replica в ключе). Потоковая
+генерация занимает модель до конца, но блокировка берется только
+на время получения очередного токена.
+"""
+
+import gc
+import os
+import threading
+import time
+import types
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+def estimate_memory(model: Any, params: Dict[str, Any]) -> Optional[int]:
+    """
+    Оценивает память модели.
+
+    Для моделей PyTorch (Whisper) - размер параметров и буферов,
+    для моделей из файла (GGUF отображается в память) - размер файла.
+
+    Args:
+        model: Загруженная модель
+        params: Параметры загрузки (путь к файлу в path)
+
+    Returns:
+        Optional[int]: Оценка в байтах или None, если оценить нельзя
+    """
+    if hasattr(model, "parameters"):
+        try:
+            tensors = list(model.parameters())
+            if hasattr(model, "buffers"):
+                tensors += list(model.buffers())
+            return sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+        except (AttributeError, TypeError):
+            pass
+    path = params.get("path")
+    if path and os.path.isfile(path):
+        return os.path.getsize(path)
+    return None
+
+class _Entry:
+    """Модель в реестре и ее счетчики"""
+
+    def __init__(self, name: str, params: Dict[str, Any]):
+        self.name = name
+        self.params = params
+        self.model = None
+        self.refs = 0
+        self.idle_since: Optional[float] = None
+        self.load_seconds = 0.0
+        self.memory_bytes: Optional[int] = None
+        self.calls = 0
+        self.wait_seconds = 0.0
+        # Блокировка загрузки и блокировка обращений к модели
+        self.load_lock = threading.Lock()
+        self.lock = threading.RLock()
+        self.available = threading.Condition(self.lock)
+        # Потоковая генерация, которой занята модель, и время ее последнего токена
+        self.stream: Optional[object] = None
+        self.stream_at = 0.0
+
+class SharedModel:
+    """
+    Прокси модели из реестра.
+
+    Методы модели вызываются под общей блокировкой экземпляра.
+    Если метод возвращает генератор (потоковая генерация LLM), каждый
+    токен получается под блокировкой, а между токенами другие вызовы
+    ждут окончания генерации: ее состояние хранится в модели. Генерация,
+    которую не читают дольше MODEL_STREAM_IDLE_SECONDS (брошенный поток),
+    теряет модель, и ее следующий токен - ошибка. Каждый acquire
+    возвращает свой прокси, release освобождает его один раз.
+    """
+
+    def __init__(self, registry: "ModelRegistry", entry: _Entry):
+        self._registry = registry
+        self._entry = entry
+
+    @property
+    def model(self):
+        """Исходная модель (обращения к ней в обход блокировки)"""
+        if self._entry is None:
+            raise RuntimeError("Модель уже освобождена")
+        return self._entry.model
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self.model, name)
+        if callable(attribute):
+            return lambda *args, **kwargs: self._locked(attribute, args, kwargs)
+        return attribute
+
+    def __call__(self, *args, **kwargs):
+        return self._locked(self.model, args, kwargs)
+
+    def _locked(self, function: Callable, args: tuple, kwargs: dict):
+        entry = self._entry
+        with self._hold(entry):
+            result = function(*args, **kwargs)
+        if isinstance(result, types.GeneratorType):
+            return self._iterate(entry, result)
+        return result
+
+    def _iterate(self, entry: _Entry, generator: types.GeneratorType):
+        """Перебирает генератор модели, захватывая блокировку на каждый токен"""
+        stream = object()
+        owned = False
+        try:
+            while True:
+                with self._hold(entry, stream, count=not owned):
+                    if owned and entry.stream is not stream:
+                        raise RuntimeError("Поток генерации прерван: модель передана другому пользователю")
+                    if not owned:
+                        owned = True
+                        entry.stream, entry.stream_at = stream, time.monotonic()
+                    try:
+                        token = next(generator)
+                    except StopIteration:
+                        return
+                    entry.stream_at = time.monotonic()
+                yield token
+        finally:
+            with entry.available:
+                if entry.stream is stream:
+                    entry.stream = None
+                    entry.available.notify_all()
+                generator.close()
+
+    @staticmethod
+    @contextmanager
+    def _hold(entry: _Entry, stream: Optional[object] = None, count: bool = True):
+        """Захватывает модель (дожидаясь чужой потоковой генерации) и учитывает время ожидания"""
+        started = time.perf_counter()
+        with entry.available:
+            while entry.stream is not None and entry.stream is not stream:
+                idle = time.monotonic() - entry.stream_at
+                if idle >= settings.MODEL_STREAM_IDLE_SECONDS:
+                    logger.warning(f"Потоковая генерация модели {entry.name} не читается {idle:.0f} с, модель освобождена")
+                    entry.stream = None
+                    break
+                entry.available.wait(settings.MODEL_STREAM_IDLE_SECONDS - idle)
+            if count:
+                entry.calls += 1
+            entry.wait_seconds += time.perf_counter() - started
+            yield
+
+    def exclusive(self):
+        """Захватывает модель для серии обращений к исходной модели (например, батчевого декодирования)"""
+        if self._entry is None:
+            raise RuntimeError("Модель уже освобождена")
+        return self._hold(self._entry)
+
+    def release(self, evict: bool = False):
+        """Освобождает модель (см. ModelRegistry.release)"""
+        self._registry.release(self, evict)
+
+class ModelRegistry:
+    """
+    Реестр загруженных моделей со счетчиком ссылок.
+
+    acquire загружает модель при первом обращении (одновременные
+    обращения с тем же ключом дожидаются одной загрузки), release
+    уменьшает счетчик. Модель без ссылок выгружается фоновым потоком
+    через idle_seconds или сразу при release(evict=True).
+    """
+
+    def __init__(self, idle_seconds: Optional[float] = None):
+        """
+        Инициализирует реестр.
+
+        Args:
+            idle_seconds: Время простоя до выгрузки модели, 0 - выгружать сразу
+                (по умолчанию MODEL_IDLE_SECONDS)
+        """
+        self.idle_seconds = idle_seconds if idle_seconds is not None else settings.MODEL_IDLE_SECONDS
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._lock = threading.Lock()
+        self._evictor: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _key(name: str, params: Dict[str, Any]) -> Tuple:
+        return (name,) + tuple(sorted(params.items()))
+
+    def acquire(self, name: str, loader: Callable[[], Any], **params) -> SharedModel:
+        """
+        Возвращает модель из реестра, загружая ее при необходимости.
+
+        Args:
+            name: Имя модели
+            loader: Функция загрузки модели
+            **params: Параметры загрузки; вместе с именем образуют ключ
+
+        Returns:
+            SharedModel: Прокси модели; после использования вызвать release
+
+        Raises:
+            Exception: Ошибка загрузки модели
+        """
+        key = self._key(name, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = _Entry(name, params)
+            entry.refs += 1
+            entry.idle_since = None
+
+        with entry.load_lock:
+            if entry.model is None:
+                started = time.perf_counter()
+                try:
+                    model = loader()
+                except Exception:
+                    with self._lock:
+                        entry.refs -= 1
+                        if not entry.refs and self._entries.get(key) is entry:
+                            del self._entries[key]
+                    raise
+                entry.load_seconds = time.perf_counter() - started
+                entry.memory_bytes = estimate_memory(model, params)
+                entry.model = model
+                logger.info(f"Модель {name} загружена в реестр за {entry.load_seconds:.1f} с")
+        return SharedModel(self, entry)
+
+    def release(self, model: Any, evict: bool = False):
+        """
+        Освобождает модель, полученную через acquire.
+
+        Args:
+            model: Прокси из acquire (другие объекты игнорируются)
+            evict: Выгрузить сразу, если у модели не осталось пользователей
+        """
+        if not isinstance(model, SharedModel) or model._entry is None:
+            return
+        entry, model._entry = model._entry, None
+        with self._lock:
+            entry.refs -= 1
+            if entry.refs:
+                return
+            entry.idle_since = time.monotonic()
+            if evict or self.idle_seconds <= 0:
+                self._evict(entry)
+            else:
+                self._start_evictor()
+        if entry.model is None:
+            gc.collect()
+
+    def _evict(self, entry: _Entry):
+        """Удаляет модель без ссылок из реестра (вызывается под self._lock)"""
+        key = self._key(entry.name, entry.params)
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.model = None
+        logger.info(f"Модель {entry.name} выгружена из реестра")
+
+    def _start_evictor(self):
+        """Запускает фоновую выгрузку, если она не запущена (вызывается под self._lock)"""
+        if self._evictor is None:
+            self._evictor = threading.Thread(target=self._run, name="model-evictor", daemon=True)
+            self._evictor.start()
+
+    def _run(self):
+        """Цикл фоновой выгрузки; завершается, когда простаивающих моделей не осталось"""
+        while True:
+            time.sleep(max(0.05, self.idle_seconds / 4))
+            self.evict_idle()
+            with self._lock:
+                if not any(entry.idle_since is not None for entry in self._entries.values()):
+                    self._evictor = None
+                    return
+
+    def evict_idle(self) -> int:
+        """
+        Выгружает модели, которые простаивают дольше idle_seconds.
+
+        Returns:
+            int: Количество выгруженных моделей
+        """
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                entry for entry in self._entries.values()
+                if not entry.refs and entry.idle_since is not None and now - entry.idle_since >= self.idle_seconds
+            ]
+            for entry in idle:
+                self._evict(entry)
+        if idle:
+            gc.collect()
+        return len(idle)
+
+    def stats(self) -> List[dict]:
+        """
+        Возвращает сведения о моделях в памяти.
+
+        Returns:
+            List[dict]: Имя, параметры, ссылки, обращения, ожидание блокировки,
+                время загрузки, оценка памяти и время простоя каждой модели
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "name": entry.name,
+                    "params": dict(entry.params),
+                    "refs": entry.refs,
+                    "loaded": entry.model is not None,
+                    "calls": entry.calls,
+                    "wait_seconds": round(entry.wait_seconds, 4),
+                    "load_seconds": round(entry.load_seconds, 2),
+                    "memory_bytes": entry.memory_bytes,
+                    "idle_seconds": round(now - entry.idle_since, 1) if entry.idle_since is not None else 0.0,
+                }
+                for entry in self._entries.values()
+            ]
+
+    def resident_bytes(self) -> int:
+        """Суммарная оценка памяти загруженных моделей"""
+        return sum(stats["memory_bytes"] or 0 for stats in self.stats() if stats["loaded"])
+
+# Реестр моделей процесса
+model_registry = ModelRegistry()
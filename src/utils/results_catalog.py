@@ -0,0 +1,395 @@
+"""
+Каталог сохраненных результатов встреч.
+
+Хранит в SQLite сведения о каждой встрече (длительность, количество
+сегментов, спикеры, пути к транскрипции и саммари), чтобы список
+результатов строился по индексу, а не обходом папки results/,
+и полнотекстовый индекс (FTS5) текста сегментов для поиска.
+"""
+
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Iterable, List, Optional
+from src.models.transcript import MeetingTranscript, TranscriptSegment
+
+# Имя файла каталога в папке результатов
+CATALOG_FILE = "catalog.db"
+
+# Допустимые поля сортировки списка встреч
+SORT_COLUMNS = {
+    "date": "created_at",
+    "duration": "duration",
+    "segments": "segment_count",
+    "id": "meeting_id",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    meeting_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    duration REAL,
+    segment_count INTEGER,
+    speakers TEXT,
+    transcript_path TEXT,
+    summary_path TEXT
+);
+CREATE INDEX IF NOT EXISTS meetings_created_at ON meetings (created_at);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    meeting_id TEXT NOT NULL,
+    segment_index INTEGER NOT NULL,
+    start_time REAL,
+    speaker TEXT,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS segments_meeting_id ON segments (meeting_id);
+-- Текст для индекса: "ё" заменяется на "е", как в запросах (см. stem);
+-- unicode61 с remove_diacritics эти буквы не отождествляет
+CREATE VIEW IF NOT EXISTS segments_search AS
+    SELECT id, meeting_id, replace(replace(text, 'ё', 'е'), 'Ё', 'Е') AS text FROM segments;
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5 (
+    text,
+    content = 'segments_search',
+    content_rowid = 'id',
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+# Окончания, отбрасываемые при поиске (от длинных к коротким)
+_RUSSIAN_ENDINGS = sorted(
+    (
+        "ами ями ого его ому ему ыми ими иях ать ять ить ешь ишь ете ите ует уют "
+        "ах ях ов ев ей ой ий ый ая яя ое ее ие ые ую юю ом ем ам ям ть ет ит ют ут ат ят "
+        "ли ла ло а я о е и ы у ю ь й"
+    ).split(),
+    key=len,
+    reverse=True
+)
+
+# Минимальная длина основы после отбрасывания окончания
+MIN_STEM_LENGTH = 3
+
+_WORD = re.compile(r"\w+")
+
+def stem(word: str) -> str:
+    """
+    Отбрасывает типичное окончание русского слова.
+
+    Грубая замена морфологическому анализу: основа используется
+    как префикс при поиске, поэтому находятся разные формы слова.
+
+    Args:
+        word: Слово
+
+    Returns:
+        str: Основа слова в нижнем регистре
+    """
+    word = word.lower().replace("ё", "е")
+    for ending in _RUSSIAN_ENDINGS:
+        if word.endswith(ending) and len(word) - len(ending) >= MIN_STEM_LENGTH:
+            return word[:-len(ending)]
+    return word
+
+def build_match_query(query: str) -> str:
+    """
+    Строит запрос FTS5: все слова запроса как префиксы своих основ.
+
+    Args:
+        query: Запрос пользователя
+
+    Returns:
+        str: Выражение для MATCH (пустое, если в запросе нет слов)
+    """
+    return " ".join(f'"{stem(word)}"*' for word in _WORD.findall(query))
+
+class ResultsCatalog:
+    """
+    Каталог встреч в SQLite.
+
+    Каждая операция открывает собственное соединение, поэтому каталог
+    можно обновлять из нескольких потоков и процессов пакетной обработки.
+    """
+
+    def __init__(self, results_dir: str):
+        """
+        Инициализирует каталог.
+
+        Args:
+            results_dir: Папка результатов, в которой хранится каталог
+        """
+        self.results_dir = results_dir
+        self.path = os.path.join(results_dir, CATALOG_FILE)
+
+    def exists(self) -> bool:
+        """Создан ли файл каталога"""
+        return os.path.exists(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(self.results_dir, exist_ok=True)
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        # Индекс старых каталогов построен по тексту с "ё" - перестраивается
+        fts = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'segments_fts'").fetchone()
+        outdated = fts is not None and "segments_search" not in fts[0]
+        if outdated:
+            connection.execute("DROP TABLE segments_fts")
+        connection.executescript(_SCHEMA)
+        if outdated:
+            with connection:
+                connection.execute("INSERT INTO segments_fts (segments_fts) VALUES ('rebuild')")
+        return connection
+
+    def record_transcript(self, meeting_id: str, transcript: MeetingTranscript, path: str):
+        """
+        Добавляет или обновляет сведения о транскрипции встречи.
+
+        Args:
+            meeting_id: Идентификатор встречи
+            transcript: Сохраненная транскрипция
+            path: Путь к файлу транскрипции
+        """
+        self.record_segments(meeting_id, transcript.created_at, transcript.duration, transcript.segments, path)
+
+    def record_segments(
+        self,
+        meeting_id: str,
+        created_at: datetime,
+        duration: float,
+        segments: Iterable[TranscriptSegment],
+        path: str
+    ):
+        """
+        Добавляет или обновляет сведения о встрече по потоку сегментов.
+
+        Args:
+            meeting_id: Идентификатор встречи
+            created_at: Время начала встречи
+            duration: Длительность встречи в секундах
+            segments: Сегменты транскрипции (перебираются один раз)
+            path: Путь к файлу транскрипции
+        """
+        speakers = set()
+
+        def rows():
+            for index, segment in enumerate(segments):
+                if segment.speaker:
+                    speakers.add(segment.speaker)
+                yield meeting_id, index, segment.start_time, segment.speaker, segment.text
+
+        with self._connect() as connection:
+            self._delete_segments(connection, meeting_id)
+            connection.executemany(
+                "INSERT INTO segments (meeting_id, segment_index, start_time, speaker, text) VALUES (?, ?, ?, ?, ?)",
+                rows()
+            )
+            connection.execute(
+                "INSERT INTO segments_fts (rowid, text) SELECT id, text FROM segments_search WHERE meeting_id = ?",
+                (meeting_id,)
+            )
+            segment_count = connection.execute(
+                "SELECT COUNT(*) FROM segments WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()[0]
+            connection.execute(
+                """
+                INSERT INTO meetings (meeting_id, created_at, duration, segment_count, speakers, transcript_path)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (meeting_id) DO UPDATE SET
+                    created_at = excluded.created_at,
+                    duration = excluded.duration,
+                    segment_count = excluded.segment_count,
+                    speakers = excluded.speakers,
+                    transcript_path = excluded.transcript_path
+                """,
+                (
+                    meeting_id,
+                    created_at.isoformat(),
+                    duration,
+                    segment_count,
+                    json.dumps(sorted(speakers), ensure_ascii=False),
+                    path,
+                )
+            )
+        connection.close()
+
+    @staticmethod
+    def _delete_segments(connection: sqlite3.Connection, meeting_id: str):
+        """Удаляет сегменты встречи из таблицы и полнотекстового индекса"""
+        connection.execute(
+            "INSERT INTO segments_fts (segments_fts, rowid, text) "
+            "SELECT 'delete', id, text FROM segments_search WHERE meeting_id = ?",
+            (meeting_id,)
+        )
+        connection.execute("DELETE FROM segments WHERE meeting_id = ?", (meeting_id,))
+
+    def record_summary(self, meeting_id: str, created_at: datetime, path: str):
+        """
+        Добавляет или обновляет путь к саммари встречи.
+
+        Args:
+            meeting_id: Идентификатор встречи
+            created_at: Время создания саммари (если транскрипции еще нет)
+            path: Путь к файлу саммари
+        """
+        with self._connect() as connection:
+            connection.execute(
+                """
+                INSERT INTO meetings (meeting_id, created_at, summary_path)
+                VALUES (?, ?, ?)
+                ON CONFLICT (meeting_id) DO UPDATE SET
+                    created_at = COALESCE(meetings.created_at, excluded.created_at),
+                    summary_path = excluded.summary_path
+                """,
+                (meeting_id, created_at.isoformat(), path)
+            )
+        connection.close()
+
+    def get(self, meeting_id: str) -> Optional[dict]:
+        """
+        Возвращает сведения о встрече.
+
+        Args:
+            meeting_id: Идентификатор встречи
+
+        Returns:
+            Optional[dict]: Запись каталога или None
+        """
+        if not self.exists():
+            return None
+        connection = self._connect()
+        try:
+            row = connection.execute("SELECT * FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        finally:
+            connection.close()
+        return self._to_dict(row) if row else None
+
+    def list_meetings(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        sort: str = "date",
+        descending: bool = True,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None
+    ) -> List[dict]:
+        """
+        Возвращает страницу списка встреч.
+
+        Args:
+            limit: Размер страницы
+            offset: Сколько записей пропустить
+            sort: Поле сортировки (date, duration, segments, id)
+            descending: Сортировать по убыванию
+            since: Только встречи не раньше этого времени
+            until: Только встречи раньше этого времени
+
+        Returns:
+            List[dict]: Записи каталога
+
+        Raises:
+            ValueError: Если поле сортировки неизвестно
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Неизвестное поле сортировки: {sort}")
+        where, params = self._filter(since, until)
+        order = "DESC" if descending else "ASC"
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                f"SELECT * FROM meetings {where} "
+                f"ORDER BY {SORT_COLUMNS[sort]} {order}, meeting_id {order} LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        finally:
+            connection.close()
+        return [self._to_dict(row) for row in rows]
+
+    def count(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> int:
+        """
+        Возвращает количество встреч.
+
+        Args:
+            since: Только встречи не раньше этого времени
+            until: Только встречи раньше этого времени
+
+        Returns:
+            int: Количество встреч
+        """
+        where, params = self._filter(since, until)
+        connection = self._connect()
+        try:
+            return connection.execute(f"SELECT COUNT(*) FROM meetings {where}", params).fetchone()[0]
+        finally:
+            connection.close()
+
+    def search(self, query: str, limit: int = 20) -> List[dict]:
+        """
+        Ищет сегменты транскрипций по словам запроса.
+
+        Каждое слово сводится к основе и ищется как префикс, поэтому
+        запрос "бюджетом" находит "бюджет", "бюджета" и т.п.
+        Результаты упорядочены по релевантности (BM25).
+
+        Args:
+            query: Запрос пользователя
+            limit: Максимальное количество результатов
+
+        Returns:
+            List[dict]: Найденные сегменты с идентификатором встречи, номером
+                сегмента, временем начала, спикером и текстом с выделением
+        """
+        match = build_match_query(query)
+        if not match or not self.exists():
+            return []
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                """
+                SELECT segments.meeting_id, segments.segment_index, segments.start_time,
+                       segments.speaker, segments.text, meetings.created_at,
+                       highlight(segments_fts, 0, '[', ']') AS highlighted
+                FROM segments_fts
+                JOIN segments ON segments.id = segments_fts.rowid
+                LEFT JOIN meetings ON meetings.meeting_id = segments.meeting_id
+                WHERE segments_fts MATCH ?
+                ORDER BY rank
+                LIMIT ?
+                """,
+                (match, limit)
+            ).fetchall()
+        finally:
+            connection.close()
+        return [dict(row) for row in rows]
+
+    def optimize(self):
+        """Объединяет сегменты полнотекстового индекса для ускорения поиска"""
+        with self._connect() as connection:
+            connection.execute("INSERT INTO segments_fts (segments_fts) VALUES ('optimize')")
+        connection.close()
+
+    def clear(self):
+        """Удаляет все записи каталога и полнотекстового индекса"""
+        with self._connect() as connection:
+            connection.execute("DELETE FROM meetings")
+            connection.execute("DELETE FROM segments")
+            connection.execute("INSERT INTO segments_fts (segments_fts) VALUES ('delete-all')")
+        connection.close()
+
+    @staticmethod
+    def _filter(since: Optional[datetime], until: Optional[datetime]):
+        conditions, params = [], []
+        if since is not None:
+            conditions.append("created_at >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            conditions.append("created_at < ?")
+            params.append(until.isoformat())
+        return ("WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> dict:
+        record = dict(row)
+        record["speakers"] = json.loads(record["speakers"]) if record["speakers"] else []
+        return record
@@ -0,0 +1,303 @@
+"""
+Сохранение результатов встречи.
+
+Записывает транскрипции и саммари в папку results/
+в едином формате для живых встреч, файлов и пакетной обработки,
+и читает сохраненные транскрипции обратно.
+"""
+
+import glob
+import os
+import re
+import sqlite3
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.utils.results_catalog import ResultsCatalog
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+RESULTS_DIR = "results"
+
+UNKNOWN_SPEAKER = "Неизвестный"
+
+_SEGMENT_LINE = re.compile(r"^\[(\d+(?:\.\d+)?)s\] (.*?): (.*)$")
+
+def meeting_file_id(created_at: datetime, suffix: Optional[str] = None) -> str:
+    """
+    Формирует идентификатор встречи для имен файлов.
+
+    Args:
+        created_at: Время начала встречи
+        suffix: Дополнительный суффикс для различения встреч с одинаковым временем
+
+    Returns:
+        str: Идентификатор вида YYYYMMDD_HHMMSS[_suffix]
+    """
+    timestamp = created_at.strftime("%Y%m%d_%H%M%S")
+    return f"{timestamp}_{suffix}" if suffix else timestamp
+
+def save_transcript(
+    transcript: MeetingTranscript,
+    results_dir: str = RESULTS_DIR,
+    meeting_id: Optional[str] = None
+) -> str:
+    """
+    Сохраняет транскрипцию в файл.
+
+    Args:
+        transcript: Объект транскрипции для сохранения
+        results_dir: Папка результатов
+        meeting_id: Идентификатор встречи (по умолчанию время начала)
+
+    Returns:
+        str: Путь к сохраненному файлу
+    """
+    return save_segments(transcript.segments, transcript.created_at, transcript.duration, results_dir, meeting_id)
+
+def save_segments(
+    segments: Iterable[TranscriptSegment],
+    created_at: datetime,
+    duration: float,
+    results_dir: str = RESULTS_DIR,
+    meeting_id: Optional[str] = None
+) -> str:
+    """
+    Сохраняет транскрипцию из потока сегментов.
+
+    Сегменты записываются в файл и в каталог по одному,
+    поэтому весь поток не держится в памяти.
+
+    Args:
+        segments: Сегменты транскрипции по порядку
+        created_at: Время начала встречи
+        duration: Длительность встречи в секундах
+        results_dir: Папка результатов
+        meeting_id: Идентификатор встречи (по умолчанию время начала)
+
+    Returns:
+        str: Путь к сохраненному файлу
+    """
+    # Создаем папку для результатов
+    os.makedirs(results_dir, exist_ok=True)
+
+    # Формируем имя файла
+    meeting_id = meeting_id or meeting_file_id(created_at)
+    filepath = os.path.join(results_dir, f"transcript_{meeting_id}.txt")
+
+    # Сохраняем транскрипцию
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"Транскрипция встречи от {created_at}\n")
+        f.write(f"Длительность: {duration:.2f} секунд\n")
+        f.write("=" * 50 + "\n\n")
+
+        def written() -> Iterator[TranscriptSegment]:
+            for segment in segments:
+                speaker = segment.speaker or UNKNOWN_SPEAKER
+                f.write(f"[{segment.start_time:.2f}s] {speaker}: {segment.text}\n")
+                yield segment
+
+        # Каталог индексирует сегменты по мере записи в файл
+        remaining = written()
+        _update_catalog(results_dir, "record_segments", meeting_id, created_at, duration, remaining, filepath)
+        for _ in remaining:
+            # Дописываем файл, если каталог прервал чтение из-за ошибки
+            pass
+
+    logger.info(f"Транскрипция сохранена в: {filepath}")
+    return filepath
+
+def save_summary(
+    summary: str,
+    created_at: datetime,
+    results_dir: str = RESULTS_DIR,
+    meeting_id: Optional[str] = None
+) -> str:
+    """
+    Сохраняет саммари в файл.
+
+    Args:
+        summary: Текст саммари для сохранения
+        created_at: Время создания саммари
+        results_dir: Папка результатов
+        meeting_id: Идентификатор встречи (по умолчанию время создания)
+
+    Returns:
+        str: Путь к сохраненному файлу
+    """
+    filepath, _ = save_summary_stream([summary], created_at, results_dir, meeting_id)
+    return filepath
+
+def save_summary_stream(
+    tokens: Iterable[str],
+    created_at: datetime,
+    results_dir: str = RESULTS_DIR,
+    meeting_id: Optional[str] = None
+) -> Tuple[str, str]:
+    """
+    Сохраняет саммари в файл по мере генерации.
+
+    Каждый фрагмент дописывается и сбрасывается на диск сразу,
+    поэтому файл можно читать, пока саммари еще генерируется.
+
+    Args:
+        tokens: Фрагменты саммари в порядке генерации
+        created_at: Время создания саммари
+        results_dir: Папка результатов
+        meeting_id: Идентификатор встречи (по умолчанию время создания)
+
+    Returns:
+        tuple: (путь к сохраненному файлу, полный текст саммари)
+    """
+    # Создаем папку для результатов
+    os.makedirs(results_dir, exist_ok=True)
+
+    # Формируем имя файла
+    meeting_id = meeting_id or meeting_file_id(created_at)
+    filepath = os.path.join(results_dir, f"summary_{meeting_id}.txt")
+
+    # Сохраняем саммари
+    parts = []
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"Саммари встречи от {created_at}\n")
+        f.write("=" * 30 + "\n\n")
+        f.flush()
+        for token in tokens:
+            parts.append(token)
+            f.write(token)
+            f.flush()
+        f.write("\n")
+
+    logger.info(f"Саммари сохранено в: {filepath}")
+    _update_catalog(results_dir, "record_summary", meeting_id, created_at, filepath)
+    return filepath, "".join(parts).strip()
+
+def _update_catalog(results_dir: str, method: str, *args):
+    """Обновляет каталог результатов; ошибка каталога не мешает сохранению файлов"""
+    try:
+        getattr(ResultsCatalog(results_dir), method)(*args)
+    except sqlite3.Error as e:
+        logger.warning(f"Не удалось обновить каталог результатов: {e}")
+
+def read_transcript(filepath: str) -> MeetingTranscript:
+    """
+    Читает транскрипцию, сохраненную save_transcript.
+
+    Конец сегмента в файле не хранится и принимается равным
+    началу следующего сегмента (для последнего - длительности).
+
+    Args:
+        filepath: Путь к файлу транскрипции
+
+    Returns:
+        MeetingTranscript: Восстановленная транскрипция
+
+    Raises:
+        ValueError: Если файл не в формате транскрипции
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        created_at, duration = _read_transcript_header(f, filepath)
+    return MeetingTranscript(
+        segments=read_transcript_segments(filepath),
+        created_at=created_at,
+        duration=duration
+    )
+
+def read_transcript_segments(filepath: str) -> Iterator[TranscriptSegment]:
+    """
+    Читает сегменты транскрипции из файла по одному.
+
+    Args:
+        filepath: Путь к файлу транскрипции
+
+    Yields:
+        TranscriptSegment: Очередной сегмент
+
+    Raises:
+        ValueError: Если файл не в формате транскрипции
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        _, duration = _read_transcript_header(f, filepath)
+        previous = None
+        for line in f:
+            match = _SEGMENT_LINE.match(line.rstrip("\n"))
+            if not match:
+                continue
+            start, speaker, text = match.groups()
+            segment = TranscriptSegment(
+                start_time=float(start),
+                end_time=float(start),
+                text=text,
+                speaker=None if speaker == UNKNOWN_SPEAKER else speaker
+            )
+            if previous is not None:
+                previous.end_time = segment.start_time
+                yield previous
+            previous = segment
+
+        if previous is not None:
+            previous.end_time = max(duration, previous.start_time)
+            yield previous
+
+def _read_transcript_header(f, filepath: str):
+    """Читает заголовок транскрипции: (время начала, длительность)"""
+    title = f.readline().rstrip("\n")
+    details = f.readline()
+    if not title.startswith("Транскрипция встречи от ") or not details:
+        raise ValueError(f"Не файл транскрипции: {filepath}")
+    return datetime.fromisoformat(title[len("Транскрипция встречи от "):]), float(details.split()[1])
+
+def read_summary_header(filepath: str) -> datetime:
+    """
+    Читает время создания из файла саммари, сохраненного save_summary.
+
+    Args:
+        filepath: Путь к файлу саммари
+
+    Returns:
+        datetime: Время создания саммари
+
+    Raises:
+        ValueError: Если файл не в формате саммари
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        header = f.readline().rstrip("\n")
+    if not header.startswith("Саммари встречи от "):
+        raise ValueError(f"Не файл саммари: {filepath}")
+    return datetime.fromisoformat(header[len("Саммари встречи от "):])
+
+def reindex_catalog(results_dir: str = RESULTS_DIR) -> int:
+    """
+    Перестраивает каталог результатов по файлам в папке.
+
+    Транскрипции и саммари сопоставляются по идентификатору
+    встречи в имени файла.
+
+    Args:
+        results_dir: Папка результатов
+
+    Returns:
+        int: Количество встреч в каталоге
+    """
+    catalog = ResultsCatalog(results_dir)
+    catalog.clear()
+
+    for filepath in sorted(glob.glob(os.path.join(results_dir, "transcript_*.txt"))):
+        meeting_id = os.path.basename(filepath)[len("transcript_"):-len(".txt")]
+        try:
+            catalog.record_transcript(meeting_id, read_transcript(filepath), filepath)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Пропущен файл {filepath}: {e}")
+
+    for filepath in sorted(glob.glob(os.path.join(results_dir, "summary_*.txt"))):
+        meeting_id = os.path.basename(filepath)[len("summary_"):-len(".txt")]
+        try:
+            catalog.record_summary(meeting_id, read_summary_header(filepath), filepath)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Пропущен файл {filepath}: {e}")
+
+    catalog.optimize()
+    count = catalog.count()
+    logger.info(f"Каталог результатов перестроен: встреч {count}")
+    return count
@@ -0,0 +1,122 @@
+"""
+Кольцевой буфер аудио сэмплов.
+
+Предоставляет предвыделенный lock-free буфер для передачи
+аудио между callback-потоком устройства и потребителем.
+"""
+
+from typing import Optional
+import numpy as np
+
+
+class AudioRingBuffer:
+    """
+    Кольцевой буфер float32 сэмплов с одним писателем и одним читателем.
+
+    Память выделяется один раз при создании. Писатель меняет только
+    позицию записи, читатель - только позицию чтения, поэтому при
+    одном производителе и одном потребителе блокировки не нужны:
+    позиция публикуется после копирования данных.
+
+    Если свободного места не хватает, новые сэмплы отбрасываются,
+    а событие учитывается в счетчиках переполнения.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Инициализирует буфер.
+
+        Args:
+            capacity: Емкость буфера в сэмплах
+            dtype: Тип сэмплов
+        """
+        if capacity <= 0:
+            raise ValueError("Емкость буфера должна быть положительной")
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+        self.overflow_count = 0
+        self.dropped_samples = 0
+
+    @property
+    def available(self) -> int:
+        """Количество сэмплов, доступных для чтения"""
+        return self._write_pos - self._read_pos
+
+    @property
+    def free(self) -> int:
+        """Количество свободных сэмплов"""
+        return self.capacity - self.available
+
+    @property
+    def fill_level(self) -> float:
+        """Заполненность буфера от 0.0 до 1.0"""
+        return self.available / self.capacity
+
+    @property
+    def total_written(self) -> int:
+        """Общее количество записанных сэмплов"""
+        return self._write_pos
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Записывает сэмплы в буфер (вызывается только писателем).
+
+        Args:
+            samples: Одномерный массив сэмплов
+
+        Returns:
+            int: Количество записанных сэмплов
+        """
+        n = len(samples)
+        free = self.free
+        if n > free:
+            self.overflow_count += 1
+            self.dropped_samples += n - free
+            n = free
+        if n == 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(n, self.capacity - start)
+        self._buffer[start:start + first] = samples[:first]
+        if first < n:
+            self._buffer[:n - first] = samples[first:n]
+
+        self._write_pos += n
+        return n
+
+    def read(self, n: int, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        Читает ровно n сэмплов (вызывается только читателем).
+
+        Args:
+            n: Количество сэмплов
+            out: Массив для записи результата (опционально)
+
+        Returns:
+            Optional[np.ndarray]: Прочитанные сэмплы или None, если данных недостаточно
+        """
+        if self.available < n:
+            return None
+        if out is None:
+            out = np.empty(n, dtype=self._buffer.dtype)
+
+        start = self._read_pos % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._buffer[start:start + first]
+        if first < n:
+            out[first:n] = self._buffer[:n - first]
+
+        self._read_pos += n
+        return out[:n]
+
+    def read_available(self) -> np.ndarray:
+        """
+        Читает все доступные сэмплы.
+
+        Returns:
+            np.ndarray: Прочитанные сэмплы (возможно пустой массив)
+        """
+        return self.read(self.available)
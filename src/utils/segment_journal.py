@@ -0,0 +1,192 @@
+"""
+Журнал сегментов встречи.
+
+Во время встречи каждый сегмент дописывается строкой JSON в файл
+журнала, чтобы при сбое или принудительном завершении процесса
+транскрипцию можно было восстановить. Сброс на диск (fsync)
+выполняется по настраиваемой политике и по умолчанию идет
+в фоновом потоке, не задерживая транскрибирование.
+"""
+
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+from typing import List, Optional
+from config.settings import settings
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+FSYNC_POLICIES = ("always", "interval", "never")
+
+def segment_to_record(segment: TranscriptSegment) -> dict:
+    """Представляет сегмент записью журнала"""
+    return {
+        "type": "segment",
+        "start_time": segment.start_time,
+        "end_time": segment.end_time,
+        "text": segment.text,
+        "speaker": segment.speaker,
+    }
+
+def segment_from_record(record: dict) -> TranscriptSegment:
+    """Восстанавливает сегмент из записи журнала"""
+    return TranscriptSegment(
+        start_time=record["start_time"],
+        end_time=record["end_time"],
+        text=record["text"],
+        speaker=record.get("speaker")
+    )
+
+class SegmentJournal:
+    """
+    Журнал сегментов в формате JSONL.
+
+    Первая строка описывает встречу, каждая следующая - сегмент.
+    Запись сбрасывается в ОС сразу (переживает аварийное завершение
+    процесса), а на диск - по политике fsync_policy.
+    """
+
+    def __init__(
+        self,
+        meeting_id: str,
+        created_at: datetime,
+        journal_dir: Optional[str] = None,
+        fsync_policy: Optional[str] = None,
+        fsync_interval: Optional[float] = None
+    ):
+        """
+        Создает журнал встречи и запускает фоновый сброс на диск.
+
+        Args:
+            meeting_id: Идентификатор встречи
+            created_at: Время начала встречи
+            journal_dir: Папка журналов (по умолчанию JOURNAL_DIR)
+            fsync_policy: always, interval или never (по умолчанию JOURNAL_FSYNC_POLICY)
+            fsync_interval: Период фонового сброса (по умолчанию JOURNAL_FSYNC_INTERVAL_SECONDS)
+
+        Raises:
+            ValueError: Если политика сброса неизвестна
+        """
+        self.fsync_policy = fsync_policy or settings.JOURNAL_FSYNC_POLICY
+        if self.fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Неизвестная политика сброса журнала: {self.fsync_policy}")
+        self.fsync_interval = fsync_interval or settings.JOURNAL_FSYNC_INTERVAL_SECONDS
+        journal_dir = journal_dir or settings.JOURNAL_DIR
+        os.makedirs(journal_dir, exist_ok=True)
+        self.path = os.path.join(journal_dir, f"journal_{meeting_id}.jsonl")
+
+        self.fsync_count = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._closed = threading.Event()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._write({"type": "meeting", "meeting_id": meeting_id, "created_at": created_at.isoformat()})
+        self._sync()
+
+        self._syncer = None
+        if self.fsync_policy == "interval":
+            self._syncer = threading.Thread(target=self._run, name="journal-fsync", daemon=True)
+            self._syncer.start()
+
+    def append(self, segment: TranscriptSegment):
+        """
+        Дописывает сегмент в журнал.
+
+        Args:
+            segment: Новый сегмент транскрипции
+        """
+        self._write(segment_to_record(segment))
+        if self.fsync_policy == "always":
+            self._sync()
+
+    def _write(self, record: dict):
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            self._dirty = True
+
+    def _sync(self):
+        """Сбрасывает записанное на диск, если есть что сбрасывать"""
+        with self._lock:
+            if not self._dirty or self._file.closed:
+                return
+            self._dirty = False
+            fileno = self._file.fileno()
+        # fsync вне блокировки, чтобы не задерживать append
+        os.fsync(fileno)
+        self.fsync_count += 1
+
+    def _run(self):
+        """Цикл фонового сброса на диск"""
+        while not self._closed.wait(self.fsync_interval):
+            try:
+                self._sync()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ошибка сброса журнала на диск: {e}")
+
+    def close(self):
+        """Сбрасывает журнал на диск и закрывает файл"""
+        self._closed.set()
+        if self._syncer is not None:
+            self._syncer.join()
+        if self.fsync_policy != "never":
+            self._sync()
+        with self._lock:
+            self._file.close()
+
+    def remove(self):
+        """Закрывает и удаляет журнал после сохранения транскрипции"""
+        if not self._file.closed:
+            self.close()
+        os.remove(self.path)
+
+def read_journal(path: str):
+    """
+    Восстанавливает транскрипцию из журнала.
+
+    Недописанная последняя строка (сбой во время записи) пропускается.
+
+    Args:
+        path: Путь к файлу журнала
+
+    Returns:
+        tuple: (идентификатор встречи, MeetingTranscript)
+
+    Raises:
+        ValueError: Если файл не является журналом встречи
+    """
+    meeting_id = None
+    created_at = None
+    segments: List[TranscriptSegment] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("type") == "meeting":
+                meeting_id = record["meeting_id"]
+                created_at = datetime.fromisoformat(record["created_at"])
+            elif record.get("type") == "segment":
+                segments.append(segment_from_record(record))
+
+    if meeting_id is None:
+        raise ValueError(f"Не журнал встречи: {path}")
+    duration = max((segment.end_time for segment in segments), default=0.0)
+    return meeting_id, MeetingTranscript(segments=segments, created_at=created_at, duration=duration)
+
+def find_journals(journal_dir: Optional[str] = None) -> List[str]:
+    """
+    Находит журналы незавершенных встреч.
+
+    Args:
+        journal_dir: Папка журналов (по умолчанию JOURNAL_DIR)
+
+    Returns:
+        List[str]: Отсортированный список путей
+    """
+    return sorted(glob.glob(os.path.join(journal_dir or settings.JOURNAL_DIR, "journal_*.jsonl")))
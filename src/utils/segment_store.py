@@ -0,0 +1,81 @@
+"""
+Хранилище сегментов встречи с ограниченной памятью.
+
+В памяти держится только окно последних сегментов, более ранние
+сегменты выгружаются во временный файл. Перебор возвращает все
+сегменты по порядку, читая выгруженные с диска.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from collections import deque
+from typing import Iterator, List, Optional
+from config.settings import settings
+from src.models.transcript import TranscriptSegment
+from src.utils.segment_journal import segment_from_record, segment_to_record
+
+class SpillingSegmentStore:
+    """
+    Список сегментов, выгружающий старые сегменты на диск.
+
+    Поддерживает append, len и перебор, поэтому заменяет список
+    сегментов в MeetingController в режиме ограниченной памяти.
+    """
+
+    def __init__(self, window: Optional[int] = None, spill_dir: Optional[str] = None):
+        """
+        Создает хранилище и временный файл выгрузки.
+
+        Args:
+            window: Сколько последних сегментов держать в памяти (по умолчанию MEMORY_SEGMENT_WINDOW)
+            spill_dir: Папка временного файла (по умолчанию системная)
+        """
+        self.window = window or settings.MEMORY_SEGMENT_WINDOW
+        self._recent = deque()
+        self._spilled = 0
+        self._lock = threading.Lock()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+        handle, self.path = tempfile.mkstemp(prefix="segments_", suffix=".jsonl", dir=spill_dir)
+        self._file = os.fdopen(handle, "w", encoding="utf-8")
+
+    def append(self, segment: TranscriptSegment):
+        """
+        Добавляет сегмент; самый старый сегмент окна выгружается на диск.
+
+        Args:
+            segment: Новый сегмент
+        """
+        with self._lock:
+            self._recent.append(segment)
+            if len(self._recent) > self.window:
+                self._file.write(json.dumps(segment_to_record(self._recent.popleft()), ensure_ascii=False) + "\n")
+                self._spilled += 1
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._recent)
+
+    def __iter__(self) -> Iterator[TranscriptSegment]:
+        with self._lock:
+            self._file.flush()
+            spilled = self._spilled
+            recent = list(self._recent)
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for _, line in zip(range(spilled), f):
+                yield segment_from_record(json.loads(line))
+        yield from recent
+
+    def recent(self) -> List[TranscriptSegment]:
+        """Сегменты, находящиеся в памяти"""
+        with self._lock:
+            return list(self._recent)
+
+    def close(self):
+        """Закрывает и удаляет файл выгрузки"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                os.remove(self.path)
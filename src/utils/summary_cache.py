@@ -0,0 +1,225 @@
+"""
+Дисковый кэш сгенерированных саммари.
+
+Ключ записи - хэш нормализованного промпта (шаблон вместе с текстом
+транскрипции или фрагмента), идентификатора файла модели и параметров
+генерации, поэтому повторная суммаризация той же транскрипции
+(например, после сбоя) не требует обращения к LLM. Кэш ограничен
+по размеру и возрасту записей и вытесняет давно не использованные записи.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Optional
+from config.settings import settings
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Файл счетчиков попаданий и промахов
+STATS_FILE = "stats.json"
+
+# Расширение файлов записей
+ENTRY_SUFFIX = ".txt"
+
+_stats_lock = threading.Lock()
+
+def normalize_text(text: str) -> str:
+    """
+    Нормализует текст для ключа кэша: схлопывает пробельные символы.
+
+    Args:
+        text: Исходный текст
+
+    Returns:
+        str: Нормализованный текст
+    """
+    return " ".join(text.split())
+
+def model_identity(model_path: str) -> str:
+    """
+    Идентифицирует файл модели без чтения его содержимого.
+
+    Args:
+        model_path: Путь к файлу модели
+
+    Returns:
+        str: Имя, размер и время изменения файла (или только имя, если файла нет)
+    """
+    name = os.path.basename(model_path)
+    try:
+        stat = os.stat(model_path)
+    except OSError:
+        return name
+    return f"{name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+class SummaryCache:
+    """
+    Кэш саммари на диске.
+
+    Каждая запись хранится отдельным файлом с именем по ключу.
+    Время изменения файла обновляется при попадании и служит
+    временем последнего использования для вытеснения (LRU).
+    Счетчики попаданий и промахов сохраняются в каталоге кэша.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        max_age_seconds: Optional[float] = None
+    ):
+        """
+        Инициализирует кэш.
+
+        Args:
+            cache_dir: Каталог кэша (по умолчанию SUMMARY_CACHE_DIR)
+            max_bytes: Максимальный размер записей (по умолчанию SUMMARY_CACHE_MAX_MB)
+            max_age_seconds: Максимальное время без обращений (по умолчанию SUMMARY_CACHE_MAX_AGE_DAYS)
+        """
+        self.cache_dir = cache_dir or settings.SUMMARY_CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else settings.SUMMARY_CACHE_MAX_MB * 1024 * 1024
+        self.max_age_seconds = (
+            max_age_seconds if max_age_seconds is not None
+            else settings.SUMMARY_CACHE_MAX_AGE_DAYS * 24 * 3600
+        )
+
+    @staticmethod
+    def make_key(prompt: str, model_id: str, **params) -> str:
+        """
+        Вычисляет ключ записи.
+
+        Args:
+            prompt: Промпт (шаблон с подставленным текстом)
+            model_id: Идентификатор файла модели
+            **params: Параметры генерации
+
+        Returns:
+            str: SHA-256 в шестнадцатеричном виде
+        """
+        payload = json.dumps(
+            {"prompt": normalize_text(prompt), "model": model_id, "params": params},
+            ensure_ascii=False,
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Возвращает сохраненное саммари.
+
+        Args:
+            key: Ключ записи
+
+        Returns:
+            Optional[str]: Саммари или None при промахе
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = f.read()
+            os.utime(path)
+        except OSError:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return value
+
+    def put(self, key: str, value: str):
+        """
+        Сохраняет саммари и вытесняет лишние записи.
+
+        Args:
+            key: Ключ записи
+            value: Саммари
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(value)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Удаляет устаревшие записи и самые давно использованные сверх лимита размера.
+
+        Returns:
+            int: Количество удаленных записей
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []:
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        entries.sort()
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if total <= self.max_bytes and now - mtime <= self.max_age_seconds:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logger.debug(f"Из кэша саммари вытеснено записей: {removed}")
+        return removed
+
+    def stats(self) -> dict:
+        """
+        Возвращает состояние кэша.
+
+        Returns:
+            dict: Количество и размер записей, попадания и промахи
+        """
+        counters = self._read_counters()
+        entries = 0
+        size = 0
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(ENTRY_SUFFIX):
+                    entries += 1
+                    size += os.path.getsize(os.path.join(self.cache_dir, name))
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": counters.get("hits", 0),
+            "misses": counters.get("misses", 0),
+        }
+
+    def _read_counters(self) -> dict:
+        try:
+            with open(os.path.join(self.cache_dir, STATS_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _count(self, counter: str):
+        """Увеличивает сохраненный счетчик попаданий или промахов"""
+        with _stats_lock:
+            counters = self._read_counters()
+            counters[counter] = counters.get(counter, 0) + 1
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, STATS_FILE)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(counters, f)
+            os.replace(tmp_path, path)
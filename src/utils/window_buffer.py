@@ -0,0 +1,87 @@
+"""
+Буфер окна аудио сэмплов.
+
+Предоставляет предвыделенный буфер для накопления окна
+перед транскрибированием без перевыделения памяти.
+"""
+
+import numpy as np
+
+
+class SampleWindowBuffer:
+    """
+    Предвыделенный буфер окна с курсором записи.
+
+    Чанки копируются в уже выделенный массив, а окно отдается
+    как view без копирования. Буфер переиспользуется между окнами.
+    """
+
+    def __init__(self, capacity: int, dtype=np.float32):
+        """
+        Инициализирует буфер.
+
+        Args:
+            capacity: Размер окна в сэмплах
+            dtype: Тип сэмплов
+        """
+        if capacity <= 0:
+            raise ValueError("Размер окна должен быть положительным")
+        self.capacity = capacity
+        self._buffer = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    @property
+    def free(self) -> int:
+        """Количество свободных сэмплов в окне"""
+        return self.capacity - self.size
+
+    @property
+    def is_full(self) -> bool:
+        """Заполнено ли окно полностью"""
+        return self.size == self.capacity
+
+    def append(self, samples: np.ndarray) -> int:
+        """
+        Дописывает сэмплы в окно, сколько помещается.
+
+        Args:
+            samples: Одномерный массив сэмплов
+
+        Returns:
+            int: Количество записанных сэмплов
+        """
+        n = min(len(samples), self.free)
+        self._buffer[self.size:self.size + n] = samples[:n]
+        self.size += n
+        return n
+
+    def view(self) -> np.ndarray:
+        """
+        Возвращает заполненную часть окна без копирования.
+
+        View действителен до следующего изменения буфера.
+
+        Returns:
+            np.ndarray: View на накопленные сэмплы
+        """
+        return self._buffer[:self.size]
+
+    def consume(self, n: int):
+        """
+        Удаляет первые n сэмплов, сдвигая остаток в начало буфера.
+
+        Используется для перекрывающихся окон: хвост окна
+        остается в буфере и становится началом следующего.
+
+        Args:
+            n: Количество удаляемых сэмплов
+        """
+        n = min(n, self.size)
+        rest = self.size - n
+        if rest:
+            self._buffer[:rest] = self._buffer[n:self.size]
+        self.size = rest
+
+    def clear(self):
+        """Сбрасывает курсор записи"""
+        self.size = 0
@@ -0,0 +1,134 @@
+import threading
+import time
+import numpy as np
+import pytest
+from src.services.batch_decoder import BatchedWhisperDecoder
+
+SAMPLE_RATE = 16000
+
+class RecordingBackend:
+    """Имитация декодера батча: результат - длина окна, запоминает размеры батчей"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+        self.batches = []
+
+    def __call__(self, windows):
+        self.batches.append(len(windows))
+        time.sleep(self.seconds)
+        return [{"text": str(len(window)), "segments": []} for window in windows]
+
+def _rooms(decoder, count, windows_per_room):
+    results = {}
+    # Все встречи подключаются до первого окна
+    rooms = [decoder.client() for _ in range(count)]
+
+    def room(index):
+        with rooms[index] as client:
+            results[index] = [
+                client.transcribe(np.zeros(1000 * (index + 1) + i, dtype=np.float32))["text"]
+                for i in range(windows_per_room)
+            ]
+
+    clients = [threading.Thread(target=room, args=(i,)) for i in range(count)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return results
+
+def test_windows_of_concurrent_rooms_are_batched():
+    """Тест: окна нескольких встреч декодируются общими батчами и возвращаются своим встречам"""
+    backend = RecordingBackend(seconds=0.02)
+    decoder = BatchedWhisperDecoder(backend=backend, max_batch=8, max_wait_seconds=1.0)
+
+    results = _rooms(decoder, 4, 5)
+    decoder.close()
+
+    assert results == {i: [str(1000 * (i + 1) + j) for j in range(5)] for i in range(4)}
+    assert sum(backend.batches) == 20
+    assert max(backend.batches) == 4
+    assert decoder.stats()["batch_avg"] > 2
+
+def test_single_room_is_not_delayed():
+    """Тест: единственная встреча не ждет дедлайна батча"""
+    decoder = BatchedWhisperDecoder(backend=RecordingBackend(), max_wait_seconds=5.0)
+
+    started = time.monotonic()
+    _rooms(decoder, 1, 3)
+
+    assert time.monotonic() - started < 1.0
+    decoder.close()
+
+def test_deadline_bounds_latency():
+    """Тест: батч запускается по дедлайну, если остальные встречи молчат"""
+    backend = RecordingBackend()
+    decoder = BatchedWhisperDecoder(backend=backend, max_wait_seconds=0.1)
+    idle = decoder.client()
+    active = decoder.client()
+
+    started = time.monotonic()
+    active.transcribe(np.zeros(10, dtype=np.float32))
+    waited = time.monotonic() - started
+
+    assert 0.1 <= waited < 1.0
+    assert backend.batches == [1]
+    idle.close()
+    active.close()
+    decoder.close()
+
+def test_backend_error_reaches_every_room():
+    """Тест: ошибка декодирования батча передается всем встречам батча"""
+    def broken(windows):
+        raise RuntimeError("сбой")
+
+    decoder = BatchedWhisperDecoder(backend=broken, max_wait_seconds=0.0)
+    with pytest.raises(RuntimeError):
+        decoder.client().transcribe(np.zeros(10, dtype=np.float32))
+    decoder.close()
+    with pytest.raises(RuntimeError):
+        decoder.submit(np.zeros(10, dtype=np.float32))
+
+def test_tiny_whisper_batch_matches_single_windows():
+    """Тест на маленькой случайной модели Whisper: батч дает те же результаты, что окна по одному"""
+    torch = pytest.importorskip("torch")
+    whisper = pytest.importorskip("whisper")
+    from whisper.model import ModelDimensions, Whisper
+    from src.services.batch_decoder import WhisperBatchBackend
+
+    torch.manual_seed(0)
+    dims = ModelDimensions(
+        n_mels=80, n_audio_ctx=1500, n_audio_state=64, n_audio_head=2, n_audio_layer=1,
+        n_vocab=51865, n_text_ctx=448, n_text_state=64, n_text_head=2, n_text_layer=1
+    )
+    model = Whisper(dims).eval()
+    backend = WhisperBatchBackend(model, max_tokens=8)
+    rng = np.random.default_rng(0)
+    windows = [
+        (0.1 * np.sin(2 * np.pi * 220 * (i + 1) * np.arange(seconds * SAMPLE_RATE) / SAMPLE_RATE)
+         + 0.01 * rng.standard_normal(seconds * SAMPLE_RATE)).astype(np.float32)
+        for i, seconds in enumerate((2, 5, 3))
+    ]
+
+    mel = backend.log_mel(windows)
+    for window, row in zip(windows, mel):
+        single = whisper.log_mel_spectrogram(torch.from_numpy(window), padding=whisper.audio.N_SAMPLES)
+        assert torch.allclose(row, single[:, :row.shape[-1]], atol=1e-4)
+
+    decoder = BatchedWhisperDecoder(backend=backend, max_wait_seconds=0.5)
+    batched = [None] * len(windows)
+
+    def room(index):
+        with decoder.client() as client:
+            batched[index] = client.transcribe(windows[index])
+
+    threads = [threading.Thread(target=room, args=(i,)) for i in range(len(windows))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    decoder.close()
+
+    assert [backend([window])[0]["text"] for window in windows] == [result["text"] for result in batched]
+    assert all(segment["end"] <= len(window) / SAMPLE_RATE for window, result in zip(windows, batched)
+               for segment in result["segments"])
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+from tests.test_file_audio_source import _write_wav
+from tests.test_offline_transcriber import load_fake_model
+from src.services.batch_processor import BatchProcessor, JobLedger, STAGE_SUMMARIZED
+from src.utils.results_writer import read_transcript
+
+class EchoSummaryService:
+    def summarize(self, text):
+        return f"саммари: {text}"
+
+    def summarize_transcript(self, transcript):
+        return self.summarize(transcript.get_full_text())
+
+def _make_recordings(directory, count):
+    rate = 16000
+    for i in range(count):
+        tone = 0.3 * np.sin(2 * np.pi * (200 + i) * np.arange(rate) / rate)
+        _write_wav(directory / f"meeting_{i}.wav", np.concatenate([np.zeros(rate), tone]), rate)
+
+def test_batch_processes_once_and_skips_on_rerun(tmp_path):
+    """Тест пакетной обработки и пропуска обработанных записей"""
+    recordings = tmp_path / "recordings"
+    recordings.mkdir()
+    _make_recordings(recordings, 3)
+    results = tmp_path / "results"
+
+    def make_processor():
+        return BatchProcessor(
+            transcribe_workers=2,
+            summary_workers=1,
+            results_dir=str(results),
+            summary_service_factory=EchoSummaryService,
+            model_loader=load_fake_model
+        )
+
+    stats = make_processor().run(str(recordings))
+    assert stats["summarized"] == 3
+
+    ledger = JobLedger(str(results / "batch_ledger.jsonl"))
+    jobs = list(ledger.jobs.values())
+    assert all(job["stage"] == STAGE_SUMMARIZED for job in jobs)
+    transcript = read_transcript(jobs[0]["transcript_path"])
+    assert transcript.segments[0].start_time == 1.0
+    assert os.path.exists(jobs[0]["summary_path"])
+
+    assert make_processor().run(str(recordings))["skipped"] == 3
+
+def test_batch_resumes_from_transcribed_stage(tmp_path):
+    """Тест продолжения обработки с сохраненной стадии"""
+    recordings = tmp_path / "recordings"
+    recordings.mkdir()
+    _make_recordings(recordings, 2)
+    results = str(tmp_path / "results")
+
+    first = BatchProcessor(2, 0, results, model_loader=load_fake_model).run(str(recordings))
+    second = BatchProcessor(2, 1, results, EchoSummaryService, load_fake_model).run(str(recordings))
+
+    assert first["transcribed"] == 2
+    assert second["transcribed"] == 0
+    assert second["summarized"] == 2
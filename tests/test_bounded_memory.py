@@ -0,0 +1,82 @@
+import os
+import pytest
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import TranscriptProcessor
+
+try:
+    from src.controllers.meeting_controller import MeetingController
+    from src.services.hierarchical_summary import HierarchicalSummaryService
+except (ImportError, OSError) as e:
+    pytest.skip(f"зависимости контроллера не доступны: {e}", allow_module_level=True)
+
+# Восемь часов встречи сегментами по 3 секунды
+HOURS = 8
+SEGMENT_SECONDS = 3
+SEGMENTS_PER_HOUR = 3600 // SEGMENT_SECONDS
+
+# Допустимый рост RSS после первого часа
+MAX_GROWTH_BYTES = 4 * 1024 * 1024
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+class FakeAudio:
+    def start_capture(self):
+        return iter(())
+
+    def stop_capture(self):
+        pass
+
+class FakeSTT:
+    """Имитация STT: восемь часов речи без аудио, с замером RSS каждый час"""
+
+    def __init__(self):
+        self.rss = []
+
+    def transcribe_stream(self, audio_stream):
+        for i in range(HOURS * SEGMENTS_PER_HOUR):
+            if i % SEGMENTS_PER_HOUR == 0:
+                self.rss.append(_rss_bytes())
+            words = " ".join(f"обсуждение{i}_{j}" for j in range(30))
+            yield TranscriptSegment(i * SEGMENT_SECONDS, (i + 1) * SEGMENT_SECONDS, words)
+        self.rss.append(_rss_bytes())
+
+class WordModel:
+    """Имитация LLM: токен - слово, ответ - первые слова текста промпта"""
+
+    model = True
+    last_metrics = None
+
+    def tokenize(self, text):
+        return text.split()
+
+    def detokenize(self, tokens):
+        return " ".join(tokens)
+
+    def generate(self, prompt, max_new_tokens=None):
+        return " ".join(prompt.split("\n\n")[1].split()[:max_new_tokens // 4])
+
+    def generate_stream(self, prompt, max_new_tokens=None):
+        for word in self.generate(prompt, max_new_tokens).split():
+            yield f" {word}"
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="нужен /proc")
+def test_eight_hour_meeting_keeps_rss_flat(tmp_path, monkeypatch):
+    """Тест режима ограниченной памяти: RSS не растет с длительностью встречи"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("config.settings.settings.JOURNAL_DIR", str(tmp_path / "journal"))
+    stt = FakeSTT()
+    summary = HierarchicalSummaryService([WordModel()], context_tokens=2048, map_max_tokens=64, final_max_tokens=128)
+    controller = MeetingController(
+        FakeAudio(), stt, summary, TranscriptProcessor(),
+        pipeline_enabled=False, memory_bounded=True
+    )
+
+    controller.start_meeting()
+
+    growth = max(stt.rss[1:]) - stt.rss[1]
+    assert growth < MAX_GROWTH_BYTES, [rss // 1024 for rss in stt.rss]
+    results = sorted(os.listdir(tmp_path / "results"))
+    assert any(name.startswith("transcript_") for name in results)
+    assert any(name.startswith("summary_") for name in results)
@@ -0,0 +1,59 @@
+import threading
+import pytest
+from queue import Empty
+from src.utils.bounded_queue import BoundedQueue, QueueClosed
+
+def test_drop_oldest_policy_keeps_newest_items():
+    """Тест политики drop_oldest"""
+    queue = BoundedQueue(2, policy="drop_oldest")
+    for item in range(4):
+        queue.put(item)
+
+    assert list(queue._items) == [2, 3]
+    assert queue.stats()["dropped"] == 2
+
+def test_block_policy_applies_backpressure():
+    """Тест ожидания писателя при заполненной очереди"""
+    queue = BoundedQueue(1, policy="block")
+    queue.put(1)
+    assert queue.put(2, timeout=0.01) is False
+
+    reader = threading.Timer(0.05, queue.get)
+    reader.start()
+    assert queue.put(3, timeout=1.0) is True
+    assert queue.stats()["put_wait_seconds"] > 0
+
+def test_close_drains_remaining_items():
+    """Тест дочитывания очереди после закрытия"""
+    queue = BoundedQueue(4)
+    queue.put("a")
+    queue.close()
+
+    assert queue.put("b") is False
+    assert list(queue) == ["a"]
+    with pytest.raises(QueueClosed):
+        queue.get()
+
+def test_get_timeout_raises_empty():
+    """Тест таймаута чтения из пустой очереди"""
+    with pytest.raises(Empty):
+        BoundedQueue(1).get(timeout=0.01)
+
+def test_coalesce_policy_merges_into_last_item():
+    """Тест политики coalesce: новый элемент объединяется с последним"""
+    queue = BoundedQueue(2, policy="coalesce", coalesce=lambda last, new: last + new)
+    for item in ["a", "b", "c", "d"]:
+        queue.put(item)
+
+    assert list(queue._items) == ["a", "bcd"]
+    assert queue.stats()["coalesced"] == 2
+    assert queue.stats()["dropped"] == 0
+
+def test_coalesce_policy_drops_oldest_when_items_do_not_merge():
+    """Тест политики coalesce для несовместимых элементов"""
+    queue = BoundedQueue(2, policy="coalesce", coalesce=lambda last, new: None)
+    for item in range(3):
+        queue.put(item)
+
+    assert list(queue._items) == [1, 2]
+    assert queue.stats()["dropped"] == 1
@@ -0,0 +1,108 @@
+import asyncio
+import json
+import time
+from src.models.transcript import TranscriptSegment
+from src.observers.broadcast_observer import BroadcastTranscriptObserver
+
+# Подписчиков в нагрузочном тесте
+CLIENTS = 300
+
+async def _connect(port, headers="", query=""):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET /events{query} HTTP/1.1\r\nHost: localhost\r\n{headers}\r\n".encode())
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200")
+    return reader, writer
+
+async def _read_events(reader, until_event="end"):
+    """Читает события до события until_event и возвращает [(тип, данные)]"""
+    events = []
+    while True:
+        block = (await reader.readuntil(b"\n\n")).decode("utf-8")
+        if block.startswith(":"):
+            continue
+        fields = dict(line.split(": ", 1) for line in block.strip().split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+        if fields["event"] == until_event:
+            return events
+
+def _wait_subscribers(observer, count):
+    deadline = time.monotonic() + 10
+    while len(observer.subscribers) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(observer.subscribers) == count
+
+def test_hundreds_of_subscribers_receive_all_segments():
+    """Нагрузочный тест: сотни локальных подписчиков получают все сегменты и саммари"""
+    observer = BroadcastTranscriptObserver(host="127.0.0.1", port=0)
+    observer.start()
+
+    async def scenario():
+        clients = [await _connect(observer.port) for _ in range(CLIENTS)]
+        await asyncio.get_running_loop().run_in_executor(None, _wait_subscribers, observer, CLIENTS)
+        for i in range(50):
+            observer.on_new_segment(TranscriptSegment(i, i + 1, f"фраза {i}", "Анна"))
+        observer.on_summary_token("Итог")
+        await asyncio.get_running_loop().run_in_executor(None, observer.stop)
+        results = await asyncio.gather(*(_read_events(reader) for reader, _ in clients))
+        for _, writer in clients:
+            writer.close()
+        return results
+
+    results = asyncio.run(scenario())
+
+    for events in results:
+        segments = [data for kind, data in events if kind == "segment"]
+        assert [data["index"] for data in segments] == list(range(50))
+        assert segments[7]["text"] == "фраза 7" and segments[7]["speaker"] == "Анна"
+        assert ("summary", {"token": "Итог"}) in events
+    assert observer.connections == CLIENTS
+    assert observer.slow_disconnects == 0
+
+def test_reconnect_replays_from_offset():
+    """Тест повтора сегментов по Last-Event-ID и параметру offset"""
+    observer = BroadcastTranscriptObserver(host="127.0.0.1", port=0)
+    observer.start()
+    for i in range(10):
+        observer.on_new_segment(TranscriptSegment(i, i + 1, f"фраза {i}"))
+
+    async def scenario():
+        by_header = await _connect(observer.port, headers="Last-Event-ID: 6\r\n")
+        by_query = await _connect(observer.port, query="?offset=8")
+        await asyncio.get_running_loop().run_in_executor(None, observer.stop)
+        events = await _read_events(by_header[0]), await _read_events(by_query[0])
+        by_header[1].close()
+        by_query[1].close()
+        return events
+
+    by_header, by_query = asyncio.run(scenario())
+
+    assert [data["index"] for kind, data in by_header if kind == "segment"] == [7, 8, 9]
+    assert [data["index"] for kind, data in by_query if kind == "segment"] == [8, 9]
+
+def test_slow_client_is_dropped_without_blocking_others():
+    """Тест: клиент, не читающий поток, отключается, остальные получают все события"""
+    observer = BroadcastTranscriptObserver(host="127.0.0.1", port=0, client_queue_size=16)
+    observer.start()
+    text = "слово " * 5000
+
+    async def scenario():
+        slow = await _connect(observer.port)
+        fast = await _connect(observer.port)
+        await asyncio.get_running_loop().run_in_executor(None, _wait_subscribers, observer, 2)
+        reading = asyncio.ensure_future(_read_events(fast[0]))
+        for i in range(300):
+            observer.on_new_segment(TranscriptSegment(i, i + 1, text))
+            if i % 4 == 0:
+                await asyncio.sleep(0.01)
+        await asyncio.get_running_loop().run_in_executor(None, observer.stop)
+        events = await asyncio.wait_for(reading, 10)
+        slow[1].close()
+        fast[1].close()
+        return events
+
+    events = asyncio.run(scenario())
+
+    assert len([kind for kind, _ in events if kind == "segment"]) == 300
+    assert observer.slow_disconnects == 1
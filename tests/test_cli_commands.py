@@ -0,0 +1,37 @@
+from datetime import datetime
+import pytest
+from src.models.transcript import MeetingTranscript, TranscriptSegment
+from src.utils import results_writer
+import cli
+
+try:
+    from src.services import offline_transcriber
+except (ImportError, OSError) as e:
+    pytest.skip(f"Зависимости транскрибирования не доступны: {e}", allow_module_level=True)
+
+class FakeTranscriber:
+    """Имитация OfflineTranscriber: возвращает готовые сегменты"""
+
+    def __init__(self):
+        self.last_stats = {}
+
+    def transcribe_file(self, path):
+        self.last_stats = {"audio_seconds": 4.0, "elapsed_seconds": 1.0, "rtf": 0.25, "workers": 1}
+        return MeetingTranscript(
+            segments=[TranscriptSegment(0.0, 2.0, "э  двадцать пять"), TranscriptSegment(2.0, 4.0, " э ")],
+            created_at=datetime(2024, 3, 1, 10, 0, 0),
+            duration=4.0
+        )
+
+def test_transcribe_file_processes_and_saves_transcript(tmp_path, monkeypatch):
+    """Тест команды transcribe: сегменты обрабатываются и сохраняются"""
+    recording = tmp_path / "meeting.wav"
+    recording.write_bytes(b"")
+    saved = []
+    monkeypatch.setattr(offline_transcriber, "OfflineTranscriber", FakeTranscriber)
+    monkeypatch.setattr(results_writer, "save_transcript", saved.append)
+
+    cli.transcribe_file(str(recording), with_summary=False)
+
+    assert [[(s.text, s.speaker) for s in transcript.segments] for transcript in saved] == [[("25", "Спикер 1")]]
+    assert saved[0].duration == 4.0
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cli.py")
+
+# Бюджет импорта для команды list (микросекунды, сумма модулей верхнего уровня)
+IMPORT_BUDGET_US = 400_000
+
+# Модули, которые не должны загружаться командами просмотра результатов
+HEAVY_MODULES = ("torch", "whisper", "sounddevice", "ctransformers", "numpy", "tqdm")
+
+def _import_times(tmp_path, *args):
+    """Запускает CLI с -X importtime и возвращает {модуль: (уровень, накопленное время)}"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", CLI_PATH, *args],
+        cwd=tmp_path,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (depth, int(cumulative))
+    return modules
+
+def test_list_does_not_import_heavy_dependencies(tmp_path):
+    """Тест: list не загружает модели и аудио зависимости"""
+    modules = _import_times(tmp_path, "list")
+
+    loaded = [name for name in modules if name.split(".")[0] in HEAVY_MODULES]
+    assert not loaded
+
+def test_list_import_time_budget(tmp_path):
+    """Тест бюджета времени импорта команды list"""
+    modules = _import_times(tmp_path, "list")
+
+    total = sum(cumulative for depth, cumulative in modules.values() if depth == 0)
+    assert total < IMPORT_BUDGET_US, f"импорт занял {total / 1000:.0f} мс"
@@ -0,0 +1,94 @@
+import numpy as np
+from collections import Counter
+from src.models.transcript import TranscriptSegment
+from src.services.diarization import SpeakerDiarizer, speaker_embedding
+from src.services.stt_service import WhisperSTTService
+from src.services.transcript_processor import UNDIARIZED_SPEAKER, TranscriptProcessor
+
+SAMPLE_RATE = 16000
+
+# Форманты гласных (Гц): голос - основной тон и масштаб формант
+VOWELS = np.array([[730, 1090, 2440], [270, 2290, 3010], [300, 870, 2240], [530, 1840, 2480], [570, 840, 2410]])
+VOICES = [(110.0, 0.9), (165.0, 1.05), (240.0, 1.2)]
+
+def _voice(f0, scale, seconds, rng):
+    """Синтетическая речь: гармоники основного тона через формантные фильтры, смена гласных"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = f0 * (1 + 0.04 * np.sin(2 * np.pi * 5 * t + rng.uniform(0, 6)))
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    step = SAMPLE_RATE // 5
+    formants = VOWELS[rng.integers(0, len(VOWELS), len(t) // step + 1)].repeat(step, axis=0)[:len(t)] * scale
+    audio = np.zeros(len(t))
+    for k in range(1, 30):
+        gain = sum(np.exp(-0.5 * ((k * pitch - formants[:, j]) / 100) ** 2) / (j + 1) for j in range(3))
+        audio += gain / k * np.sin(k * phase)
+    audio *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)
+    return (audio / np.abs(audio).max() * 0.5).astype(np.float32)
+
+def _accuracy(labels, truth):
+    """Доля сегментов с верной меткой при лучшем соответствии меток спикерам"""
+    mapping = {}
+    for (label, speaker), _ in Counter(zip(labels, truth)).most_common():
+        if label not in mapping and speaker not in mapping.values():
+            mapping[label] = speaker
+    return sum(mapping.get(label) == speaker for label, speaker in zip(labels, truth)) / len(truth)
+
+def test_online_diarization_separates_synthetic_voices():
+    """Тест разметки трех синтетических голосов по ходу встречи"""
+    rng = np.random.default_rng(1)
+    truth = [int(rng.integers(0, len(VOICES))) for _ in range(45)]
+    diarizer = SpeakerDiarizer(sample_rate=SAMPLE_RATE)
+
+    labels = [diarizer.assign(_voice(*VOICES[speaker], rng.uniform(1.5, 3.5), rng)) for speaker in truth]
+
+    assert diarizer.speaker_count == len(VOICES)
+    assert _accuracy(labels, truth) >= 0.9
+    assert labels[0] == "Спикер 1"
+
+def test_short_region_keeps_previous_label():
+    """Тест: слишком короткий участок получает метку предыдущего"""
+    rng = np.random.default_rng(0)
+    diarizer = SpeakerDiarizer(sample_rate=SAMPLE_RATE, min_seconds=0.5)
+
+    assert diarizer.assign(np.zeros(100, dtype=np.float32)) is None
+    label = diarizer.assign(_voice(*VOICES[0], 2.0, rng))
+    assert diarizer.assign(_voice(*VOICES[2], 0.2, rng)) == label
+    assert speaker_embedding(np.zeros(100, dtype=np.float32), SAMPLE_RATE) is None
+
+class TwoVoiceModel:
+    """Имитация Whisper: первая половина окна - один сегмент, вторая - другой"""
+
+    def transcribe(self, audio, **kwargs):
+        half = len(audio) / 2 / SAMPLE_RATE
+        return {"text": "", "segments": [
+            {"start": 0.0, "end": half, "text": "первый"},
+            {"start": half, "end": 2 * half, "text": "второй"},
+        ]}
+
+def test_stt_labels_each_whisper_segment_by_its_audio():
+    """Тест разметки спикеров по звуку каждого сегмента Whisper"""
+    rng = np.random.default_rng(2)
+    windows = [np.concatenate([_voice(*VOICES[0], 2.5, rng), _voice(*VOICES[2], 2.5, rng)]) for _ in range(3)]
+    service = WhisperSTTService(
+        TwoVoiceModel(), window_seconds=5.0, hop_seconds=5.0, diarizer=SpeakerDiarizer(sample_rate=SAMPLE_RATE)
+    )
+
+    segments = list(service.transcribe_stream(iter(windows)))
+
+    assert [s.speaker for s in segments] == ["Спикер 1", "Спикер 2"] * 3
+
+def test_placeholder_speakers_only_for_unlabeled_segments():
+    """Тест: заглушка спикера не затирает метки диаризации"""
+    segments = [TranscriptSegment(0, 1, "да", "Спикер 3"), TranscriptSegment(1, 2, "нет")]
+
+    processed = TranscriptProcessor().process_segments(segments)
+
+    assert [s.speaker for s in processed] == ["Спикер 3", "Спикер 2"]
+
+def test_undiarized_segments_get_distinct_label_with_diarizer():
+    """Тест: при диаризации сегменты без метки не выдаются за реальных спикеров"""
+    segments = [TranscriptSegment(0, 1, "ага"), TranscriptSegment(1, 2, "начнем", "Спикер 1"), TranscriptSegment(2, 3, "да")]
+
+    processed = TranscriptProcessor(diarized=True).process_segments(segments)
+
+    assert [s.speaker for s in processed] == [UNDIARIZED_SPEAKER, "Спикер 1", UNDIARIZED_SPEAKER]
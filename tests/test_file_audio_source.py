@@ -0,0 +1,71 @@
+import wave
+import numpy as np
+from src.services.file_audio_source import WavFileAudioSource
+
+def _write_wav(path, samples, rate, channels=1):
+    pcm = (np.clip(samples, -1, 1) * 32767).astype("<i2")
+    if channels > 1:
+        pcm = np.repeat(pcm[:, None], channels, axis=1)
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(channels)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+
+def test_wav_source_resamples_stereo_to_target_rate(tmp_path):
+    """Тест чтения стерео 44.1 кГц с ресемплингом в 16 кГц"""
+    rate = 44100
+    t = np.arange(rate * 2) / rate
+    path = tmp_path / "tone.wav"
+    _write_wav(path, 0.5 * np.sin(2 * np.pi * 440 * t), rate, channels=2)
+
+    source = WavFileAudioSource(str(path), target_rate=16000)
+    audio = source.read(0, source.num_samples)
+
+    assert source.num_samples == 32000
+    assert abs(source.duration - 2.0) < 1e-6
+    spectrum = np.abs(np.fft.rfft(audio))
+    assert abs(np.argmax(spectrum) * 16000 / len(audio) - 440) < 2
+    assert sum(len(chunk) for chunk in source.iter_chunks(1000)) == 32000
+
+def test_split_points_fall_into_pauses(tmp_path):
+    """Тест разреза записи в паузах"""
+    rate = 16000
+    rng = np.random.default_rng(0)
+    tone = 0.3 * np.sin(2 * np.pi * 200 * np.arange(rate * 9) / rate)
+    silence = 0.001 * rng.standard_normal(rate)
+    path = tmp_path / "speech.wav"
+    _write_wav(path, np.concatenate([tone, silence, tone, silence, tone]), rate)
+
+    source = WavFileAudioSource(str(path), target_rate=rate)
+    points = source.find_split_points(chunk_seconds=10.0, search_seconds=2.0)
+
+    assert points[0] == 0 and points[-1] == source.num_samples
+    assert 9.0 <= points[1] / rate <= 10.0
+    assert 19.0 <= points[2] / rate <= 20.0
+
+def test_block_reads_have_no_seams(tmp_path):
+    """Тест: чтение блоками при ресемплинге не дает искажений на стыках"""
+    rate = 44100
+    path = tmp_path / "tone.wav"
+    _write_wav(path, 0.5 * np.sin(2 * np.pi * 437 * np.arange(rate * 3) / rate), rate)
+
+    source = WavFileAudioSource(str(path), target_rate=16000)
+    blocks = np.concatenate([source.read(start, start + 4001) for start in range(0, source.num_samples, 4001)])
+    expected = 0.5 * np.sin(2 * np.pi * 437 * np.arange(source.num_samples) / 16000)
+
+    # Края самой записи искажаются и при чтении целиком
+    inner = slice(800, -800)
+    assert np.max(np.abs(blocks[inner] - expected[inner])) < 1e-3
+
+def test_split_points_increase_with_wide_search_window(tmp_path):
+    """Тест: окно поиска шире фрагмента не дает точек разреза назад"""
+    rate = 16000
+    rng = np.random.default_rng(1)
+    path = tmp_path / "noise.wav"
+    _write_wav(path, 0.1 * rng.standard_normal(rate * 30), rate)
+
+    points = WavFileAudioSource(str(path), target_rate=rate).find_split_points(chunk_seconds=2.0, search_seconds=5.0)
+
+    assert points[0] == 0 and points[-1] == rate * 30
+    assert all(a < b for a, b in zip(points, points[1:]))
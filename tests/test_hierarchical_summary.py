@@ -0,0 +1,93 @@
+import threading
+import pytest
+from datetime import datetime
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+
+try:
+    from src.services.hierarchical_summary import HierarchicalSummaryService
+except ImportError as e:
+    pytest.skip(f"ctransformers не доступен: {e}", allow_module_level=True)
+
+class WordModel:
+    """Имитация LLM: токен - слово, ответ - первые слова текста промпта"""
+
+    model = True
+
+    def __init__(self, context_tokens):
+        self.context_tokens = context_tokens
+        self.prompts = []
+        self.threads = set()
+
+    def tokenize(self, text):
+        return text.split()
+
+    def detokenize(self, tokens):
+        return " ".join(tokens)
+
+    def generate(self, prompt, max_new_tokens=None):
+        assert len(self.tokenize(prompt)) + max_new_tokens <= self.context_tokens
+        self.prompts.append(prompt)
+        self.threads.add(threading.get_ident())
+        body = prompt.split("\n\n")[1].split()
+        return " ".join(body[:max_new_tokens // 4])
+
+def _transcript(segments, words_per_segment):
+    return MeetingTranscript(
+        segments=[
+            TranscriptSegment(i, i + 1, " ".join(f"w{i}_{j}" for j in range(words_per_segment)))
+            for i in range(segments)
+        ],
+        created_at=datetime.now(),
+        duration=float(segments)
+    )
+
+def test_short_transcript_uses_single_prompt():
+    """Тест короткой транскрипции без map-reduce"""
+    model = WordModel(context_tokens=512)
+    service = HierarchicalSummaryService([model], context_tokens=512, map_max_tokens=40, final_max_tokens=60)
+
+    service.summarize_transcript(_transcript(5, 10))
+
+    assert len(model.prompts) == 1
+    assert [s["kind"] for s in service.level_stats] == ["final"]
+
+def test_long_transcript_is_reduced_recursively_within_context():
+    """Тест рекурсивной свертки с соблюдением контекста и границ сегментов"""
+    models = [WordModel(context_tokens=256) for _ in range(2)]
+    service = HierarchicalSummaryService(models, context_tokens=256, map_max_tokens=40, final_max_tokens=60)
+
+    summary = service.summarize_transcript(_transcript(200, 20))
+
+    kinds = [s["kind"] for s in service.level_stats]
+    assert kinds.count("map") >= 2 and kinds[-1] == "final"
+    assert summary.startswith("w0_0")
+    first_chunk = models[0].prompts[0] if "w0_0" in models[0].prompts[0] else models[1].prompts[0]
+    assert first_chunk.split("\n\n")[1].split("\n")[0] == " ".join(f"w0_{j}" for j in range(20))
+
+def test_generator_is_first_worker():
+    """Тест: модель для скользящего саммари выдается публичным методом сервиса"""
+    models = [WordModel(context_tokens=256) for _ in range(2)]
+    service = HierarchicalSummaryService(models, context_tokens=256, map_max_tokens=40, final_max_tokens=60)
+
+    assert service.generator() is models[0]
+
+def test_llama_segments_stream_is_chunked_by_budget(monkeypatch):
+    """Тест: LlamaSummaryService сворачивает поток сегментов фрагментами, а не одной строкой"""
+    from src.services import summary_service
+    from src.utils.model_registry import ModelRegistry
+
+    model = WordModel(context_tokens=256)
+    monkeypatch.setattr(summary_service, "model_registry", ModelRegistry(idle_seconds=60))
+    monkeypatch.setattr(summary_service, "AutoModelForCausalLM", type("Loader", (), {"from_pretrained": lambda *args, **kwargs: object()}))
+    monkeypatch.setattr(summary_service.settings, "LLM_CONTEXT_LENGTH", 256)
+    monkeypatch.setattr(summary_service.settings, "SUMMARY_MAP_MAX_TOKENS", 40)
+    monkeypatch.setattr(summary_service.settings, "SUMMARY_MAX_TOKENS", 60)
+    service = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy")
+    for name in ("tokenize", "detokenize", "generate"):
+        monkeypatch.setattr(service, name, getattr(model, name))
+    monkeypatch.setattr(service, "generate_stream", lambda prompt, max_new_tokens=None: iter([model.generate(prompt, max_new_tokens)]))
+
+    summary = "".join(service.summarize_segments_stream(iter(_transcript(200, 20).segments)))
+
+    assert summary.startswith("w0_0")
+    assert len(model.prompts) > 2
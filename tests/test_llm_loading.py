@@ -0,0 +1,78 @@
+import threading
+import time
+import pytest
+
+try:
+    from src.services import summary_service
+except ImportError as e:
+    pytest.skip(f"ctransformers не доступен: {e}", allow_module_level=True)
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    """Отдельный реестр моделей для каждого теста"""
+    from src.utils.model_registry import ModelRegistry
+    monkeypatch.setattr(summary_service, "model_registry", ModelRegistry(idle_seconds=60))
+
+class SlowLoader:
+    """Имитация долгой загрузки модели"""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.calls = []
+        self.threads = []
+
+    def from_pretrained(self, path, **kwargs):
+        self.calls.append(kwargs)
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.seconds)
+        return object()
+
+def test_background_load_does_not_block_startup(monkeypatch):
+    """Тест фоновой загрузки LLM без задержки конструктора"""
+    loader = SlowLoader(0.3)
+    monkeypatch.setattr(summary_service, "AutoModelForCausalLM", loader)
+    monkeypatch.setattr(summary_service.settings, "LLM_LOAD_DELAY_SECONDS", 0.0)
+
+    started = time.perf_counter()
+    service = summary_service.LlamaSummaryService("model.gguf", load_mode="background")
+    assert time.perf_counter() - started < 0.1
+
+    deadline = time.monotonic() + 5
+    while not loader.threads and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert service.model is not None
+    assert loader.threads == ["llm-loader"]
+    assert loader.calls[0]["threads"] == summary_service.settings.LLM_THREADS
+    assert loader.calls[0]["mmap"] == summary_service.settings.LLM_USE_MMAP
+
+def test_lazy_load_on_first_use_and_unload(monkeypatch):
+    """Тест загрузки при первом обращении и выгрузки после использования"""
+    loader = SlowLoader(0.0)
+    monkeypatch.setattr(summary_service, "AutoModelForCausalLM", loader)
+
+    service = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy")
+    assert not service.is_loaded and not loader.calls
+
+    assert service.model is not None
+    service.release()
+    assert not service.is_loaded
+
+    assert service.model is not None
+    assert len(loader.calls) == 2
+
+def test_services_share_model_from_registry(monkeypatch):
+    """Тест: сервисы разных встреч используют один экземпляр модели, реплики - разные"""
+    loader = SlowLoader(0.0)
+    monkeypatch.setattr(summary_service, "AutoModelForCausalLM", loader)
+
+    first = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy")
+    second = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy")
+    replica = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy", replica=1)
+
+    assert first.model.model is second.model.model
+    assert replica.model.model is not first.model.model
+    assert len(loader.calls) == 2
+
+    first.release()
+    assert second.model.model is not None
+    assert len(loader.calls) == 2
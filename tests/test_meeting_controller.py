@@ -0,0 +1,84 @@
+import os
+from datetime import datetime
+import pytest
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import TranscriptProcessor
+
+try:
+    from src.controllers import meeting_controller
+    from src.controllers.meeting_controller import MeetingController
+except (ImportError, OSError) as e:
+    pytest.skip(f"зависимости контроллера не доступны: {e}", allow_module_level=True)
+
+class FakeAudio:
+    def start_capture(self):
+        return iter(())
+
+    def stop_capture(self):
+        pass
+
+class FakeSTT:
+    """Имитация STT: одна фраза"""
+
+    def transcribe_stream(self, audio_stream):
+        yield TranscriptSegment(0.0, 1.0, "добрый день")
+
+class FakeSummary:
+    """Имитация сервиса саммари"""
+
+    last_metrics = None
+
+    def summarize_transcript_stream(self, transcript):
+        yield "саммари"
+
+    def release(self):
+        pass
+
+class FrozenDatetime(datetime):
+    """Часы, которые всегда показывают одну и ту же секунду"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 1, 10, 0, 0)
+
+@pytest.fixture
+def results(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("config.settings.settings.JOURNAL_DIR", str(tmp_path / "journal"))
+    return tmp_path / "results"
+
+def _controller():
+    return MeetingController(FakeAudio(), FakeSTT(), FakeSummary(), TranscriptProcessor(), pipeline_enabled=False)
+
+def test_meetings_started_in_same_second_keep_separate_files(results, monkeypatch):
+    """Тест: встречи, начатые в одну секунду, не перезаписывают файлы друг друга"""
+    monkeypatch.setattr(meeting_controller, "datetime", FrozenDatetime)
+    controllers = [_controller(), _controller()]
+
+    for controller in controllers:
+        controller.start_meeting()
+
+    ids = [controller.meeting_id for controller in controllers]
+    assert ids[0] != ids[1] and all(meeting_id.startswith("20240301_100000_") for meeting_id in ids)
+    files = {name for name in os.listdir(results) if name.endswith(".txt")}
+    assert files == {f"{kind}_{meeting_id}.txt" for meeting_id in ids for kind in ("summary", "transcript")}
+
+class FailingSTT:
+    """Имитация STT, падающая после первой фразы"""
+
+    def transcribe_stream(self, audio_stream):
+        yield TranscriptSegment(0.0, 1.0, "добрый день")
+        raise RuntimeError("сбой модели")
+
+@pytest.mark.parametrize("pipeline_enabled", [False, True])
+def test_meeting_error_is_reported_and_segments_saved(results, pipeline_enabled):
+    """Тест: ошибка во время встречи сообщается, полученные сегменты сохраняются"""
+    controller = MeetingController(
+        FakeAudio(), FailingSTT(), FakeSummary(), TranscriptProcessor(), pipeline_enabled=pipeline_enabled
+    )
+
+    controller.start_meeting()
+
+    assert str(controller.last_error) == "сбой модели"
+    transcript = (results / f"transcript_{controller.meeting_id}.txt").read_text(encoding="utf-8")
+    assert "добрый день" in transcript
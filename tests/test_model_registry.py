@@ -0,0 +1,140 @@
+import threading
+import time
+import pytest
+from src.utils.model_registry import ModelRegistry
+
+class FakeModel:
+    """Имитация модели: считает одновременные вызовы"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    def _enter(self):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.01)
+
+    def transcribe(self, audio):
+        self._enter()
+        self.active -= 1
+        return audio
+
+    def __call__(self, prompt, stream=False):
+        return self._stream(prompt)
+
+    def _stream(self, prompt):
+        self._enter()
+        try:
+            for token in prompt.split():
+                time.sleep(0.001)
+                yield token
+        finally:
+            self.active -= 1
+
+def test_acquire_shares_one_instance_and_counts_references():
+    """Тест: одновременные обращения с одним ключом получают одну модель"""
+    registry = ModelRegistry(idle_seconds=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return FakeModel()
+
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(registry.acquire("whisper", loader, model="base")))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other = registry.acquire("whisper", loader, model="small")
+
+    assert len(loads) == 2
+    assert len({id(model.model) for model in models}) == 1
+    assert [(s["params"], s["refs"]) for s in registry.stats()] == [({"model": "base"}, 4), ({"model": "small"}, 1)]
+
+    for model in models:
+        model.release()
+        model.release()
+    other.release(evict=True)
+    assert [(s["refs"], s["loaded"]) for s in registry.stats()] == [(0, True)]
+
+def test_calls_and_generators_are_serialized():
+    """Тест: вызовы и потоковая генерация разных встреч не пересекаются"""
+    registry = ModelRegistry(idle_seconds=60)
+    first = registry.acquire("llm", FakeModel, path="model.gguf")
+    second = registry.acquire("llm", FakeModel, path="model.gguf")
+    outputs = []
+
+    def meeting(model):
+        model.transcribe(b"audio")
+        outputs.append(list(model("раз два три", stream=True)))
+
+    threads = [threading.Thread(target=meeting, args=(model,)) for model in (first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outputs == [["раз", "два", "три"]] * 2
+    assert first.model.max_active == 1
+    assert registry.stats()[0]["calls"] == 6
+
+def test_idle_model_is_evicted_after_timeout():
+    """Тест выгрузки модели без пользователей по таймауту"""
+    registry = ModelRegistry(idle_seconds=0.2)
+    model = registry.acquire("whisper", FakeModel, model="base")
+    model.release()
+    assert registry.stats()[0]["loaded"]
+
+    deadline = time.monotonic() + 5
+    while registry.stats() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    assert registry.stats() == []
+    assert registry.acquire("whisper", FakeModel, model="base").model is not None
+
+def test_failed_load_is_not_cached():
+    """Тест: ошибка загрузки не оставляет записи в реестре"""
+    registry = ModelRegistry(idle_seconds=60)
+
+    def broken():
+        raise OSError("нет файла")
+
+    try:
+        registry.acquire("llm", broken, path="missing.gguf")
+    except OSError:
+        pass
+
+    assert registry.stats() == []
+
+def test_abandoned_stream_releases_model(monkeypatch):
+    """Тест: брошенная потоковая генерация уступает модель и закрывается из другого потока"""
+    monkeypatch.setattr("config.settings.settings.MODEL_STREAM_IDLE_SECONDS", 0.2)
+    registry = ModelRegistry(idle_seconds=60)
+    first = registry.acquire("llm", FakeModel, path="model.gguf")
+    second = registry.acquire("llm", FakeModel, path="model.gguf")
+    streams = []
+    reader = threading.Thread(target=lambda: streams.append(first("раз два три", stream=True)) or next(streams[0]))
+    reader.start()
+    reader.join()
+
+    started = time.monotonic()
+    assert second.transcribe(b"audio") == b"audio"
+    assert 0.15 <= time.monotonic() - started < 5
+    with pytest.raises(RuntimeError):
+        next(streams[0])
+
+    abandoned = second("четыре пять", stream=True)
+    assert next(abandoned) == "четыре"
+    closer = threading.Thread(target=abandoned.close)
+    closer.start()
+    closer.join()
+    started = time.monotonic()
+    assert first.transcribe(b"audio") == b"audio"
+    assert time.monotonic() - started < 0.15
+    assert first.model.active == 0
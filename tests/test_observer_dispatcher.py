@@ -0,0 +1,97 @@
+import threading
+import time
+import pytest
+from src.models.transcript import TranscriptSegment
+from src.observers.observer_dispatcher import ObserverDispatcher
+from src.observers.transcript_observer import TranscriptObserver
+
+class RecordingObserver(TranscriptObserver):
+    """Наблюдатель, запоминающий уведомления и поток вызова"""
+
+    def __init__(self, delay=0.0, gate=None):
+        self.delay = delay
+        self.gate = gate
+        self.segments = []
+        self.tokens = []
+        self.threads = set()
+
+    def on_new_segment(self, segment):
+        if self.gate is not None:
+            self.gate.wait()
+        time.sleep(self.delay)
+        self.threads.add(threading.get_ident())
+        self.segments.append(segment)
+
+    def on_summary_token(self, token):
+        self.tokens.append(token)
+
+class FailingObserver(TranscriptObserver):
+    def on_new_segment(self, segment):
+        raise RuntimeError("сбой")
+
+def _segment(i, speaker="Анна"):
+    return TranscriptSegment(i, i + 1, f"фраза {i}", speaker)
+
+def test_slow_observer_does_not_delay_publisher():
+    """Тест: медленный наблюдатель не задерживает поток транскрибирования"""
+    slow = RecordingObserver(delay=0.05)
+    fast = RecordingObserver()
+    dispatcher = ObserverDispatcher(mode="async", queue_size=64, policy="block")
+    dispatcher.add(slow)
+    dispatcher.add(fast)
+    dispatcher.start()
+
+    started = time.monotonic()
+    for i in range(10):
+        dispatcher.on_new_segment(_segment(i))
+    assert time.monotonic() - started < 0.25
+
+    dispatcher.flush()
+    assert [s.text for s in slow.segments] == [f"фраза {i}" for i in range(10)]
+    assert threading.get_ident() not in slow.threads
+    slow_stats = dispatcher.get_stats()[0]
+    assert slow_stats["delivered"] == 10
+    assert slow_stats["latency_max_seconds"] >= 0.05
+    assert slow_stats["lag_max_seconds"] > 0
+    dispatcher.close()
+
+def test_coalesce_policy_merges_segments_of_blocked_observer():
+    """Тест склейки сегментов одного спикера при переполнении очереди"""
+    gate = threading.Event()
+    observer = RecordingObserver(gate=gate)
+    dispatcher = ObserverDispatcher(mode="async", queue_size=2, policy="coalesce")
+    dispatcher.add(observer)
+    dispatcher.start()
+
+    dispatcher.on_new_segment(_segment(0))
+    deadline = time.monotonic() + 5
+    while dispatcher.channels[0].queue.get_count == 0 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    for i in range(1, 6):
+        dispatcher.on_new_segment(_segment(i))
+    gate.set()
+    dispatcher.close()
+
+    texts = [s.text for s in observer.segments]
+    assert texts == ["фраза 0", "фраза 1", "фраза 2 фраза 3 фраза 4 фраза 5"]
+    assert observer.segments[-1].start_time == 2 and observer.segments[-1].end_time == 6
+    assert dispatcher.get_stats()[0]["coalesced"] == 3
+
+def test_sync_mode_calls_observers_in_publisher_thread():
+    """Тест синхронного режима (прежнее поведение)"""
+    observer = RecordingObserver()
+    dispatcher = ObserverDispatcher(mode="sync")
+    dispatcher.add(observer)
+    dispatcher.add(FailingObserver())
+
+    dispatcher.on_new_segment(_segment(0))
+    dispatcher.on_summary_token(" итог")
+
+    assert observer.threads == {threading.get_ident()}
+    assert observer.tokens == [" итог"]
+    assert [s["errors"] for s in dispatcher.get_stats()] == [0, 1]
+
+def test_unknown_mode_is_rejected():
+    """Тест проверки режима доставки"""
+    with pytest.raises(ValueError):
+        ObserverDispatcher(mode="fast")
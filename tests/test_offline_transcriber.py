@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from tests.test_file_audio_source import _write_wav
+from src.services.offline_transcriber import OfflineTranscriber
+
+class FakeChunkModel:
+    """Имитация Whisper: один сегмент на каждое начало тона"""
+
+    def transcribe(self, audio, **kwargs):
+        frames = len(audio) // 160
+        active = np.abs(audio[:frames * 160]).reshape(frames, 160).max(axis=1) > 0.1
+        onsets = np.flatnonzero(active & ~np.concatenate(([False], active[:-1])))
+        return {
+            "text": "",
+            "segments": [{"start": f / 100, "end": f / 100 + 1.0, "text": "тон"} for f in onsets]
+        }
+
+def load_fake_model():
+    return FakeChunkModel()
+
+@pytest.mark.parametrize("workers", [0, 2])
+def test_offline_transcription_uses_global_timestamps(tmp_path, workers):
+    """Тест сборки фрагментов с глобальными метками времени"""
+    rate = 16000
+    tone = 0.3 * np.sin(2 * np.pi * 200 * np.arange(rate) / rate)
+    silence = np.zeros(rate * 4)
+    path = tmp_path / "meeting.wav"
+    _write_wav(path, np.tile(np.concatenate([tone, silence]), 12), rate)
+
+    transcriber = OfflineTranscriber(workers=workers, model_loader=load_fake_model)
+    transcript = transcriber.transcribe_file(str(path))
+
+    assert [s.start_time for s in transcript.segments] == pytest.approx([5.0 * i for i in range(12)])
+    assert transcriber.last_stats["chunks"] > 1
+    assert transcriber.last_stats["rtf"] > 0
@@ -0,0 +1,72 @@
+import time
+import pytest
+import numpy as np
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import TranscriptProcessor
+
+try:
+    from src.controllers.pipeline import MeetingPipeline
+except (ImportError, OSError) as e:
+    pytest.skip(f"sounddevice не доступен: {e}", allow_module_level=True)
+
+class EndlessAudioService:
+    """Имитация захвата, отдающая чанки до остановки"""
+
+    def __init__(self):
+        self.is_recording = False
+
+    def start_capture(self):
+        self.is_recording = True
+        while self.is_recording:
+            time.sleep(0.001)
+            yield np.zeros(1024, dtype=np.float32)
+
+    def stop_capture(self):
+        self.is_recording = False
+
+class SlowSTTService:
+    """Имитация STT: один сегмент на 10 чанков с задержкой"""
+
+    def transcribe_stream(self, audio_stream):
+        for i, _ in enumerate(audio_stream):
+            if i % 10 == 9:
+                time.sleep(0.01)
+                yield TranscriptSegment(start_time=i, end_time=i + 1, text=f"  сегмент   {i} ")
+
+def test_pipeline_processes_segments_and_stops_cleanly():
+    """Тест работы конвейера, статистики очередей и остановки"""
+    received = []
+    pipeline = MeetingPipeline(
+        EndlessAudioService(), SlowSTTService(), TranscriptProcessor(), received.append
+    )
+
+    pipeline.start()
+    time.sleep(0.3)
+    pipeline.stop(timeout=5.0)
+
+    assert not pipeline.is_running()
+    assert received
+    assert received[0].text == "сегмент 9"
+    stats = {s["name"]: s for s in pipeline.get_stats()}
+    assert stats["audio"]["put_count"] > 0
+    assert stats["processed"]["get_count"] == len(received)
+
+class FailingSTTService:
+    """Имитация STT, падающая после первого сегмента"""
+
+    def transcribe_stream(self, audio_stream):
+        next(audio_stream)
+        yield TranscriptSegment(start_time=0, end_time=1, text="первый")
+        raise RuntimeError("сбой модели")
+
+def test_stage_error_is_raised_from_stop():
+    """Тест: ошибка стадии не теряется, а выбрасывается из stop"""
+    received = []
+    pipeline = MeetingPipeline(EndlessAudioService(), FailingSTTService(), TranscriptProcessor(), received.append)
+
+    pipeline.start()
+    pipeline.wait()
+
+    with pytest.raises(RuntimeError, match="сбой модели"):
+        pipeline.stop(timeout=5)
+    assert [segment.text for segment in received] == ["первый"]
@@ -0,0 +1,116 @@
+import os
+from datetime import datetime, timedelta
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.utils import results_writer
+from src.utils.results_catalog import ResultsCatalog
+
+def _transcript(created_at, segments, speakers=("Анна", "Борис")):
+    return MeetingTranscript(
+        segments=[
+            TranscriptSegment(i, i + 1, f"фраза {i}", speakers[i % len(speakers)])
+            for i in range(segments)
+        ],
+        created_at=created_at,
+        duration=float(segments * 60)
+    )
+
+def _save_meetings(results_dir, count):
+    start = datetime(2024, 3, 1, 10, 0, 0)
+    for day in range(count):
+        transcript = _transcript(start + timedelta(days=day), segments=day + 1)
+        results_writer.save_transcript(transcript, results_dir)
+        results_writer.save_summary(f"саммари {day}", transcript.created_at, results_dir)
+
+def test_saving_results_updates_catalog(tmp_path):
+    """Тест обновления каталога при сохранении транскрипции и саммари"""
+    results_dir = str(tmp_path)
+    _save_meetings(results_dir, 1)
+
+    meeting = ResultsCatalog(results_dir).get("20240301_100000")
+
+    assert meeting["segment_count"] == 1
+    assert meeting["duration"] == 60.0
+    assert meeting["speakers"] == ["Анна"]
+    assert os.path.basename(meeting["transcript_path"]) == "transcript_20240301_100000.txt"
+    assert os.path.basename(meeting["summary_path"]) == "summary_20240301_100000.txt"
+
+def test_pagination_sorting_and_date_filters(tmp_path):
+    """Тест постраничного списка с сортировкой и фильтром по датам"""
+    results_dir = str(tmp_path)
+    _save_meetings(results_dir, 5)
+    catalog = ResultsCatalog(results_dir)
+
+    first = catalog.list_meetings(limit=2)
+    second = catalog.list_meetings(limit=2, offset=2)
+    assert [m["meeting_id"] for m in first + second] == [
+        "20240305_100000", "20240304_100000", "20240303_100000", "20240302_100000"
+    ]
+
+    shortest = catalog.list_meetings(limit=1, sort="duration", descending=False)
+    assert shortest[0]["segment_count"] == 1
+
+    since, until = datetime(2024, 3, 2), datetime(2024, 3, 4)
+    assert catalog.count(since, until) == 2
+    assert {m["meeting_id"] for m in catalog.list_meetings(since=since, until=until)} == {
+        "20240302_100000", "20240303_100000"
+    }
+
+def test_reindex_rebuilds_catalog_from_files(tmp_path):
+    """Тест восстановления каталога по существующим файлам"""
+    results_dir = str(tmp_path)
+    _save_meetings(results_dir, 3)
+    os.remove(os.path.join(results_dir, "catalog.db"))
+
+    assert results_writer.reindex_catalog(results_dir) == 3
+    meeting = ResultsCatalog(results_dir).get("20240303_100000")
+    assert meeting["segment_count"] == 3
+    assert meeting["speakers"] == ["Анна", "Борис"]
+    assert meeting["summary_path"].endswith("summary_20240303_100000.txt")
+
+def test_search_finds_word_forms_with_timestamp_and_speaker(tmp_path):
+    """Тест поиска разных форм слова с привязкой к сегменту"""
+    results_dir = str(tmp_path)
+    transcript = MeetingTranscript(
+        segments=[
+            TranscriptSegment(0.0, 4.0, "Начнем с планов на неделю", "Анна"),
+            TranscriptSegment(4.0, 9.5, "Бюджета на релиз не хватает", "Борис"),
+            TranscriptSegment(9.5, 12.0, "Обсудим бюджетом позже", None),
+        ],
+        created_at=datetime(2024, 3, 1, 10, 0, 0),
+        duration=12.0
+    )
+    results_writer.save_transcript(transcript, results_dir)
+    catalog = ResultsCatalog(results_dir)
+
+    hits = catalog.search("бюджет релиза")
+    assert [(hit["segment_index"], hit["start_time"], hit["speaker"]) for hit in hits] == [(1, 4.0, "Борис")]
+    assert "[Бюджета]" in hits[0]["highlighted"]
+
+    assert {hit["segment_index"] for hit in catalog.search("бюджеты")} == {1, 2}
+
+    # Повторное сохранение заменяет сегменты встречи в индексе
+    transcript.segments = transcript.segments[:1]
+    results_writer.save_transcript(transcript, results_dir)
+    assert catalog.search("бюджет") == []
+    assert catalog.search("планы")[0]["meeting_id"] == "20240301_100000"
+
+def test_search_folds_yo(tmp_path):
+    """Тест поиска слов с "ё" по обоим написаниям, в том числе в старом каталоге"""
+    results_dir = str(tmp_path)
+    catalog = ResultsCatalog(results_dir)
+    with catalog._connect() as connection:
+        connection.execute("DROP TABLE segments_fts")
+        connection.execute("CREATE VIRTUAL TABLE segments_fts USING fts5 (text, content = 'segments', content_rowid = 'id')")
+    connection.close()
+    transcript = MeetingTranscript(
+        segments=[TranscriptSegment(0.0, 2.0, "Ёлка стоит", "Анна"), TranscriptSegment(2.0, 4.0, "Идём дальше", "Борис")],
+        created_at=datetime(2024, 3, 1, 10, 0, 0),
+        duration=4.0
+    )
+    results_writer.save_transcript(transcript, results_dir)
+
+    for query in ("ёлка", "елка", "ЁЛКИ"):
+        hits = catalog.search(query)
+        assert [hit["text"] for hit in hits] == ["Ёлка стоит"]
+        assert hits[0]["highlighted"] == "[Елка] стоит"
+    assert [hit["segment_index"] for hit in catalog.search("идем")] == [1]
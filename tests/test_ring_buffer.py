@@ -0,0 +1,24 @@
+import numpy as np
+from src.utils.ring_buffer import AudioRingBuffer
+
+def test_ring_buffer_read_write_wraparound():
+    """Тест записи и чтения с переходом через границу буфера"""
+    ring = AudioRingBuffer(8)
+    ring.write(np.arange(6, dtype=np.float32))
+    assert np.array_equal(ring.read(4), [0, 1, 2, 3])
+
+    ring.write(np.arange(6, 12, dtype=np.float32))
+    assert ring.available == 8
+    assert ring.fill_level == 1.0
+    assert np.array_equal(ring.read(8), np.arange(4, 12))
+    assert ring.read(1) is None
+
+def test_ring_buffer_overflow_counters():
+    """Тест учета переполнения буфера"""
+    ring = AudioRingBuffer(4)
+    assert ring.write(np.ones(3, dtype=np.float32)) == 3
+    assert ring.write(np.ones(3, dtype=np.float32)) == 1
+
+    assert ring.overflow_count == 1
+    assert ring.dropped_samples == 2
+    assert len(ring.read_available()) == 4
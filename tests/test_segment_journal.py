@@ -0,0 +1,83 @@
+import os
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime
+from src.models.transcript import TranscriptSegment
+from src.utils import results_writer
+from src.utils.segment_journal import SegmentJournal, find_journals, read_journal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_journal_round_trip_and_truncated_tail(tmp_path):
+    """Тест восстановления сегментов и пропуска недописанной строки"""
+    created_at = datetime(2024, 3, 1, 10, 0, 0)
+    journal = SegmentJournal("20240301_100000", created_at, str(tmp_path), fsync_policy="always")
+    journal.append(TranscriptSegment(0.0, 2.0, "Добрый день", "Анна"))
+    journal.append(TranscriptSegment(2.0, 5.5, "Начнем", None))
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "segment", "start_ti')
+
+    meeting_id, transcript = read_journal(journal.path)
+
+    assert meeting_id == "20240301_100000"
+    assert transcript.created_at == created_at
+    assert [(s.text, s.speaker) for s in transcript.segments] == [("Добрый день", "Анна"), ("Начнем", None)]
+    assert transcript.duration == 5.5
+    assert journal.fsync_count == 3
+    assert find_journals(str(tmp_path)) == [journal.path]
+
+def test_interval_policy_syncs_in_background(tmp_path):
+    """Тест фонового сброса журнала без fsync в append"""
+    journal = SegmentJournal("m", datetime.now(), str(tmp_path), fsync_policy="interval", fsync_interval=0.05)
+    synced = journal.fsync_count
+    for i in range(100):
+        journal.append(TranscriptSegment(i, i + 1, f"фраза {i}"))
+    assert journal.fsync_count <= synced + 1
+
+    deadline = time.monotonic() + 5
+    while journal.fsync_count == synced and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.fsync_count > synced
+    journal.remove()
+    assert not os.path.exists(journal.path)
+
+def test_segments_survive_kill(tmp_path):
+    """Тест сохранности сегментов после принудительного завершения процесса"""
+    script = (
+        "import sys, time\n"
+        "from datetime import datetime\n"
+        "from src.models.transcript import TranscriptSegment\n"
+        "from src.utils.segment_journal import SegmentJournal\n"
+        f"journal = SegmentJournal('m', datetime.now(), {str(tmp_path)!r}, fsync_policy='never')\n"
+        "for i in range(10):\n"
+        "    journal.append(TranscriptSegment(i, i + 1, f'фраза {i}'))\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    process = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    assert process.stdout.readline().strip() == "ready"
+    process.send_signal(signal.SIGKILL)
+    process.wait()
+
+    _, transcript = read_journal(find_journals(str(tmp_path))[0])
+    assert len(transcript.segments) == 10
+
+def test_recover_keeps_journaled_segments_as_is(tmp_path, monkeypatch):
+    """Тест: восстановление сохраняет обработанные сегменты журнала без повторной обработки"""
+    import cli
+
+    journal = SegmentJournal("m", datetime(2024, 3, 1, 10, 0, 0), str(tmp_path), fsync_policy="always")
+    segments = [TranscriptSegment(0.0, 1.0, "да да", "Спикер ?"), TranscriptSegment(1.0, 2.0, "двадцать пять", "Спикер 2")]
+    for segment in segments:
+        journal.append(segment)
+    journal.close()
+    saved = []
+    monkeypatch.setattr(results_writer, "save_transcript", lambda transcript, meeting_id=None: saved.append((meeting_id, transcript)))
+
+    cli.recover_meetings(journal.path, with_summary=False)
+
+    assert [(meeting_id, transcript.segments) for meeting_id, transcript in saved] == [("m", segments)]
+    assert not os.path.exists(journal.path)
@@ -0,0 +1,37 @@
+from datetime import datetime
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import TranscriptProcessor
+from src.utils import results_writer
+from src.utils.segment_store import SpillingSegmentStore
+
+def test_store_spills_old_segments_and_iterates_in_order(tmp_path):
+    """Тест выгрузки сегментов сверх окна и перебора по порядку"""
+    store = SpillingSegmentStore(window=3, spill_dir=str(tmp_path))
+    for i in range(10):
+        store.append(TranscriptSegment(i, i + 1, f"фраза {i}", "Анна" if i % 2 else None))
+
+    assert len(store) == 10
+    assert [s.text for s in store.recent()] == ["фраза 7", "фраза 8", "фраза 9"]
+    assert [(s.start_time, s.text, s.speaker) for s in store] == [
+        (i, f"фраза {i}", "Анна" if i % 2 else None) for i in range(10)
+    ]
+
+    store.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_streamed_transcript_matches_list_processing(tmp_path):
+    """Тест потоковой обработки и записи: результат совпадает с обычным путем"""
+    def segments():
+        texts = ["Добрый   день", "...", "Начнем встречу", "  итоги  "]
+        return [TranscriptSegment(i, i + 1, text) for i, text in enumerate(texts)]
+
+    processor = TranscriptProcessor()
+    created_at = datetime(2024, 3, 1, 10, 0, 0)
+    path = results_writer.save_segments(
+        processor.iter_process(iter(segments())), created_at, 4.0, str(tmp_path), "stream"
+    )
+
+    expected = processor.process_segments(segments())
+    streamed = list(results_writer.read_transcript_segments(path))
+    assert [(s.text, s.speaker) for s in streamed] == [(s.text, s.speaker) for s in expected]
+    assert results_writer.read_transcript(path).duration == 4.0
@@ -22,3 +22,63 @@ def test_transcript_segment_creation():
     assert segment.text == "Тестовая транскрипция"
     assert segment.start_time == 0.0
     assert segment.end_time == 5.0
+
+class FakeWhisperModel:
+    """Имитация модели Whisper, запоминающая переданные окна"""
+
+    def __init__(self, text="тест"):
+        self.text = text
+        self.windows = []
+
+    def transcribe(self, audio, **kwargs):
+        self.windows.append(audio)
+        return {"text": self.text}
+
+def test_transcribe_stream_uses_preallocated_window():
+    """Тест передачи в модель view на переиспользуемый буфер окна"""
+    model = FakeWhisperModel()
+    service = WhisperSTTService(model)
+    chunks = [np.ones(1000, dtype=np.float32)] * (service.window_size * 2 // 1000 + 1)
+
+    segments = list(service.transcribe_stream(iter(chunks)))
+
+    assert len(segments) == 2
+    assert all(len(window) == service.window_size for window in model.windows)
+    assert np.shares_memory(model.windows[0], model.windows[1])
+
+class WordClockModel:
+    """
+    Имитация Whisper с метками времени.
+
+    Значение сэмпла - номер слова; слово длится WORD_SECONDS и
+    распознается, только если в окне есть хотя бы его половина.
+    """
+
+    WORD_SECONDS = 0.4
+
+    def transcribe(self, audio, **kwargs):
+        word_samples = int(self.WORD_SECONDS * 16000)
+        ids, starts, counts = np.unique(audio.astype(int), return_index=True, return_counts=True)
+        segments = []
+        for word_id, start, count in zip(ids, starts, counts):
+            if count * 2 >= word_samples:
+                segments.append({
+                    "start": start / 16000,
+                    "end": (start + count) / 16000,
+                    "text": f"слово{word_id}"
+                })
+        return {"text": " ".join(s["text"] for s in segments), "segments": segments}
+
+def test_overlapping_windows_do_not_duplicate_text():
+    """Тест склейки перекрывающихся окон и меток по аудио часам"""
+    word_samples = int(WordClockModel.WORD_SECONDS * 16000)
+    audio = np.repeat(np.arange(60), word_samples).astype(np.float32)
+    service = WhisperSTTService(WordClockModel(), window_seconds=3.0, hop_seconds=1.0)
+    chunks = np.array_split(audio, len(audio) // 1024)
+
+    segments = list(service.transcribe_stream(iter(chunks)))
+
+    words = " ".join(segment.text for segment in segments).split()
+    assert words == [f"слово{i}" for i in range(60)]
+    assert segments[10].start_time == pytest.approx(10 * WordClockModel.WORD_SECONDS)
+    assert all(a.end_time <= b.start_time + 1e-6 for a, b in zip(segments, segments[1:]))
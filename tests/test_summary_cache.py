@@ -0,0 +1,63 @@
+import os
+import time
+import pytest
+from src.utils.summary_cache import SummaryCache
+
+def test_key_depends_on_prompt_model_and_params():
+    """Тест ключа: нормализация текста, модель и параметры генерации"""
+    key = SummaryCache.make_key("Текст  встречи\n", "model:1", max_new_tokens=300)
+
+    assert key == SummaryCache.make_key("Текст встречи", "model:1", max_new_tokens=300)
+    assert key != SummaryCache.make_key("Текст встречи", "model:2", max_new_tokens=300)
+    assert key != SummaryCache.make_key("Текст встречи", "model:1", max_new_tokens=150)
+
+def test_hits_and_misses_are_persisted(tmp_path):
+    """Тест сохранения счетчиков попаданий и промахов"""
+    cache = SummaryCache(str(tmp_path))
+    key = SummaryCache.make_key("промпт", "model")
+
+    assert cache.get(key) is None
+    cache.put(key, "саммари")
+    assert cache.get(key) == "саммари"
+
+    stats = SummaryCache(str(tmp_path)).stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (1, 1, 1)
+
+def test_eviction_by_size_and_age(tmp_path):
+    """Тест вытеснения давно не использованных и устаревших записей"""
+    cache = SummaryCache(str(tmp_path), max_bytes=1000, max_age_seconds=3600)
+    now = time.time()
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.put(key, "x" * 10)
+        os.utime(cache._path(key), (now - 100 + i, now - 100 + i))
+    # Обращение к старой записи делает ее недавно использованной
+    cache.get("a")
+    cache.max_bytes = 20
+    cache.put("d", "x" * 5)
+
+    assert cache.get("b") is None and cache.get("c") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+
+    os.utime(cache._path("a"), (now - 7200, now - 7200))
+    cache.evict()
+    assert cache.get("a") is None
+
+def test_llama_service_uses_cache(tmp_path):
+    """Тест повторной суммаризации без обращения к модели"""
+    summary_service = pytest.importorskip("src.services.summary_service")
+
+    class CountingModel:
+        calls = 0
+
+        def __call__(self, prompt, stream=False, **kwargs):
+            CountingModel.calls += 1
+            return iter([" Итоги", " встречи"])
+
+    cache = SummaryCache(str(tmp_path))
+    service = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy", cache=cache)
+    service.model = CountingModel()
+
+    assert service.summarize("текст встречи") == "Итоги встречи"
+    assert service.summarize("текст  встречи") == "Итоги встречи"
+    assert CountingModel.calls == 1
+    assert cache.stats()["hits"] == 1
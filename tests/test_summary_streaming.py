@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+from src.observers.rolling_summary_observer import RollingSummaryObserver
+from src.utils import results_writer
+
+class StreamingGenerator:
+    """Имитация LLM, отдающая ответ по словам"""
+
+    model = True
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def tokenize(self, text):
+        return text.split()
+
+    def generate(self, prompt, max_new_tokens=None):
+        return "".join(self.generate_stream(prompt, max_new_tokens)).strip()
+
+    def generate_stream(self, prompt, max_new_tokens=None):
+        self.prompts.append(prompt)
+        for word in self.answer.split():
+            yield f" {word}"
+
+def test_summary_file_is_written_while_streaming(tmp_path):
+    """Тест записи саммари в файл по мере генерации"""
+    seen = []
+
+    def tokens():
+        for token in ["Решили", " выпустить", " релиз"]:
+            yield token
+            path = tmp_path / "summary_test.txt"
+            seen.append(path.read_text(encoding="utf-8"))
+
+    path, summary = results_writer.save_summary_stream(tokens(), datetime.now(), str(tmp_path), "test")
+
+    assert summary == "Решили выпустить релиз"
+    assert seen[0].endswith("Решили") and seen[-1].endswith("Решили выпустить релиз")
+    assert open(path, encoding="utf-8").read().endswith("Решили выпустить релиз\n")
+
+def test_rolling_summary_streams_final_fold():
+    """Тест потоковой финальной свертки текущего саммари"""
+    pytest.importorskip("src.services.summary_service")
+    generator = StreamingGenerator("итог встречи")
+    observer = RollingSummaryObserver(generator, every_segments=100, every_seconds=3600)
+    for i in range(3):
+        observer.on_new_segment(TranscriptSegment(i, i + 1, f"фраза {i}"))
+
+    tokens = list(observer.finalize_stream())
+
+    assert tokens == [" итог", " встречи"]
+    assert observer.summary == "итог встречи"
+    assert "фраза 2" in generator.prompts[-1]
+
+def test_llama_service_streams_tokens_and_records_metrics(monkeypatch):
+    """Тест потоковой генерации LlamaSummaryService и метрик"""
+    summary_service = pytest.importorskip("src.services.summary_service")
+
+    class FakeModel:
+        def __call__(self, prompt, stream=False, **kwargs):
+            assert stream
+            return iter([" ", " План", " на", " неделю"])
+
+    monkeypatch.setattr(summary_service.settings, "SUMMARY_CACHE_ENABLED", False)
+    service = summary_service.LlamaSummaryService("model.gguf", load_mode="lazy")
+    service.model = FakeModel()
+    transcript = MeetingTranscript(
+        segments=[TranscriptSegment(0, 1, "обсуждали план")],
+        created_at=datetime.now(),
+        duration=1.0
+    )
+
+    tokens = list(service.summarize_transcript_stream(transcript))
+
+    assert "".join(tokens) == "План на неделю"
+    assert service.last_metrics.tokens == 4
+    assert service.last_metrics.time_to_first_token <= service.last_metrics.total_seconds
@@ -0,0 +1,48 @@
+import pytest
+from datetime import datetime
+from src.models.transcript import TranscriptSegment, MeetingTranscript
+
+def _transcript():
+    return MeetingTranscript(
+        segments=[
+            TranscriptSegment(0.0, 2.0, "Привет всем", "Анна"),
+            TranscriptSegment(2.0, 4.0, "Добрый день", "Борис"),
+            TranscriptSegment(4.0, 6.5, "Начнем с отчета", "Анна"),
+            TranscriptSegment(6.5, 7.0, "Да", None),
+        ],
+        created_at=datetime(2024, 3, 1, 10, 0, 0),
+        duration=7.0
+    )
+
+def test_segments_keep_list_api():
+    """Тест совместимости сегментов со списком TranscriptSegment"""
+    transcript = _transcript()
+
+    assert len(transcript.segments) == 4
+    assert transcript.segments[1] == TranscriptSegment(2.0, 4.0, "Добрый день", "Борис")
+    assert transcript.segments[-1].speaker is None
+    assert [s.text for s in transcript.segments[1:3]] == ["Добрый день", "Начнем с отчета"]
+    assert transcript == _transcript()
+    with pytest.raises(IndexError):
+        transcript.segments[4]
+
+def test_full_and_speaker_text_are_cached_and_invalidated_on_append():
+    """Тест кэша полного текста и индекса спикеров при добавлении сегментов"""
+    transcript = _transcript()
+
+    assert transcript.get_full_text() == "Привет всем Добрый день Начнем с отчета Да"
+    assert transcript.get_speaker_text("Анна") == "Привет всем Начнем с отчета"
+    assert transcript.get_speaker_text("Вера") == ""
+    assert transcript.speakers == ["Анна", "Борис"]
+
+    transcript.append(TranscriptSegment(7.0, 9.0, "Итоги", "Анна"))
+
+    assert transcript.get_full_text().endswith("Да Итоги")
+    assert transcript.get_speaker_text("Анна") == "Привет всем Начнем с отчета Итоги"
+    assert transcript.get_speaker_text("Борис") == "Добрый день"
+
+def test_segment_has_no_instance_dict():
+    """Тест компактного сегмента без __dict__"""
+    segment = TranscriptSegment(0.0, 1.0, "текст")
+
+    assert not hasattr(segment, "__dict__")
@@ -0,0 +1,87 @@
+import pytest
+from src.models.transcript import TranscriptSegment
+from src.services.transcript_processor import HallucinationFilterRule, TranscriptProcessor, TranscriptRule
+
+@pytest.mark.parametrize("text, expected", [
+    ("Ну, э, давайте   начнем...", "Ну, давайте начнем."),
+    ("я думаю я думаю, что мм это работает", "я думаю, что это работает"),
+    ("да да да", "да"),
+    ("двадцать пять человек и два стула", "25 человек и два стула"),
+    ("сто двадцать тысяч триста один", "120301"),
+    ("счет один два три", "счет один два три"),
+    ("  хм  ", ""),
+])
+def test_rules_pipeline(text, expected):
+    """Тест правил по умолчанию: пробелы, слова-паразиты, повторы, числа"""
+    assert TranscriptProcessor().clean_text(text) == expected
+
+def test_rules_are_configurable():
+    """Тест выбора правил по имени и ошибки для неизвестного правила"""
+    assert TranscriptProcessor(["whitespace"]).clean_text("э  двадцать  двадцать") == "э двадцать двадцать"
+    with pytest.raises(ValueError):
+        TranscriptProcessor(["whitespace", "unknown"])
+
+def test_rule_must_implement_apply():
+    """Тест: правило без apply нельзя создать"""
+    class Incomplete(TranscriptRule):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_process_segment_does_not_mutate_input():
+    """Тест: обработка возвращает новый сегмент и пропускает пустые"""
+    processor = TranscriptProcessor()
+    segment = TranscriptSegment(0, 1, "  привет  ")
+
+    processed = processor.process_segment(segment)
+
+    assert processed.text == "привет" and processed.speaker == "Спикер 1"
+    assert segment.text == "  привет  " and segment.speaker is None
+    assert processor.process_segment(TranscriptSegment(1, 2, " э ")) is None
+    assert processor.process_segment(TranscriptSegment(2, 3, "пока")).speaker == "Спикер 2"
+
+def test_streaming_matches_batch_processing():
+    """Тест: сегменты, обработанные по одному, совпадают с пакетной обработкой"""
+    segments = [TranscriptSegment(i, i + 1, text) for i, text in enumerate(["а а", "", "сорок два", "ну"])]
+    processor = TranscriptProcessor()
+
+    streamed = [s for s in map(processor.process_segment, segments) if s is not None]
+
+    assert streamed == TranscriptProcessor().process_segments(segments)
+
+def test_hallucination_filter_removes_loops_blocklist_and_repeated_segments():
+    """Тест фильтра галлюцинаций: зацикливание, стоп-список, повтор прошлых сегментов"""
+    processor = TranscriptProcessor(["hallucinations"])
+    texts = [
+        "Спасибо за внимание. Спасибо за внимание. Спасибо за внимание.",
+        "Обсудим бюджет. Продолжение следует...",
+        "Субтитры сделал DimaTorzok",
+        "мы обсудим бюджет на следующий квартал",
+        "мы обсудим бюджет на следующий квартал",
+        "в том числе отчет и в том числе план",
+    ]
+
+    cleaned = [processor.clean_text(text) for text in texts]
+
+    assert cleaned == [
+        "Спасибо за внимание.", "Обсудим бюджет.", "", "мы обсудим бюджет на следующий квартал", "",
+        "в том числе отчет и в том числе план",
+    ]
+    stats = processor.get_stats()["hallucinations"]
+    assert stats["segments_dropped"] == 1
+    assert stats["tokens_removed"] == 6 + 2 + 3 + 6
+    assert stats["chars_removed"] == sum(map(len, texts)) - sum(map(len, cleaned))
+
+def test_hallucination_filter_memory_is_bounded():
+    """Тест: история n-грамм ограничена окном сегментов"""
+    processor = TranscriptProcessor([HallucinationFilterRule(history_segments=10)])
+    rule = processor.rules[0]
+    for i in range(1000):
+        processor.clean_text(" ".join(f"слово{i}_{j}" for j in range(20)))
+
+    assert len(rule._history) == 10
+    assert len(rule._counts) == 10 * 18
+
+    processor.reset()
+    assert not rule._counts and rule.stats()["tokens_removed"] == 0
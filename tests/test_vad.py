@@ -0,0 +1,66 @@
+import numpy as np
+from src.services.vad import EnergyVAD
+from src.services.stt_service import WhisperSTTService
+
+SR = 16000
+
+def _voice(seconds, f0=140.0):
+    """Синтетический гласный звук: гармоники основного тона"""
+    t = np.arange(int(seconds * SR)) / SR
+    wave = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+    return (0.2 * wave).astype(np.float32)
+
+def _silence(seconds, rng):
+    return (0.001 * rng.standard_normal(int(seconds * SR))).astype(np.float32)
+
+def _chunks(audio):
+    return iter(np.array_split(audio, max(1, len(audio) // 1024)))
+
+def test_vad_finds_speech_regions_and_reports_skipped_audio():
+    """Тест выделения участков речи и статистики пропуска"""
+    rng = np.random.default_rng(0)
+    audio = np.concatenate([
+        _silence(2.0, rng), _voice(1.5), _silence(2.0, rng), _voice(1.0), _silence(1.5, rng)
+    ])
+    vad = EnergyVAD(sample_rate=SR, max_region_seconds=5.0)
+
+    regions = list(vad.split(_chunks(audio)))
+
+    assert len(regions) == 2
+    assert abs(regions[0].start_sample / SR - 2.0) < 0.05
+    assert abs(regions[1].start_sample / SR - 5.5) < 0.05
+    assert abs(len(regions[0].audio) / SR - 1.8) < 0.1  # речь + удержание
+    assert 0.55 < vad.skipped_fraction < 0.7
+
+def test_vad_cuts_long_speech_at_quietest_frame():
+    """Тест разреза длинного участка по самому тихому кадру"""
+    rng = np.random.default_rng(1)
+    dip = 0.05 * _voice(0.1)
+    audio = np.concatenate([_voice(3.8), dip, _voice(2.0), _silence(1.0, rng)])
+    vad = EnergyVAD(sample_rate=SR, max_region_seconds=5.0)
+
+    regions = list(vad.split(_chunks(audio)))
+
+    assert len(regions) == 2
+    assert abs(regions[1].start_sample / SR - 3.8) < 0.1
+    assert regions[0].end_sample == regions[1].start_sample
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return {"text": "речь", "segments": [{"start": 0.0, "end": len(audio) / SR, "text": "речь"}]}
+
+def test_stt_transcribes_only_speech_regions():
+    """Тест вызова Whisper только для участков речи"""
+    rng = np.random.default_rng(2)
+    audio = np.concatenate([_silence(6.0, rng), _voice(1.0), _silence(6.0, rng)])
+    model = CountingModel()
+    service = WhisperSTTService(model, vad=EnergyVAD(sample_rate=SR))
+
+    segments = list(service.transcribe_stream(_chunks(audio)))
+
+    assert model.calls == 1
+    assert abs(segments[0].start_time - 6.0) < 0.05